@@ -8,7 +8,15 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-import threading
+# Modo sin interfaz: se resuelve antes de importar tkinter y la UI
+if __name__ == "__main__" and "--monitor-only" in sys.argv[1:]:
+    from src.headless import main as headless_main
+    sys.exit(headless_main([arg for arg in sys.argv[1:] if arg != "--monitor-only"]))
+
+if __name__ == "__main__" and "--daemon" in sys.argv[1:]:
+    from src.daemon import main as daemon_main
+    sys.exit(daemon_main(["run"] + [arg for arg in sys.argv[1:] if arg != "--daemon"]))
+
 import tkinter as tk
 from tkinter import scrolledtext, messagebox, filedialog, ttk
 import tkinter.simpledialog
@@ -17,32 +25,27 @@ import json
 from pathlib import Path
 
 # Import core modules (safe imports)
+# The monitor and the v5.1 feature modules are imported on first use, so
+# the window opens without loading psutil, pygetwindow, requests, etc.
 try:
     from src.settings_manager import load_settings, save_settings, get_blocked_apps
     from src.logger import log_info
-    from src.monitor import monitor_apps
+    from src.json_store import save_json
+    from src.ui_bus import ui_bus
+    from src.activity_log import ActivityLog, ActivityLogView
 except ImportError as e:
     print(f"Error importing core modules: {e}")
     sys.exit(1)
 
-# Import new v5.1 features
-try:
-    from src.daily_goals import DailyGoalsManager
-    from src.advanced_stats import AdvancedStats
-    from src.smart_alerts import SmartAlerts
-    from src.session_tracker import SessionTracker
-    from src.advanced_exporter import AdvancedExporter
-except ImportError as e:
-    print(f"Warning: Some v5.1 features not available: {e}")
-
 # ======================
 # Global variables
 # ======================
 root = None
 status_label = None
-log_text = None
-monitor_running = False
+log_view = None
 current_settings = None
+# Bounded, deduplicated model behind the activity log view
+activity_log = ActivityLog()
 
 # Colors - Professional dark theme
 bg_dark = "#0a0e27"
@@ -83,8 +86,7 @@ def get_profiles():
 def save_profiles(profiles):
     """Save profiles to file."""
     try:
-        with open(PROFILES_FILE, 'w') as f:
-            json.dump(profiles, f, indent=2)
+        save_json(PROFILES_FILE, profiles, indent=2)
         return True
     except Exception as e:
         print(f"Error saving profiles: {e}")
@@ -104,8 +106,7 @@ def get_whitelist():
 def save_whitelist(whitelist):
     """Save whitelist."""
     try:
-        with open(WHITELIST_FILE, 'w') as f:
-            json.dump(whitelist, f, indent=2)
+        save_json(WHITELIST_FILE, whitelist, indent=2)
         return True
     except Exception as e:
         print(f"Error saving whitelist: {e}")
@@ -129,8 +130,7 @@ def get_schedule():
 def save_schedule(schedule):
     """Save schedule configuration."""
     try:
-        with open(SCHEDULE_FILE, 'w') as f:
-            json.dump(schedule, f, indent=2)
+        save_json(SCHEDULE_FILE, schedule, indent=2)
         return True
     except Exception as e:
         print(f"Error saving schedule: {e}")
@@ -492,6 +492,7 @@ class ReportsDialog(CustomDialog):
         
         # Report content
         try:
+            from src.advanced_stats import AdvancedStats
             stats = AdvancedStats()
             trend = stats.get_productivity_trend(days=7)
             health = stats.get_health_metrics()
@@ -545,35 +546,70 @@ class ReportsDialog(CustomDialog):
 # ======================
 
 def update_status(message):
-    """Update status label and add to log."""
-    global status_label, log_text
+    """Update status label and add to log. Safe to call from any thread."""
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    ui_bus.post('status', (timestamp, message))
+
+def _render_status(messages):
+    """Apply a batch of status messages (Tk thread only, via ui_bus)."""
     if status_label:
-        status_label.config(text=message)
-        status_label.update()
-    if log_text:
-        log_text.config(state=tk.NORMAL)
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_text.insert(tk.END, f"[{timestamp}] {message}\n")
-        log_text.see(tk.END)
-        log_text.config(state=tk.DISABLED)
+        status_label.config(text=messages[-1][1])
+    for timestamp, message in messages:
+        activity_log.add(message, timestamp)
+    if log_view:
+        log_view.refresh()
+
+DAEMON_STATES = {
+    'running': "▶ Demonio: monitoreando",
+    'paused': "⏸ Demonio: en pausa",
+    'stopping': "⏹ Demonio: deteniendo...",
+    'stopped': "⏹ Demonio: detenido",
+}
+_daemon_subscription = None
+
+def _on_daemon_event(event):
+    """Relay a daemon event to the status bar and log (events thread)."""
+    kind, data = event['event'], event.get('data') or {}
+    if kind == 'message':
+        update_status(data.get('text', ''))
+    elif kind == 'monitor':
+        update_status(DAEMON_STATES.get(data.get('state'), f"Demonio: {data.get('state')}"))
+    elif kind == 'profile':
+        update_status(f"👤 Perfil activo: {data.get('profile')}")
+
+def follow_daemon():
+    """Subscribe to the daemon's events once; they reach Tk through ui_bus."""
+    global _daemon_subscription
+    if _daemon_subscription is not None and not _daemon_subscription.is_set():
+        return
+    from src.daemon import DaemonClient
+    _daemon_subscription = DaemonClient().subscribe(_on_daemon_event)
 
 def start_guardian():
     """Start Guardian monitoring."""
-    global monitor_running
-    if not monitor_running:
-        monitor_running = True
-        update_status("✓ Guardian iniciado - Monitoreando aplicaciones...")
-        threading.Thread(target=monitor_apps, daemon=True).start()
+    # With a daemon running, the UI only sends commands to it
+    from src.daemon import try_request
+    if try_request('start') is None:
+        from src.monitor import monitor_service
+        monitor_service.start(ui_callback=update_status)
+    else:
+        follow_daemon()
+    update_status("✓ Guardian iniciado - Monitoreando aplicaciones...")
 
 def stop_guardian():
     """Stop Guardian monitoring."""
-    global monitor_running
-    monitor_running = False
+    from src.daemon import try_request
+    if try_request('stop') is None:
+        from src.monitor import monitor_service
+        monitor_service.stop()
+    else:
+        follow_daemon()
     update_status("⏹ Guardian detenido")
 
 def show_stats():
     """Show productivity statistics with custom dialog."""
     try:
+        from src.advanced_stats import AdvancedStats
         stats = AdvancedStats()
         trend = stats.get_productivity_trend(days=7)
         health = stats.get_health_metrics()
@@ -596,6 +632,7 @@ Score de bienestar: {health.get('digital_wellness_score', 0)}/100
 def show_alerts():
     """Show smart alerts."""
     try:
+        from src.smart_alerts import SmartAlerts
         alerts = SmartAlerts()
         dummy_stats = {
             "focus_time_minutes": 60,
@@ -619,6 +656,7 @@ def show_alerts():
 def export_report():
     """Export productivity report."""
     try:
+        from src.advanced_exporter import AdvancedExporter
         exporter = AdvancedExporter()
         
         dummy_stats = {
@@ -638,6 +676,7 @@ def export_report():
 def show_goals():
     """Show and manage daily goals."""
     try:
+        from src.daily_goals import DailyGoalsManager
         goals_manager = DailyGoalsManager()
         goals = goals_manager.get_goals()
         
@@ -687,7 +726,7 @@ def view_reports():
 
 def create_main_window():
     """Create and configure main Guardian window."""
-    global root, status_label, log_text, current_settings
+    global root, status_label, log_view, current_settings
     
     root = tk.Tk()
     root.title("🛡️ Guardian v5.1 - Sistema de Bienestar Digital")
@@ -799,10 +838,11 @@ def create_main_window():
                         font=("Segoe UI", 12, "bold"), fg=accent_color, bg=bg_dark)
     log_label.pack(anchor=tk.W, pady=(10, 5))
     
-    log_text = scrolledtext.ScrolledText(main_frame, bg="#0f0f1e", fg=success_color,
-                                         font=("Courier New", 9), height=8)
-    log_text.pack(fill=tk.BOTH, expand=True)
-    log_text.config(state=tk.DISABLED)
+    log_view = ActivityLogView(main_frame, activity_log, bg="#0f0f1e", fg=success_color,
+                               font=("Courier New", 9), height=8)
+    log_view.pack(fill=tk.BOTH, expand=True)
+    ui_bus.on('status', _render_status)
+    ui_bus.attach(root)
     
     # Footer
     footer = tk.Frame(root, bg=bg_light, height=40)
@@ -816,6 +856,9 @@ def create_main_window():
     # Initialize
     update_status("✓ Guardian v5.1 iniciado - Listo para monitorear")
     log_info("Guardian v5.1 iniciado exitosamente")
+    from src.daemon import daemon_running
+    if daemon_running():
+        follow_daemon()
     
     return root
 
@@ -826,4 +869,6 @@ def create_main_window():
 if __name__ == "__main__":
     root = create_main_window()
     root.mainloop()
+    # Monitor threads may still post after the window is gone
+    ui_bus.shutdown()
 
@@ -0,0 +1,274 @@
+"""
+Registro de actividad de la ventana principal.
+Un buffer de capacidad fija guarda los mensajes de la sesión; un mensaje
+repetido no agrega líneas: se mueve al final con su contador ("×37").
+La vista dibuja solo las líneas visibles y "Cargar anteriores" trae una
+página de cierres desde el journal de bloqueos en disco: la lectura corre
+en un hilo aparte y el resultado vuelve al hilo de Tk por ui_bus.
+"""
+
+import itertools
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+
+DEFAULT_CAPACITY = 500
+OLDER_PAGE = 50
+# Días hacia atrás que se revisan buscando una página de cierres
+OLDER_LOOKBACK_DAYS = 60
+WHEEL_LINES = 3
+
+
+class LogEntry:
+    __slots__ = ('first', 'last', 'message', 'count')
+
+    def __init__(self, when, message):
+        self.first = when
+        self.last = when
+        self.message = message
+        self.count = 1
+
+    def format(self):
+        suffix = f"  ×{self.count}" if self.count > 1 else ""
+        return f"[{self.last}] {self.message}{suffix}"
+
+
+def older_blocks(journal, before, limit=OLDER_PAGE, lookback_days=OLDER_LOOKBACK_DAYS, skip=0):
+    """
+    Hasta `limit` cierres del journal hasta `before` (ISO), del más viejo
+    al más nuevo, sin los últimos `skip` con timestamp igual a `before`
+    (ya mostrados en la página anterior). Se lee un día a la vez hacia atrás.
+    """
+    found = []
+    day = datetime.fromisoformat(before[:10])
+    for _ in range(lookback_days):
+        name = day.strftime("%Y-%m-%d")
+        events = [e for e in journal.read_blocks(name, name) if str(e.get('timestamp', '')) <= before]
+        # Un segmento importado no tiene por qué estar en orden (sort estable)
+        events.sort(key=lambda e: str(e['timestamp']))
+        if skip:
+            same = sum(1 for e in events if str(e['timestamp']) == before)
+            del events[len(events) - min(skip, same):]
+            skip = 0
+        found[:0] = events
+        if len(found) >= limit:
+            break
+        day -= timedelta(days=1)
+    return found[-limit:]
+
+
+class ActivityLog:
+    """Buffer circular de mensajes con deduplicación; sin dependencias de Tk."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, journal=None):
+        """`journal`: fuente de read_blocks(); por defecto el de settings_manager."""
+        self.capacity = capacity
+        self.journal = journal
+        self._entries = OrderedDict()
+        # Páginas traídas del journal: se muestran antes que la sesión
+        self._older = deque()
+        # Cursor (timestamp, cuántos con ese mismo timestamp ya se cargaron)
+        self._older_cursor = datetime.now().isoformat()
+        self._older_skip = 0
+        self.version = 0
+        self.added = 0
+        self.evicted = 0
+
+    def add(self, message, when=None):
+        """Agrega un mensaje; si ya está en el buffer suma al contador."""
+        when = when or datetime.now().strftime("%H:%M:%S")
+        entry = self._entries.get(message)
+        if entry is not None:
+            entry.count += 1
+            entry.last = when
+            self._entries.move_to_end(message)
+        else:
+            self._entries[message] = LogEntry(when, message)
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+        self.added += 1
+        self.version += 1
+
+    def fetch_older(self, limit=OLDER_PAGE):
+        """
+        Lee del journal la próxima página de cierres anteriores sin tocar
+        el log (puede correr fuera del hilo de Tk). Retorna la página para
+        apply_older(), o None si ya se cargaron `capacity` líneas.
+        """
+        cursor, skip = self._older_cursor, self._older_skip
+        limit = min(limit, self.capacity - len(self._older))
+        if limit <= 0:
+            return None
+        journal = self.journal
+        if journal is None:
+            from src.settings_manager import get_block_journal
+            journal = get_block_journal()
+        return cursor, skip, older_blocks(journal, cursor, limit, skip=skip)
+
+    def apply_older(self, page):
+        """
+        Agrega una página de fetch_older(). Retorna cuántos cierres (0 si no
+        hay más, o si la página quedó vieja porque entretanto se cargó otra).
+        """
+        if not page:
+            return 0
+        before, skip, events = page
+        if not events or (before, skip) != (self._older_cursor, self._older_skip):
+            return 0
+        cursor = str(events[0]['timestamp'])
+        same = sum(1 for e in events if str(e['timestamp']) == cursor)
+        # Los que comparten el timestamp del borde y no entraron quedan para la próxima página
+        self._older_skip = same + (skip if cursor == before else 0)
+        self._older_cursor = cursor
+        self._older.extendleft(f"[{str(e['timestamp'])[:19].replace('T', ' ')}] App cerrada: {e['app']}"
+                               for e in reversed(events))
+        self.version += 1
+        return len(events)
+
+    def load_older(self, limit=OLDER_PAGE):
+        """Trae y agrega una página de cierres anteriores (bloqueante). Retorna cuántos."""
+        return self.apply_older(self.fetch_older(limit))
+
+    def __len__(self):
+        return len(self._older) + len(self._entries)
+
+    def lines(self, start, stop):
+        """Líneas formateadas [start, stop) del total (anteriores + sesión)."""
+        older = len(self._older)
+        result = list(itertools.islice(self._older, start, min(stop, older)))
+        if stop > older:
+            size = len(self._entries)
+            low, high = max(0, start - older), min(stop - older, size)
+            if low > size - high:
+                # Cerca del final (lo habitual): se recorre desde atrás
+                entries = list(itertools.islice(reversed(self._entries.values()), size - high, size - low))
+                entries.reverse()
+            else:
+                entries = itertools.islice(self._entries.values(), low, high)
+            result.extend(entry.format() for entry in entries)
+        return result
+
+    def get_stats(self):
+        return {
+            'lines': len(self),
+            'added': self.added,
+            'evicted': self.evicted,
+            'older': len(self._older),
+        }
+
+
+class ActivityLogView:
+    """
+    Lista virtual sobre un ActivityLog: el Text contiene solo las filas
+    visibles y la barra de desplazamiento se calcula con el modelo.
+    """
+
+    def __init__(self, parent, log, older_label="⬆ Cargar anteriores", bus=None, **text_options):
+        import tkinter as tk
+        import tkinter.font
+
+        self.log = log
+        self._init_loader(bus)
+        self.offset = 0
+        self.follow = True
+        self._rendered = None
+        self.frame = tk.Frame(parent, bg=text_options.get('bg'))
+        self.older_button = tk.Button(self.frame, text=older_label, command=self.load_older,
+                                      relief=tk.FLAT, bg=text_options.get('bg'),
+                                      fg=text_options.get('fg'), font=("Segoe UI", 8))
+        self.older_button.pack(anchor=tk.W)
+        self.scrollbar = tk.Scrollbar(self.frame, command=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text = tk.Text(self.frame, wrap=tk.NONE, state=tk.DISABLED, **text_options)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self._linespace = tkinter.font.Font(font=self.text['font']).metrics('linespace')
+        self.rows = int(self.text['height'])
+        self.text.bind('<Configure>', self._on_resize)
+        self.text.bind('<MouseWheel>', lambda e: self.scroll(-WHEEL_LINES if e.delta > 0 else WHEEL_LINES))
+        self.text.bind('<Button-4>', lambda e: self.scroll(-WHEEL_LINES))
+        self.text.bind('<Button-5>', lambda e: self.scroll(WHEEL_LINES))
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def _max_offset(self):
+        return max(0, len(self.log) - self.rows)
+
+    def scroll(self, lines):
+        self.offset = min(max(0, self.offset + lines), self._max_offset())
+        self.follow = self.offset >= self._max_offset()
+        self.refresh()
+
+    def _on_scroll(self, action, value, unit=None):
+        if action == 'moveto':
+            self.offset = int(float(value) * len(self.log))
+            self.scroll(0)
+        else:
+            self.scroll(int(value) * (self.rows if unit == 'pages' else 1))
+
+    def _on_resize(self, event):
+        rows = max(1, event.height // max(1, self._linespace))
+        if rows != self.rows:
+            self.rows = rows
+            self.refresh(force=True)
+
+    def _init_loader(self, bus):
+        from src.ui_bus import ui_bus
+
+        self.bus = ui_bus if bus is None else bus
+        self._loading = False
+        # Un tipo de mensaje por vista: cada una recibe solo sus páginas
+        self._older_kind = f"activity-older-{id(self)}"
+        self.bus.on(self._older_kind, self._on_older_loaded)
+
+    def load_older(self):
+        """Pide la página anterior sin leer el disco en el hilo de Tk."""
+        if self._loading:
+            return
+        self._loading = True
+        self.older_button.config(state='disabled')
+        threading.Thread(target=self._fetch_older, name="guardian-activity-older", daemon=True).start()
+
+    def _fetch_older(self):
+        try:
+            result = (self.log.fetch_older(), None)
+        except Exception as e:
+            result = (None, e)
+        self.bus.post(self._older_kind, result)
+
+    def _on_older_loaded(self, results):
+        """Aplica las páginas leídas (hilo de Tk, vía ui_bus)."""
+        self._loading = False
+        added = 0
+        failed = False
+        for page, error in results:
+            if error is not None:
+                print(f"[Error] No se pudo leer el historial: {error}")
+                failed = True
+            added += self.log.apply_older(page)
+        if added:
+            self.offset = 0
+            self.follow = False
+            self.refresh(force=True)
+        # Sin más páginas el botón queda desactivado; tras un error se puede reintentar
+        self.older_button.config(state='normal' if added or failed else 'disabled')
+
+    def refresh(self, force=False):
+        """Vuelve a dibujar las filas visibles si cambió el modelo o la posición."""
+        if self.follow:
+            self.offset = self._max_offset()
+        key = (self.log.version, self.offset, self.rows)
+        if key == self._rendered and not force:
+            return
+        self._rendered = key
+        lines = self.log.lines(self.offset, self.offset + self.rows)
+        self.text.config(state='normal')
+        self.text.delete('1.0', 'end')
+        self.text.insert('end', "\n".join(lines))
+        self.text.config(state='disabled')
+        total = len(self.log)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.rows) / total))
+        else:
+            self.scrollbar.set(0, 1)
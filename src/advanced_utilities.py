@@ -5,7 +5,10 @@ Incluye notificaciones, temas, y funcionalidades extra.
 
 import json
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from src.json_store import save_json, load_json, COALESCE_WINDOW
+from src.event_store import event_store
 
 
 class ThemeManager:
@@ -99,8 +102,9 @@ class NotificationCenter:
 class SessionManager:
     """Gestor de sesiones de trabajo."""
     
-    def __init__(self, storage_path='sessions.json'):
+    def __init__(self, storage_path='sessions.json', store=event_store):
         self.storage_path = storage_path
+        self.store = store
         self.sessions = self.load_sessions()
         self.current_session = None
 
@@ -125,7 +129,10 @@ class SessionManager:
             self.current_session['completed'] = True
             
             self.sessions.append(self.current_session)
-            self.save_sessions()
+            if self.store is not None:
+                self.store.add_session('manager', self.current_session)
+            else:
+                self.save_sessions()
             
             session = self.current_session
             self.current_session = None
@@ -143,26 +150,24 @@ class SessionManager:
     def get_completed_sessions(self, days=1):
         """Retorna sesiones completadas de los últimos N días."""
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        if self.store is not None:
+            return [s for s in self.store.read_sessions('manager', since=cutoff, field='end')
+                    if s['completed']]
         return [s for s in self.sessions 
                 if s['completed'] and s['end'] > cutoff]
 
     def save_sessions(self):
         """Guarda las sesiones en archivo."""
         try:
-            with open(self.storage_path, 'w') as f:
-                json.dump(self.sessions, f, indent=2)
+            save_json(self.storage_path, self.sessions, indent=2, delay=COALESCE_WINDOW)
         except Exception as e:
             print(f"Error saving sessions: {e}")
 
     def load_sessions(self):
         """Carga las sesiones desde archivo."""
-        if os.path.exists(self.storage_path):
-            try:
-                with open(self.storage_path, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading sessions: {e}")
-        return []
+        if self.store is not None:
+            return self.store.read_sessions('manager')
+        return load_json(self.storage_path, [])
 
 
 class AchievementSystem:
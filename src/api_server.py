@@ -0,0 +1,466 @@
+"""
+API HTTP local que alimenta el dashboard web.
+Sirve /api/status, /api/stats, /api/stats/daily y /api/goals en
+127.0.0.1:5000 desde los agregados en memoria. Cada respuesta se serializa
+una sola vez por versión de los datos y lleva ETag: los sondeos sin cambios
+reciben 304. /api/stream empuja los cambios por Server-Sent Events,
+/api/trace expone los tiempos por etapa del monitor y /api/daemon el
+estado del demonio (src/daemon.py), si hay uno corriendo.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+
+try:
+    from flask import Flask, Response, request
+except ImportError:
+    Flask = None
+
+try:
+    from flask_cors import CORS
+except ImportError:
+    CORS = None
+
+from src.settings_manager import (
+    read_settings, get_settings_version, get_block_aggregates, block_journal,
+)
+from src.event_hub import event_hub, data_changed
+from src.tracing import tracer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5000
+
+
+class CachedResource:
+    """
+    Respuesta JSON precalculada. `build()` solo se vuelve a llamar cuando
+    cambia `version()`; mientras tanto se reutilizan el cuerpo y su ETag.
+    """
+
+    def __init__(self, build, version):
+        self.build = build
+        self.version = version
+        self._lock = threading.Lock()
+        self._version = None
+        self._data = None
+        self._body = None
+        self._etag = None
+        self.builds = 0
+
+    def _refresh(self):
+        version = self.version()
+        with self._lock:
+            if self._body is None or version != self._version:
+                data = self.build()
+                body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                self._data = data
+                self._body = body
+                self._etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+                self._version = version
+                self.builds += 1
+            return self._data, self._body, self._etag
+
+    def get(self):
+        """Retorna (cuerpo en bytes, etag) vigentes."""
+        _, body, etag = self._refresh()
+        return body, etag
+
+    def get_data(self):
+        """Retorna (datos, etag) vigentes. Los datos son compartidos: no mutar."""
+        data, _, etag = self._refresh()
+        return data, etag
+
+
+def _today():
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def _current_hour():
+    now = datetime.now()
+    return now.strftime("%Y-%m-%d"), now.hour
+
+
+def _blocking_active():
+    # Cambia en la transición exacta del horario (no solo al cambiar la hora)
+    from src.scheduler import is_blocking_active
+    return is_blocking_active()
+
+
+def build_status():
+    """Estado del bloqueo: activado, perfil y horario."""
+    from src.scheduler import is_blocking_active
+    from src.enforcement import enforcer
+
+    settings = read_settings()
+    return {
+        'enabled': bool(settings.get('enabled', True)),
+        'blocking_active': is_blocking_active(),
+        'profile': settings.get('current_profile'),
+        'pending_closes': sorted(enforcer.pending_apps()),
+    }
+
+
+def build_stats():
+    """Resumen del día: bloqueos, gamificación y riesgo actual."""
+    from src.gamification import get_gamification_status
+    from src.ml_analyzer import predict_distraction_risk
+
+    day = get_block_aggregates().get_day(_today())
+    risk_level, risk_score = predict_distraction_risk()
+    gamification = get_gamification_status()
+    return {
+        'total_blocks_today': day['total'],
+        'points': gamification['points'],
+        'level': gamification['level'],
+        'streak': gamification['streak'],
+        'hours': gamification['hours'],
+        'risk_level': risk_level,
+        'risk_score': risk_score,
+    }
+
+
+def build_daily_stats():
+    """Bloqueos de hoy por hora y por app."""
+    date = _today()
+    day = get_block_aggregates().get_day(date)
+    return {
+        'date': date,
+        'total_blocks': day['total'],
+        'hourly': {str(hour): count for hour, count in enumerate(day['hours'])},
+        'apps_blocked': dict(day['apps']),
+    }
+
+
+def build_goals():
+    """Progreso de las metas diarias con los bloqueos y sesiones de hoy."""
+    from src.daily_goals import DailyGoalsManager
+    from src.session_tracker import SessionTracker
+
+    day = get_block_aggregates().get_day(_today())
+    focus_minutes = SessionTracker().get_session_stats(days=1)['total_time']
+    return DailyGoalsManager().check_goal_progress({
+        'blocks_today': day['total'],
+        'focus_time_minutes': focus_minutes,
+    })
+
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _goals_version():
+    return (
+        block_journal.data_version(), _today(),
+        _file_signature("config/daily_goals.json"),
+        _file_signature("data/sessions_history.json"),
+    )
+
+
+def _pending_version():
+    from src.enforcement import enforcer
+    return tuple(sorted(enforcer.pending_apps()))
+
+
+RESOURCES = {
+    '/api/status': CachedResource(
+        build_status, lambda: (get_settings_version(), _blocking_active(), _pending_version())),
+    '/api/stats': CachedResource(
+        build_stats, lambda: (block_journal.data_version(), get_settings_version(), _current_hour(),
+                              _blocking_active())),
+    '/api/stats/daily': CachedResource(
+        build_daily_stats, lambda: (block_journal.data_version(), _today())),
+    '/api/goals': CachedResource(build_goals, _goals_version),
+}
+
+# Tipo de evento del stream -> ruta cuyo contenido se publica
+STREAMS = {
+    'status': '/api/status',
+    'stats': '/api/stats',
+    'blocks': '/api/stats/daily',
+    'goals': '/api/goals',
+}
+
+
+def compute_delta(old, new):
+    """
+    Diferencia entre dos dicts: claves nuevas o cambiadas con su valor
+    actual (recursivo en dicts anidados) y None para las eliminadas.
+    """
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return new
+    delta = {}
+    for key, value in new.items():
+        if key not in old:
+            delta[key] = value
+        elif old[key] != value:
+            delta[key] = compute_delta(old[key], value)
+    for key in old:
+        if key not in new:
+            delta[key] = None
+    return delta
+
+
+class StreamPublisher:
+    """
+    Un solo hilo revisa los recursos (al recibir data_changed o cada
+    `interval` segundos) y publica en el hub solo los cambios. Todos los
+    suscriptores leen del mismo registro: el trabajo no crece con ellos.
+    """
+
+    def __init__(self, resources=None, streams=None, hub=event_hub, interval=1.0):
+        self.resources = RESOURCES if resources is None else resources
+        self.streams = STREAMS if streams is None else streams
+        self.hub = hub
+        self.interval = interval
+        self.stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._last = {}
+        self._thread = None
+        self.checks = 0
+
+    def snapshot(self):
+        """
+        Estado completo de todos los streams. Publica antes los cambios
+        pendientes, así los deltas siguientes parten de este mismo estado.
+        """
+        with self._lock:
+            self._check()
+            return {kind: last[0] for kind, last in self._last.items()}
+
+    def check(self):
+        """Publica los deltas de los recursos que cambiaron. Retorna cuántos."""
+        with self._lock:
+            return self._check()
+
+    def _check(self):
+        self.checks += 1
+        published = 0
+        for kind, path in self.streams.items():
+            try:
+                data, etag = self.resources[path].get_data()
+            except Exception as e:
+                print(f"[Error] Stream {kind}: {e}")
+                continue
+            previous = self._last.get(kind)
+            if previous is not None and previous[1] == etag:
+                continue
+            self._last[kind] = (data, etag)
+            if previous is not None:
+                self.hub.publish(kind, compute_delta(previous[0], data))
+                published += 1
+        return published
+
+    def _run(self):
+        generation = data_changed.generation
+        while not self.stopped.is_set():
+            generation = data_changed.wait(generation, self.interval)
+            if self.stopped.is_set():
+                break
+            # Sin suscriptores no hay nadie a quien avisar
+            if self.hub.subscribers:
+                self.check()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return False
+        self.stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="guardian-stream", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self.stopped.set()
+        data_changed.notify()
+        self.hub.wake_all()
+        if self._thread is not None:
+            self._thread.join(5)
+            self._thread = None
+
+
+def _sse(kind, data, seq=None):
+    lines = [] if seq is None else [f"id: {seq}"]
+    lines.append(f"event: {kind}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+    return "\n".join(lines) + "\n\n"
+
+
+def stream_events(publisher, last_event_id=None, keepalive=15.0):
+    """
+    Generador SSE: un 'snapshot' inicial y luego los deltas publicados.
+    Con Last-Event-ID válido se reanuda sin snapshot.
+    """
+    hub = publisher.hub
+    seq = hub.subscribe()
+    try:
+        yield "retry: 3000\n\n"
+        resume = None
+        if last_event_id is not None:
+            try:
+                resume = int(last_event_id)
+            except ValueError:
+                resume = None
+        if resume is not None and resume <= seq:
+            seq = resume
+        else:
+            yield _sse('snapshot', publisher.snapshot(), seq)
+
+        while not publisher.stopped.is_set():
+            events, lost = hub.read(seq, timeout=keepalive)
+            if publisher.stopped.is_set():
+                break
+            if lost:
+                seq = hub.last_seq
+                yield _sse('snapshot', publisher.snapshot(), seq)
+                continue
+            if not events:
+                yield ": keepalive\n\n"
+                continue
+            for event_seq, kind, data in events:
+                yield _sse(kind, data, event_seq)
+                seq = event_seq
+    finally:
+        hub.unsubscribe()
+
+
+def _etag_matches(header, etag):
+    """
+    If-None-Match con comparación débil (RFC 9110): acepta `*`, listas
+    separadas por comas y validadores W/"...".
+    """
+    if not header:
+        return False
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def create_app(resources=None, publisher=None):
+    """
+    Crea la app Flask con las rutas del dashboard. Con `publisher` agrega
+    además /api/stream (Server-Sent Events).
+    """
+    if Flask is None:
+        raise RuntimeError("Para la API local se requiere: pip install flask")
+    resources = RESOURCES if resources is None else resources
+    app = Flask("guardian_api")
+    if CORS is not None:
+        CORS(app)
+
+    def serve(resource):
+        try:
+            body, etag = resource.get()
+        except Exception as e:
+            print(f"[Error] API: {e}")
+            return Response(json.dumps({'error': str(e)}), status=500, mimetype='application/json')
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if _etag_matches(request.headers.get('If-None-Match'), etag):
+            return Response(status=304, headers=headers)
+        return Response(body, mimetype='application/json', headers=headers)
+
+    for path, resource in resources.items():
+        app.add_url_rule(path, endpoint=path, view_func=lambda resource=resource: serve(resource))
+
+    if publisher is not None:
+        @app.route('/api/stream')
+        def stream():
+            last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+            return Response(
+                stream_events(publisher, last_event_id),
+                mimetype='text/event-stream',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+            )
+
+    @app.route('/api/trace')
+    def trace():
+        # Sin cache: son métricas en vivo del monitor de este proceso
+        return Response(json.dumps(tracer.get_stats()), mimetype='application/json',
+                        headers={'Cache-Control': 'no-store'})
+
+    @app.route('/api/daemon')
+    def daemon_status():
+        from src.daemon import try_request
+        status = try_request('status') or {'ok': False, 'running': None}
+        return Response(json.dumps(status), mimetype='application/json',
+                        headers={'Cache-Control': 'no-store'})
+
+    @app.route('/')
+    def dashboard():
+        from src.dashboard import get_dashboard_html
+        return Response(get_dashboard_html(), mimetype='text/html')
+
+    return app
+
+
+class ApiServer:
+    """Servidor de la API en un hilo de fondo, con parada limpia."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, resources=None):
+        self.host = host
+        self.port = port
+        self.resources = resources
+        self.publisher = StreamPublisher(resources)
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """Inicia el servidor. Retorna False si ya estaba corriendo."""
+        if self._thread is not None and self._thread.is_alive():
+            return False
+        from werkzeug.serving import make_server
+
+        # Sin log por petición: los dashboards sondean constantemente
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        app = create_app(self.resources, self.publisher)
+        self._server = make_server(self.host, self.port, app, threaded=True)
+        self.port = self._server.server_port
+        self._thread = threading.Thread(target=self._server.serve_forever, name="guardian-api", daemon=True)
+        self._thread.start()
+        self.publisher.start()
+        print(f"[Guardian] API local en http://{self.host}:{self.port}")
+        return True
+
+    def stop(self):
+        """Detiene el servidor y espera al hilo."""
+        if self._server is None:
+            return
+        # Cerrar primero los streams abiertos para que no bloqueen la parada
+        self.publisher.stop()
+        self._server.shutdown()
+        self._thread.join(5)
+        self._server.server_close()
+        self._server = None
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+
+api_server = ApiServer()
+
+
+def run_api_server(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Corre la API en primer plano (bloqueante)."""
+    publisher = StreamPublisher()
+    publisher.start()
+    try:
+        create_app(publisher=publisher).run(host=host, port=port, threaded=True)
+    finally:
+        publisher.stop()
+
+
+if __name__ == "__main__":
+    run_api_server()
@@ -0,0 +1,108 @@
+"""
+Motor de coincidencias precompilado para apps bloqueadas.
+Construye un autómata Aho-Corasick una sola vez por lista de apps y
+lo reutiliza en cada tick del monitor.
+"""
+
+import threading
+
+
+def normalize_app_name(app):
+    """Normaliza un nombre de app: minúsculas y sin '.exe'."""
+    return app.lower().replace('.exe', '')
+
+
+class AppMatcher:
+    """Autómata Aho-Corasick sobre los nombres normalizados de las apps."""
+
+    def __init__(self, apps, strip_exe=True):
+        self.apps = list(apps)
+        self.strip_exe = strip_exe
+        # Cada nodo: transiciones, enlace de fallo y el menor índice de app
+        # que termina en él (directamente o por su cadena de fallos).
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [None]
+        self._build()
+
+    def _add_pattern(self, pattern, index):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(None)
+            node = next_node
+        if self._best[node] is None or index < self._best[node]:
+            self._best[node] = index
+
+    def _build(self):
+        for index, app in enumerate(self.apps):
+            lower = app.lower()
+            self._add_pattern(lower, index)
+            if self.strip_exe:
+                self._add_pattern(lower.replace('.exe', ''), index)
+
+        # Recorrido en anchura para calcular los enlaces de fallo
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                inherited = self._best[self._fail[child]]
+                if inherited is not None and (self._best[child] is None or inherited < self._best[child]):
+                    self._best[child] = inherited
+
+    def match_index(self, text):
+        """
+        Retorna el índice (en la lista original) de la primera app que
+        aparece en el texto, o None si ninguna coincide.
+        """
+        goto = self._goto
+        fail = self._fail
+        best_by_node = self._best
+        best = best_by_node[0]
+        node = 0
+        for char in text.lower():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            candidate = best_by_node[node]
+            if candidate is not None and (best is None or candidate < best):
+                best = candidate
+                if best == 0:
+                    break
+        return best
+
+    def match(self, text):
+        """Retorna la primera app que aparece en el texto, o None."""
+        index = self.match_index(text)
+        return self.apps[index] if index is not None else None
+
+
+_MAX_CACHED = 8
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def get_matcher(apps, strip_exe=True):
+    """
+    Retorna el matcher compilado para la lista de apps.
+    Solo se reconstruye cuando el contenido de la lista cambia.
+    """
+    key = (strip_exe, tuple(apps))
+    with _cache_lock:
+        matcher = _cache.get(key)
+        if matcher is None:
+            if len(_cache) >= _MAX_CACHED:
+                _cache.pop(next(iter(_cache)))
+            matcher = AppMatcher(key[1], strip_exe=strip_exe)
+            _cache[key] = matcher
+        return matcher
@@ -0,0 +1,124 @@
+"""
+Agregados diarios de bloqueos mantenidos de forma incremental.
+Por cada día guarda el total, los bloqueos por hora y por app, en un
+archivo pequeño por día. Los reportes leen estos contadores en O(días)
+en lugar de reprocesar todo el historial.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+from src.json_store import save_json
+
+
+def _parse_timestamp(timestamp):
+    """
+    Retorna (día, hora) de un timestamp ISO, o (None, None). Acepta 'T' o
+    espacio como separador; con offset se usa la hora local del timestamp.
+    """
+    try:
+        moment = datetime.fromisoformat(str(timestamp))
+    except ValueError:
+        return None, None
+    return moment.strftime("%Y-%m-%d"), moment.hour
+
+
+def _empty_day():
+    return {'total': 0, 'hours': [0] * 24, 'apps': {}}
+
+
+class BlockAggregates:
+    """Contadores por día, hora y app, persistidos en un archivo por día."""
+
+    def __init__(self, aggregates_dir):
+        self.aggregates_dir = aggregates_dir
+        self._lock = threading.RLock()
+        self._days = None
+        self._dir_mtime = None
+
+    def _day_path(self, day):
+        return os.path.join(self.aggregates_dir, f"{day}.json")
+
+    def _current_dir_mtime(self):
+        try:
+            return os.stat(self.aggregates_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self):
+        """Carga los agregados si no están en memoria o si otro proceso los cambió."""
+        mtime = self._current_dir_mtime()
+        if self._days is not None and mtime == self._dir_mtime:
+            return self._days
+        days = {}
+        if mtime is not None:
+            for name in os.listdir(self.aggregates_dir):
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(self.aggregates_dir, name), 'r', encoding='utf-8') as f:
+                        days[name[:-len(".json")]] = json.load(f)
+                except Exception as e:
+                    print(f"[Error] No se pudo cargar agregado {name}: {e}")
+        self._days = days
+        self._dir_mtime = mtime
+        return days
+
+    def _write_day(self, day, data):
+        save_json(self._day_path(day), data)
+
+    def exists(self):
+        """Indica si ya hay agregados en disco."""
+        return os.path.isdir(self.aggregates_dir)
+
+    def _add(self, days, app, timestamp):
+        day, hour = _parse_timestamp(timestamp)
+        if day is None:
+            return None
+        data = days.setdefault(day, _empty_day())
+        data['total'] += 1
+        data['hours'][hour % 24] += 1
+        data['apps'][app] = data['apps'].get(app, 0) + 1
+        return day
+
+    def record(self, app, timestamp):
+        """Suma un bloqueo a los contadores de su día (O(1))."""
+        with self._lock:
+            days = self._load()
+            day = self._add(days, app, timestamp)
+            if day is None:
+                return
+            try:
+                self._write_day(day, days[day])
+                self._dir_mtime = self._current_dir_mtime()
+            except Exception as e:
+                print(f"[Error] No se pudo guardar agregado {day}: {e}")
+                self._days = None
+
+    def rebuild(self, blocks):
+        """Recalcula todos los agregados desde el historial crudo."""
+        with self._lock:
+            days = {}
+            for block in blocks:
+                self._add(days, block.get('app'), block.get('timestamp', ''))
+            os.makedirs(self.aggregates_dir, exist_ok=True)
+            for name in os.listdir(self.aggregates_dir):
+                if name.endswith(".json") and name[:-len(".json")] not in days:
+                    os.remove(os.path.join(self.aggregates_dir, name))
+            for day, data in days.items():
+                self._write_day(day, data)
+            self._days = days
+            self._dir_mtime = self._current_dir_mtime()
+            return len(days)
+
+    def get_day(self, day):
+        """Contadores de un día (YYYY-MM-DD); vacíos si no hubo bloqueos."""
+        with self._lock:
+            return self._load().get(day) or _empty_day()
+
+    def get_days(self):
+        """Días con agregados, ordenados."""
+        with self._lock:
+            return sorted(self._load())
@@ -0,0 +1,262 @@
+"""
+Journal append-only de eventos de bloqueo.
+Cada bloqueo se agrega como una línea JSON al journal activo; la
+compactación periódica mueve las líneas a segmentos diarios
+(YYYY-MM-DD.jsonl) para que el costo de registrar un evento no crezca
+con el historial.
+La compactación y la importación son idempotentes: antes de agregar a
+los segmentos se guarda un marcador con su tamaño previo, y si el
+proceso muere a mitad de camino se truncan y se vuelve a agregar.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+from src.json_store import atomic_write_json
+
+UNDATED_SEGMENT = "undated"
+COMPACT_MARKER = ".compact.json"
+IMPORT_MARKER = ".import.json"
+
+
+def _segment_day(timestamp):
+    """Retorna el día (YYYY-MM-DD) al que pertenece un timestamp."""
+    day = str(timestamp)[:10]
+    try:
+        datetime.strptime(day, "%Y-%m-%d")
+        return day
+    except ValueError:
+        return UNDATED_SEGMENT
+
+
+def _encode(event):
+    return json.dumps(event, ensure_ascii=False, separators=(',', ':')) + "\n"
+
+
+def _read_lines(path):
+    """Lee eventos de un archivo JSON-lines, ignorando líneas corruptas."""
+    events = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    # Línea truncada por un cierre abrupto
+                    continue
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[Error] No se pudo leer {path}: {e}")
+    return events
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def _read_marker(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class BlockJournal:
+    """Journal de bloqueos con compactación en segmentos diarios."""
+
+    def __init__(self, journal_file, segments_dir, compact_every=500):
+        self.journal_file = journal_file
+        self.segments_dir = segments_dir
+        self.compact_every = compact_every
+        self._lock = threading.RLock()
+        self._pending = None
+        self._journal_day = None
+        self._version = 0
+        self._recovered = False
+        self.compacting_file = journal_file + ".compacting"
+
+    def segment_path(self, day):
+        """Ruta del segmento de un día."""
+        return os.path.join(self.segments_dir, f"{day}.jsonl")
+
+    def append(self, app_name, timestamp):
+        """Agrega un evento al final del journal (O(1))."""
+        event = {'app': app_name, 'timestamp': timestamp}
+        day = _segment_day(timestamp)
+        with self._lock:
+            self._recover()
+            if self._pending is None:
+                existing = _read_lines(self.journal_file)
+                self._pending = len(existing)
+                if existing:
+                    self._journal_day = _segment_day(existing[-1].get('timestamp', ''))
+            if self._journal_day is not None and day != self._journal_day:
+                # Cambio de día: los eventos anteriores pasan a su segmento
+                self.compact()
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write(_encode(event))
+            self._pending += 1
+            self._version += 1
+            self._journal_day = day
+            if self._pending >= self.compact_every:
+                self.compact()
+        return event
+
+    def _append_to_segments(self, events, marker=None, key=None):
+        """
+        Agrega eventos a sus segmentos. Con `marker` es idempotente: un lote
+        ya aplicado con la misma `key` no se repite y uno aplicado a medias
+        se trunca al tamaño previo antes de volver a agregarse.
+        Retorna False si el lote ya estaba aplicado.
+        """
+        by_day = {}
+        for event in events:
+            by_day.setdefault(_segment_day(event.get('timestamp', '')), []).append(event)
+        os.makedirs(self.segments_dir, exist_ok=True)
+        sizes = {}
+        if marker is not None:
+            marker_path = os.path.join(self.segments_dir, marker)
+            state = _read_marker(marker_path) or {}
+            if state.get('key') == key:
+                if state.get('done'):
+                    return False
+                sizes = state.get('sizes', {})
+            else:
+                sizes = {day: _file_size(self.segment_path(day)) for day in by_day}
+                atomic_write_json(marker_path, {'key': key, 'sizes': sizes, 'done': False})
+        for day, day_events in by_day.items():
+            path = self.segment_path(day)
+            if day in sizes and _file_size(path) > sizes[day]:
+                # Restos de un intento interrumpido
+                os.truncate(path, sizes[day])
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(''.join(_encode(e) for e in day_events))
+                f.flush()
+                os.fsync(f.fileno())
+        if marker is not None:
+            atomic_write_json(marker_path, {'key': key, 'done': True})
+        return True
+
+    def _compact_batch(self):
+        """Pasa el lote renombrado (compacting_file) a los segmentos."""
+        events = _read_lines(self.compacting_file)
+        self._append_to_segments(events, COMPACT_MARKER, 'compact')
+        _remove(self.compacting_file)
+        _remove(os.path.join(self.segments_dir, COMPACT_MARKER))
+        return len(events)
+
+    def _recover(self):
+        """Termina una compactación que un cierre abrupto dejó a medias."""
+        if not self._recovered:
+            self._recovered = True
+            if os.path.exists(self.compacting_file):
+                self._compact_batch()
+                self._version += 1
+
+    def compact(self):
+        """
+        Mueve el contenido del journal activo a los segmentos diarios.
+        El journal se renombra antes de copiarlo: si el proceso muere, el
+        lote renombrado se retoma una sola vez y no se duplican eventos.
+        """
+        with self._lock:
+            self._recovered = True
+            count = 0
+            if os.path.exists(self.compacting_file):
+                count += self._compact_batch()
+            # Sin lote pendiente, un marcador es de una compactación ya terminada
+            _remove(os.path.join(self.segments_dir, COMPACT_MARKER))
+            if os.path.exists(self.journal_file):
+                os.replace(self.journal_file, self.compacting_file)
+                count += self._compact_batch()
+            self._pending = 0
+            self._version += 1
+            return count
+
+    def list_segments(self):
+        """Retorna los días con segmento, ordenados."""
+        try:
+            names = os.listdir(self.segments_dir)
+        except FileNotFoundError:
+            return []
+        return sorted(n[:-len(".jsonl")] for n in names if n.endswith(".jsonl"))
+
+    def read_blocks(self, start_day=None, end_day=None):
+        """
+        Retorna los eventos entre start_day y end_day (YYYY-MM-DD, inclusivos).
+        Solo se leen los segmentos del rango.
+        """
+        def in_range(day):
+            if day == UNDATED_SEGMENT:
+                return start_day is None and end_day is None
+            return (start_day is None or day >= start_day) and (end_day is None or day <= end_day)
+
+        with self._lock:
+            self._recover()
+            blocks = []
+            for day in self.list_segments():
+                if in_range(day):
+                    blocks.extend(_read_lines(self.segment_path(day)))
+            for event in _read_lines(self.journal_file):
+                if in_range(_segment_day(event.get('timestamp', ''))):
+                    blocks.append(event)
+            return blocks
+
+    def import_blocks(self, blocks, batch_id=None):
+        """
+        Importa una lista de eventos existentes directamente a segmentos.
+        Con `batch_id` el lote se importa una sola vez aunque se reintente
+        (retorna 0 si ya estaba importado).
+        """
+        with self._lock:
+            self._recover()
+            if batch_id is None:
+                self._append_to_segments(blocks)
+            elif not self._append_to_segments(blocks, IMPORT_MARKER, batch_id):
+                return 0
+            self._version += 1
+            return len(blocks)
+
+    def replace_all(self, blocks):
+        """Reemplaza todo el historial por la lista dada."""
+        with self._lock:
+            for day in self.list_segments():
+                os.remove(self.segment_path(day))
+            for path in (self.journal_file, self.compacting_file,
+                         os.path.join(self.segments_dir, COMPACT_MARKER)):
+                _remove(path)
+            self._recovered = True
+            self._pending = 0
+            self._append_to_segments(blocks)
+            self._version += 1
+
+    def data_version(self):
+        """
+        Identificador que cambia cada vez que cambia el historial, en este
+        proceso (contador) o en otro (firma de los archivos).
+        """
+        signature = []
+        for path in (self.journal_file, self.segments_dir):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append(None)
+        return (self._version, tuple(signature))
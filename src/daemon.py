@@ -0,0 +1,368 @@
+"""
+Demonio de Guardian: el monitor corre en su propio proceso, sin interfaz,
+y se controla por un canal local (named pipe en Windows, socket Unix en el
+resto) autenticado con una clave guardada junto a los datos. La UI, la API
+y las herramientas de línea de comandos son clientes: una UI trabada no
+puede demorar la detección.
+
+Protocolo: cada conexión envía un dict {'cmd': ...} y recibe un dict de
+respuesta. Comandos: status, start, stop, pause, resume, switch-profile
+(profile), shutdown y events (after): este último deja la conexión
+abierta y envía cada evento del monitor a medida que ocurre.
+
+Uso: python main.py --daemon [--api]
+     python src/daemon.py status | start | stop | pause | resume | events
+     python src/daemon.py switch-profile estudio
+"""
+
+import argparse
+import os
+import secrets
+import sys
+import threading
+import time
+from datetime import datetime
+from multiprocessing.connection import Client, Listener, AuthenticationError
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.event_hub import event_hub
+
+if sys.platform == "win32":
+    DEFAULT_ADDRESS = r"\\.\pipe\guardian-daemon"
+else:
+    DEFAULT_ADDRESS = "guardian_daemon.sock"
+AUTHKEY_FILE = "guardian_daemon.key"
+KEEPALIVE = 15
+
+
+def _family(address):
+    return 'AF_PIPE' if address.startswith('\\\\.\\pipe\\') else 'AF_UNIX'
+
+
+def load_authkey(path=AUTHKEY_FILE, create=False):
+    """Clave compartida con los clientes; el demonio la crea (solo lectura del usuario)."""
+    if not create or os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    key = secrets.token_bytes(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    return key
+
+
+class GuardianDaemon:
+    """Servidor del canal de control; el hilo del monitor lo maneja MonitorService."""
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=None, hub=event_hub, service=None):
+        from src.monitor import monitor_service
+
+        self.address = address
+        self.authkey = authkey
+        self.hub = hub
+        self.service = monitor_service if service is None else service
+        self.started_at = time.time()
+        self._listener = None
+        self._shutdown = threading.Event()
+        self.commands = {
+            'status': self.status,
+            'start': self.start_monitor,
+            'stop': self.stop_monitor,
+            'pause': self.pause_monitor,
+            'resume': self.resume_monitor,
+            'switch-profile': self.switch_profile,
+            'shutdown': self._request_shutdown,
+        }
+
+    # ---------- Monitor ----------
+
+    def _publish(self, kind, data):
+        self.hub.publish(kind, dict(data, time=datetime.now().isoformat(timespec='seconds')))
+
+    def _on_message(self, message):
+        self._publish('message', {'text': message})
+
+    def is_running(self):
+        return self.service.is_running()
+
+    def start_monitor(self):
+        """Inicia el monitor si no está corriendo."""
+        return {'ok': True, 'changed': self.service.start(ui_callback=self._on_message)}
+
+    def stop_monitor(self, timeout=5.0):
+        """Detiene el monitor y espera a que su hilo termine."""
+        from src.monitor import STOPPED
+
+        changed = self.service.state != STOPPED
+        return {'ok': self.service.stop(timeout), 'changed': changed}
+
+    def pause_monitor(self):
+        return {'ok': True, 'changed': self.service.pause()}
+
+    def resume_monitor(self):
+        return {'ok': True, 'changed': self.service.resume()}
+
+    def switch_profile(self, profile=None):
+        from src.settings_manager import switch_profile
+
+        if not profile or not switch_profile(profile):
+            return {'ok': False, 'error': f"Perfil desconocido: {profile}"}
+        self._publish('profile', {'profile': profile})
+        return {'ok': True}
+
+    def status(self):
+        from src.settings_manager import get_current_profile
+
+        status = {
+            'ok': True,
+            'pid': os.getpid(),
+            'running': self.is_running(),
+            'state': self.service.get_state(),
+            'profile': get_current_profile(),
+            'uptime': round(time.time() - self.started_at, 1),
+            'last_seq': self.hub.last_seq,
+        }
+        from src.monitor import get_monitor_stats
+
+        status['monitor'] = get_monitor_stats()
+        return status
+
+    # ---------- Canal de control ----------
+
+    def handle(self, request):
+        """Ejecuta un comando y retorna la respuesta."""
+        if not isinstance(request, dict) or request.get('cmd') not in self.commands:
+            return {'ok': False, 'error': f"Comando desconocido: {request!r}"}
+        params = {k: v for k, v in request.items() if k != 'cmd'}
+        try:
+            return self.commands[request['cmd']](**params)
+        except TypeError as e:
+            # Parámetros que el comando no acepta
+            return {'ok': False, 'error': str(e)}
+        except Exception as e:
+            # Un comando que falla no debe cortar la conexión del cliente
+            print(f"[Error] Comando {request['cmd']}: {e}")
+            return {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+
+    def _stream(self, conn, after=None):
+        """Envía los eventos posteriores a `after` hasta que el cliente cierre."""
+        seq = self.hub.subscribe()
+        if after is not None:
+            seq = after
+        try:
+            while not self._shutdown.is_set():
+                events, lost = self.hub.read(seq, timeout=KEEPALIVE)
+                if self._shutdown.is_set():
+                    break
+                if lost:
+                    conn.send({'event': 'lost', 'seq': self.hub.last_seq})
+                if not events:
+                    conn.send({'event': 'keepalive', 'seq': seq})
+                    continue
+                for event_seq, kind, data in events:
+                    conn.send({'event': kind, 'seq': event_seq, 'data': data})
+                    seq = event_seq
+        finally:
+            self.hub.unsubscribe()
+
+    def _serve_connection(self, conn):
+        try:
+            while not self._shutdown.is_set():
+                try:
+                    request = conn.recv()
+                except EOFError:
+                    break
+                if isinstance(request, dict) and request.get('cmd') == 'events':
+                    self._stream(conn, request.get('after'))
+                    break
+                conn.send(self.handle(request))
+                if self._shutdown.is_set():
+                    # Recién ahora: la respuesta ya salió antes de que el proceso termine
+                    self._wake_listener()
+        except (OSError, EOFError):
+            pass
+        finally:
+            conn.close()
+
+    def _listen(self):
+        family = _family(self.address)
+        try:
+            return Listener(self.address, family, authkey=self.authkey)
+        except OSError:
+            if family != 'AF_UNIX' or not os.path.exists(self.address) or daemon_running(self.address):
+                raise
+            # Socket huérfano de un demonio que terminó mal
+            os.remove(self.address)
+            return Listener(self.address, family, authkey=self.authkey)
+
+    def serve_forever(self, autostart=True):
+        """Atiende clientes hasta shutdown(). Con `autostart` inicia el monitor."""
+        if self.authkey is None:
+            self.authkey = load_authkey(create=True)
+        self._listener = self._listen()
+        print(f"[Guardian] Demonio escuchando en {self.address}")
+        if autostart:
+            self.start_monitor()
+        try:
+            while not self._shutdown.is_set():
+                try:
+                    conn = self._listener.accept()
+                except AuthenticationError:
+                    continue
+                except OSError:
+                    if self._shutdown.is_set():
+                        break
+                    raise
+                threading.Thread(target=self._serve_connection, args=(conn,),
+                                 name="guardian-daemon-client", daemon=True).start()
+        finally:
+            self.stop_monitor()
+            self._listener.close()
+
+    def _request_shutdown(self):
+        self._shutdown.set()
+        self.hub.wake_all()
+        return {'ok': True}
+
+    def shutdown(self):
+        """Detiene el monitor y el servidor."""
+        self._request_shutdown()
+        self._wake_listener()
+
+    def _wake_listener(self):
+        # accept() no se interrumpe al cerrar el listener: se lo despierta conectando
+        try:
+            Client(self.address, _family(self.address), authkey=self.authkey).close()
+        except Exception:
+            pass
+
+
+# ---------- Clientes ----------
+
+class DaemonClient:
+    """Cliente del canal de control."""
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=None):
+        self.address = address
+        self.authkey = authkey
+
+    def _connect(self):
+        authkey = self.authkey if self.authkey is not None else load_authkey()
+        return Client(self.address, _family(self.address), authkey=authkey)
+
+    def request(self, cmd, **params):
+        """Envía un comando y retorna la respuesta del demonio."""
+        conn = self._connect()
+        try:
+            conn.send(dict(params, cmd=cmd))
+            return conn.recv()
+        finally:
+            conn.close()
+
+    def events(self, after=None):
+        """Genera los eventos del demonio (bloqueante) hasta que se cierre."""
+        conn = self._connect()
+        try:
+            conn.send({'cmd': 'events', 'after': after})
+            while True:
+                try:
+                    yield conn.recv()
+                except EOFError:
+                    return
+        finally:
+            conn.close()
+
+    def subscribe(self, callback, after=None):
+        """
+        Sigue los eventos en un hilo propio y llama `callback(evento)` por
+        cada uno (sin los keepalive). Retorna un Event: activarlo corta la
+        suscripción en el próximo evento; queda activado si el demonio cierra.
+        """
+        stop = threading.Event()
+
+        def run():
+            try:
+                for event in self.events(after):
+                    if stop.is_set():
+                        break
+                    if event['event'] == 'keepalive':
+                        continue
+                    try:
+                        callback(event)
+                    except Exception as e:
+                        print(f"[Error] Evento del demonio: {e}")
+            except (OSError, EOFError, AuthenticationError):
+                pass
+            finally:
+                stop.set()
+
+        threading.Thread(target=run, name="guardian-daemon-events", daemon=True).start()
+        return stop
+
+
+def try_request(cmd, address=DEFAULT_ADDRESS, **params):
+    """Como DaemonClient.request, pero retorna None si no hay demonio."""
+    try:
+        return DaemonClient(address).request(cmd, **params)
+    except (OSError, EOFError, AuthenticationError):
+        return None
+
+
+def daemon_running(address=DEFAULT_ADDRESS):
+    return try_request('status', address) is not None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Demonio de Guardian y su control")
+    parser.add_argument('--address', default=DEFAULT_ADDRESS)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run = subparsers.add_parser('run', help="correr el demonio en primer plano")
+    run.add_argument('--api', action='store_true', help="servir también la API local")
+    run.add_argument('--no-autostart', dest='autostart', action='store_false',
+                     help="no iniciar el monitor hasta recibir 'start'")
+    for name in ('status', 'start', 'stop', 'pause', 'resume', 'shutdown', 'events'):
+        subparsers.add_parser(name)
+    switch = subparsers.add_parser('switch-profile')
+    switch.add_argument('profile')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        daemon = GuardianDaemon(args.address)
+        if args.api:
+            from src.api_server import api_server
+            try:
+                api_server.start()
+            except (RuntimeError, ImportError) as e:
+                print(f"[Error] No se pudo iniciar la API local: {e}")
+        try:
+            daemon.serve_forever(autostart=args.autostart)
+        except KeyboardInterrupt:
+            print("Demonio detenido")
+        except OSError as e:
+            print(f"[Error] No se pudo abrir {args.address} (¿ya hay un demonio?): {e}")
+            return 1
+        return 0
+
+    client = DaemonClient(args.address)
+    try:
+        if args.command == 'events':
+            for event in client.events():
+                if event['event'] != 'keepalive':
+                    print(f"[{event['seq']}] {event['event']}: {event.get('data')}", flush=True)
+            return 0
+        params = {'profile': args.profile} if args.command == 'switch-profile' else {}
+        reply = client.request(args.command, **params)
+    except (OSError, EOFError, AuthenticationError) as e:
+        print(f"[Error] No hay un demonio de Guardian en {args.address}: {e}")
+        return 1
+    except KeyboardInterrupt:
+        return 0
+    for key, value in reply.items():
+        print(f"{key}: {value}")
+    return 0 if reply.get('ok') else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,10 @@
 """
 Sistema de metas diarias - Establece y monitorea objetivos de productividad
 """
-import json
-import os
 from datetime import datetime, timedelta
 
+from src.json_store import save_json, load_json, COALESCE_WINDOW
+
 
 class DailyGoalsManager:
     """Gestiona metas diarias y su progreso."""
@@ -15,13 +15,7 @@ class DailyGoalsManager:
     
     def load_goals(self):
         """Carga las metas del archivo."""
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return self._default_goals()
-        return self._default_goals()
+        return load_json(self.config_path) or self._default_goals()
     
     def _default_goals(self):
         """Retorna metas por defecto."""
@@ -36,9 +30,7 @@ class DailyGoalsManager:
     
     def save_goals(self):
         """Guarda las metas."""
-        os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(self.goals, f, indent=2)
+        save_json(self.config_path, self.goals, indent=2, delay=COALESCE_WINDOW)
     
     def set_goal(self, goal_type, value):
         """Establece una meta."""
@@ -237,11 +237,26 @@ DASHBOARD_HTML = """
                     </li>
                 </ul>
             </div>
+            
+            <div class="card">
+                <h2>📝 Actividad</h2>
+                <ul class="stats-list" id="activity"></ul>
+            </div>
         </div>
     </div>
     
     <script>
         const API_URL = 'http://127.0.0.1:5000/api';
+        const state = { status: {}, stats: {}, blocks: {}, goals: {} };
+        let hourlyChart = null;
+        let appsChart = null;
+        let monitorState = null;
+        const MONITOR_LABELS = {
+            running: '▶️ Monitoreando',
+            paused: '⏸️ En pausa',
+            stopping: '⏹️ Deteniendo',
+            stopped: '⏹️ Detenido'
+        };
         
         async function fetchData(endpoint) {
             try {
@@ -253,86 +268,195 @@ DASHBOARD_HTML = """
             }
         }
         
-        async function updateDashboard() {
-            // Status
-            const status = await fetchData('/status');
-            if (status) {
-                document.getElementById('status').textContent = status.enabled ? '🟢 ACTIVO' : '🔴 INACTIVO';
+        // Aplica un delta del servidor: claves cambiadas con su valor nuevo,
+        // null para las eliminadas, recursivo en objetos anidados
+        function applyDelta(target, delta) {
+            for (const [key, value] of Object.entries(delta)) {
+                if (value === null) {
+                    delete target[key];
+                } else if (typeof value === 'object' && !Array.isArray(value)
+                           && typeof target[key] === 'object' && target[key] !== null) {
+                    applyDelta(target[key], value);
+                } else {
+                    target[key] = value;
+                }
             }
-            
-            // Stats
-            const stats = await fetchData('/stats');
-            if (stats) {
-                document.getElementById('blocks').textContent = stats.total_blocks_today;
+            return target;
+        }
+        
+        function renderStatus() {
+            const status = state.status;
+            const element = document.getElementById('status');
+            element.textContent = status.enabled ? '🟢 ACTIVO' : '🔴 INACTIVO';
+            element.title = [
+                status.profile ? `Perfil: ${status.profile}` : null,
+                monitorState ? `Monitor: ${MONITOR_LABELS[monitorState] || monitorState}` : null
+            ].filter(Boolean).join(' · ');
+        }
+        
+        // Últimos avisos del monitor y del demonio, el más reciente arriba
+        function addActivity(text, time) {
+            const list = document.getElementById('activity');
+            const item = document.createElement('li');
+            const when = document.createElement('span');
+            const what = document.createElement('span');
+            when.textContent = time ? time.slice(11, 19) : new Date().toLocaleTimeString();
+            what.textContent = text;
+            item.append(what, when);
+            list.prepend(item);
+            while (list.children.length > 20) {
+                list.lastChild.remove();
             }
+        }
+        
+        function renderStats() {
+            const stats = state.stats;
+            document.getElementById('blocks').textContent = stats.total_blocks_today ?? 0;
+            document.getElementById('points').textContent = stats.points ?? 0;
+            document.getElementById('streak').textContent = `${stats.streak ?? 0} días`;
+            document.getElementById('level').textContent = stats.level ?? 1;
+            document.getElementById('progressFill').style.width = `${((stats.points ?? 0) % 1000) / 10}%`;
+            if (stats.risk_level) {
+                document.getElementById('riskLevel').textContent = stats.risk_level.toUpperCase();
+                document.getElementById('riskScore').textContent = `${stats.risk_score}/100`;
+            }
+        }
+        
+        function renderGoals() {
+            const blocks = (state.goals || {}).blocks;
+            if (blocks) {
+                document.getElementById('blocks').title = `Límite diario: ${blocks.limit}`;
+            }
+        }
+        
+        function renderCharts() {
+            const hourData = state.blocks.hourly || {};
+            const appData = state.blocks.apps_blocked || {};
+            const topApps = Object.entries(appData)
+                .sort((a, b) => b[1] - a[1])
+                .slice(0, 5);
             
-            // Daily stats
-            const daily = await fetchData('/stats/daily');
-            if (daily) {
-                updateCharts(daily);
+            // Los gráficos se crean una vez y luego solo se actualizan
+            if (!hourlyChart) {
+                const hourCtx = document.getElementById('hourlyChart').getContext('2d');
+                hourlyChart = new Chart(hourCtx, {
+                    type: 'line',
+                    data: {
+                        labels: [],
+                        datasets: [{
+                            label: 'Bloques por hora',
+                            data: [],
+                            borderColor: '#667eea',
+                            backgroundColor: 'rgba(102, 126, 234, 0.1)',
+                            tension: 0.4,
+                            fill: true
+                        }]
+                    },
+                    options: {
+                        responsive: true,
+                        maintainAspectRatio: false,
+                        plugins: { legend: { display: false } }
+                    }
+                });
+                
+                const appsCtx = document.getElementById('appsChart').getContext('2d');
+                appsChart = new Chart(appsCtx, {
+                    type: 'doughnut',
+                    data: {
+                        labels: [],
+                        datasets: [{
+                            data: [],
+                            backgroundColor: ['#667eea', '#764ba2', '#f093fb', '#4facfe', '#00f2fe']
+                        }]
+                    },
+                    options: {
+                        responsive: true,
+                        maintainAspectRatio: false
+                    }
+                });
             }
             
-            // Gamification
-            // Nota: necesitaría endpoint adicional en API
-            document.getElementById('level').textContent = '1';
-            document.getElementById('progressFill').style.width = '25%';
+            hourlyChart.data.labels = Object.keys(hourData);
+            hourlyChart.data.datasets[0].data = Object.values(hourData);
+            hourlyChart.update('none');
+            
+            appsChart.data.labels = topApps.map(a => a[0].replace('.exe', ''));
+            appsChart.data.datasets[0].data = topApps.map(a => a[1]);
+            appsChart.update('none');
+        }
+        
+        const renderers = {
+            status: renderStatus,
+            stats: renderStats,
+            blocks: renderCharts,
+            goals: renderGoals
+        };
+        
+        // Eventos del monitor y del demonio: llegan completos, no como deltas
+        const notices = {
+            monitor: (data) => {
+                monitorState = data.state;
+                renderStatus();
+                addActivity(MONITOR_LABELS[data.state] || data.state, data.time);
+            },
+            message: (data) => addActivity(data.text, data.time),
+            profile: (data) => {
+                state.status.profile = data.profile;
+                renderStatus();
+                addActivity(`Perfil: ${data.profile}`, data.time);
+            }
+        };
+        
+        function renderAll() {
+            Object.values(renderers).forEach(render => render());
+        }
+        
+        // Fallback sin EventSource: sondeo completo (el servidor responde 304 si no hay cambios)
+        async function updateDashboard() {
+            state.status = await fetchData('/status') || state.status;
+            state.stats = await fetchData('/stats') || state.stats;
+            state.blocks = await fetchData('/stats/daily') || state.blocks;
+            state.goals = await fetchData('/goals') || state.goals;
+            renderAll();
         }
         
-        async function updateCharts(daily) {
-            const hourData = daily.hourly || {};
-            const appData = daily.apps_blocked || {};
+        function connectStream() {
+            const source = new EventSource(`${API_URL}/stream`);
             
-            // Hourly Chart
-            const hourCtx = document.getElementById('hourlyChart').getContext('2d');
-            new Chart(hourCtx, {
-                type: 'line',
-                data: {
-                    labels: Object.keys(hourData),
-                    datasets: [{
-                        label: 'Bloques por hora',
-                        data: Object.values(hourData),
-                        borderColor: '#667eea',
-                        backgroundColor: 'rgba(102, 126, 234, 0.1)',
-                        tension: 0.4,
-                        fill: true
-                    }]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    plugins: { legend: { display: false } }
+            source.addEventListener('snapshot', (e) => {
+                const snapshot = JSON.parse(e.data);
+                for (const kind of Object.keys(state)) {
+                    state[kind] = snapshot[kind] || {};
                 }
+                renderAll();
             });
             
-            // Apps Chart
-            const appsCtx = document.getElementById('appsChart').getContext('2d');
-            const topApps = Object.entries(appData)
-                .sort((a, b) => b[1] - a[1])
-                .slice(0, 5);
+            for (const kind of Object.keys(renderers)) {
+                source.addEventListener(kind, (e) => {
+                    applyDelta(state[kind], JSON.parse(e.data));
+                    renderers[kind]();
+                });
+            }
             
-            new Chart(appsCtx, {
-                type: 'doughnut',
-                data: {
-                    labels: topApps.map(a => a[0].replace('.exe', '')),
-                    datasets: [{
-                        data: topApps.map(a => a[1]),
-                        backgroundColor: ['#667eea', '#764ba2', '#f093fb', '#4facfe', '#00f2fe']
-                    }]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false
-                }
-            });
+            for (const [kind, handle] of Object.entries(notices)) {
+                source.addEventListener(kind, (e) => handle(JSON.parse(e.data)));
+            }
+            
+            // EventSource reconecta solo y reanuda con Last-Event-ID
+            source.onerror = () => console.warn('Stream desconectado, reintentando...');
         }
         
         async function getAnalysis() {
             alert('🤖 Análisis: Abre la aplicación para ver análisis detallado con IA');
         }
         
-        // Actualizar cada 5 segundos
-        updateDashboard();
-        setInterval(updateDashboard, 5000);
+        // Cambios empujados por el servidor; sondeo solo si no hay EventSource
+        if (window.EventSource) {
+            connectStream();
+        } else {
+            updateDashboard();
+            setInterval(updateDashboard, 5000);
+        }
     </script>
 </body>
 </html>
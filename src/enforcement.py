@@ -0,0 +1,142 @@
+"""
+Programador de cierres de apps bloqueadas.
+Mantiene como máximo un cierre pendiente por app, ordenado por deadline
+en un heap, y lo ejecuta en un hilo propio para que el tick de detección
+del monitor nunca espere a la cuenta regresiva.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+
+class EnforcementScheduler:
+    """Heap de cierres pendientes con un único hilo trabajador."""
+
+    def __init__(self, history_size=100):
+        self._heap = []
+        self._pending = {}
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._thread = None
+        self.events = deque(maxlen=history_size)
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="guardian-enforcement", daemon=True)
+            self._thread.start()
+
+    def schedule(self, app_name, countdown, on_expire, ui_callback=None):
+        """
+        Programa el cierre de una app dentro de `countdown` segundos.
+        Retorna False si la app ya tenía un cierre pendiente.
+        """
+        key = app_name.lower()
+        now = time.monotonic()
+        with self._cond:
+            if key in self._pending:
+                return False
+            token = next(self._seq)
+            self._pending[key] = {
+                'token': token,
+                'app': app_name,
+                'countdown': countdown,
+                'remaining': countdown,
+                'detected_at': now,
+                'deadline': now + countdown,
+                'on_expire': on_expire,
+                'ui_callback': ui_callback,
+            }
+            heapq.heappush(self._heap, (now, token, key, token))
+            self._ensure_worker()
+            self._cond.notify()
+        return True
+
+    def is_pending(self, app_name):
+        """Indica si la app tiene un cierre pendiente."""
+        with self._cond:
+            return app_name.lower() in self._pending
+
+    def cancel(self, app_name):
+        """
+        Cancela el cierre pendiente de una app. Sus items quedan en el heap
+        y se descartan al salir: no coinciden con el token de un nuevo cierre.
+        """
+        with self._cond:
+            return self._pending.pop(app_name.lower(), None) is not None
+
+    def pending_apps(self):
+        """Retorna las apps con cierre pendiente y su deadline restante."""
+        now = time.monotonic()
+        with self._cond:
+            return {e['app']: max(0.0, e['deadline'] - now) for e in self._pending.values()}
+
+    def _notify(self, entry, message):
+        print(message)
+        if entry['ui_callback']:
+            entry['ui_callback'](message)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                due, _, key, token = self._heap[0]
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+                entry = self._pending.get(key)
+                if entry is None or entry['token'] != token:
+                    # Cancelado (y quizás vuelto a programar con otro token)
+                    continue
+                remaining = entry['remaining']
+                if remaining > 0:
+                    entry['remaining'] -= 1
+                    heapq.heappush(self._heap, (due + 1, next(self._seq), key, token))
+
+            try:
+                if remaining > 0:
+                    self._notify(entry, f"[Guardian] '{entry['app']}' se cerrará en {remaining} segundos...")
+                else:
+                    self._expire(key, entry)
+            except Exception as e:
+                print(f"[Error] Fallo al aplicar el bloqueo de {entry['app']}: {e}")
+                with self._cond:
+                    if self._pending.get(key) is entry:
+                        del self._pending[key]
+
+    def _expire(self, key, entry):
+        entry['on_expire']()
+        terminated_at = time.monotonic()
+        latency = terminated_at - entry['detected_at']
+        event = {
+            'app': entry['app'],
+            'countdown': entry['countdown'],
+            'latency': round(latency, 3),
+            'overrun': round(latency - entry['countdown'], 3),
+        }
+        with self._cond:
+            if self._pending.get(key) is entry:
+                del self._pending[key]
+            self.events.append(event)
+        self._notify(entry, f"[Guardian] '{entry['app']}' ha sido cerrada ({latency:.2f}s desde la detección).")
+
+    def get_stats(self):
+        """Retorna latencias de los últimos cierres y los pendientes."""
+        with self._cond:
+            pending = len(self._pending)
+            events = list(self.events)
+        latencies = [e['latency'] for e in events]
+        return {
+            'pending': pending,
+            'events': events,
+            'avg_latency': round(sum(latencies) / len(latencies), 3) if latencies else None,
+            'max_overrun': max((e['overrun'] for e in events), default=None),
+        }
+
+
+enforcer = EnforcementScheduler()
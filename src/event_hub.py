@@ -0,0 +1,121 @@
+"""
+Bus de eventos en memoria con un solo registro compartido.
+Cada publicación se agrega una vez a un buffer circular numerado y todos
+los suscriptores leen desde su último número: el costo de publicar no
+depende de cuántos suscriptores haya.
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+
+
+class EventHub:
+    """Registro circular de eventos (seq, tipo, datos) con espera bloqueante."""
+
+    def __init__(self, capacity=1000):
+        self._cond = threading.Condition()
+        self._events = deque(maxlen=capacity)
+        self._seq = 0
+        self._wakeups = 0
+        self.subscribers = 0
+        self.published = 0
+
+    @property
+    def last_seq(self):
+        with self._cond:
+            return self._seq
+
+    def publish(self, kind, data):
+        """Agrega un evento y despierta a todos los lectores. Retorna su número."""
+        with self._cond:
+            self._seq += 1
+            self._events.append((self._seq, kind, data))
+            self.published += 1
+            self._cond.notify_all()
+            return self._seq
+
+    def read(self, after_seq, timeout=None):
+        """
+        Espera eventos posteriores a `after_seq`. Retorna (eventos, perdidos):
+        `perdidos` es True si el lector quedó tan atrás que el buffer ya
+        descartó eventos que no vio.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            wakeups = self._wakeups
+            while self._seq <= after_seq:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return [], False
+                self._cond.wait(remaining)
+                if self._wakeups != wakeups:
+                    return [], False
+            oldest = self._events[0][0]
+            lost = after_seq + 1 < oldest
+            # Los números son consecutivos: se salta directo a los nuevos
+            start = max(0, after_seq + 1 - oldest)
+            return list(itertools.islice(self._events, start, None)), lost
+
+    def wake_all(self):
+        """Despierta a los lectores sin publicar nada (p. ej. al cerrar)."""
+        with self._cond:
+            self._wakeups += 1
+            self._cond.notify_all()
+
+    def subscribe(self):
+        """Registra un suscriptor y retorna el número desde el que leer."""
+        with self._cond:
+            self.subscribers += 1
+            return self._seq
+
+    def unsubscribe(self):
+        with self._cond:
+            self.subscribers = max(0, self.subscribers - 1)
+
+    def get_stats(self):
+        with self._cond:
+            return {
+                'subscribers': self.subscribers,
+                'published': self.published,
+                'last_seq': self._seq,
+                'buffered': len(self._events),
+            }
+
+
+class ChangeSignal:
+    """
+    Aviso de cambio con contador de generación: varios consumidores pueden
+    esperarlo sin que uno "consuma" el aviso de otro.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self.generation = 0
+
+    def notify(self):
+        with self._cond:
+            self.generation += 1
+            self._cond.notify_all()
+
+    def wait(self, since, timeout=None):
+        """
+        Espera a que la generación supere `since` (o al timeout).
+        Retorna la generación actual para la próxima espera.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self.generation != since, timeout)
+            return self.generation
+
+
+event_hub = EventHub()
+
+# Cambiaron los datos: lo activan las escrituras de este proceso para que
+# el stream y el monitor revisen sin esperar a su próximo ciclo
+data_changed = ChangeSignal()
+
+
+def notify_data_changed():
+    """Avisa que cambiaron bloqueos, settings u otros datos publicados."""
+    data_changed.notify()
@@ -0,0 +1,241 @@
+"""
+Almacén SQLite (modo WAL) para eventos de bloqueo y sesiones.
+Alternativa opcional al journal JSON-lines y a los archivos de sesiones:
+las consultas por rango de fechas usan los índices (timestamp) y
+(app, timestamp) en lugar de recorrer listas completas. Expone la misma
+interfaz que BlockJournal y BlockAggregates para que load_stats() y los
+reportes funcionen igual con cualquiera de los dos backends.
+
+Se activa si existe guardian_events.db (lo crea la herramienta de
+migración) o con GUARDIAN_STORAGE=sqlite; GUARDIAN_STORAGE=json lo
+desactiva aunque exista la base.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+EVENTS_DB_FILE = "guardian_events.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    id INTEGER PRIMARY KEY,
+    app TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_blocks_timestamp ON blocks (timestamp);
+CREATE INDEX IF NOT EXISTS idx_blocks_app_timestamp ON blocks (app, timestamp);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    start TEXT NOT NULL,
+    "end" TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_source_start ON sessions (source, start);
+CREATE INDEX IF NOT EXISTS idx_sessions_source_end ON sessions (source, "end");
+CREATE TABLE IF NOT EXISTS imports (
+    batch_id TEXT PRIMARY KEY
+);
+"""
+
+
+def _next_day(day):
+    """Día siguiente (YYYY-MM-DD) como cota superior exclusiva."""
+    try:
+        return (datetime.strptime(day, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    except ValueError:
+        return day
+
+
+def _empty_day():
+    return {'total': 0, 'hours': [0] * 24, 'apps': {}}
+
+
+class SqliteEventStore:
+    """
+    Bloqueos y sesiones en una base SQLite. Una conexión compartida
+    protegida por un lock; WAL permite leer desde otros procesos
+    (dashboard, herramientas) mientras Guardian escribe.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = None
+        self._version = 0
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    def _write(self, sql, rows):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(sql, rows)
+            self._version += 1
+
+    # --- Interfaz de BlockJournal ---
+
+    def append(self, app_name, timestamp):
+        """Agrega un evento de bloqueo."""
+        self._write("INSERT INTO blocks (app, timestamp) VALUES (?, ?)", [(app_name, timestamp)])
+        return {'app': app_name, 'timestamp': timestamp}
+
+    def read_blocks(self, start_day=None, end_day=None):
+        """Eventos entre start_day y end_day (YYYY-MM-DD, inclusivos)."""
+        clauses, params = [], []
+        if start_day is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start_day)
+        if end_day is not None:
+            clauses.append("timestamp < ?")
+            params.append(_next_day(end_day))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._query(f"SELECT app, timestamp FROM blocks {where} ORDER BY timestamp, id", params)
+        return [{'app': app, 'timestamp': timestamp} for app, timestamp in rows]
+
+    def import_blocks(self, blocks, batch_id=None):
+        """
+        Importa una lista de eventos existentes. Con `batch_id` el lote se
+        registra en la misma transacción y no se importa dos veces.
+        """
+        rows = [(b.get('app'), str(b.get('timestamp', ''))) for b in blocks if b.get('app')]
+        if batch_id is None:
+            self._write("INSERT INTO blocks (app, timestamp) VALUES (?, ?)", rows)
+            return len(rows)
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                if conn.execute("SELECT 1 FROM imports WHERE batch_id = ?", (batch_id,)).fetchone():
+                    return 0
+                conn.executemany("INSERT INTO blocks (app, timestamp) VALUES (?, ?)", rows)
+                conn.execute("INSERT INTO imports (batch_id) VALUES (?)", (batch_id,))
+            self._version += 1
+        return len(rows)
+
+    def replace_all(self, blocks):
+        """Reemplaza todo el historial por la lista dada (en una transacción)."""
+        rows = [(b.get('app'), str(b.get('timestamp', ''))) for b in blocks if b.get('app')]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM blocks")
+                conn.executemany("INSERT INTO blocks (app, timestamp) VALUES (?, ?)", rows)
+            self._version += 1
+
+    def compact(self):
+        """Sin efecto: SQLite no necesita compactar segmentos."""
+        return 0
+
+    def data_version(self):
+        """
+        Cambia con cada escritura propia (contador) o de otro proceso
+        (PRAGMA data_version de la conexión).
+        """
+        return (self._version, self._query("PRAGMA data_version")[0][0])
+
+    # --- Interfaz de BlockAggregates ---
+
+    def exists(self):
+        return True
+
+    def record(self, app, timestamp):
+        """Sin efecto: los contadores se calculan con la consulta indexada."""
+
+    def rebuild(self, blocks):
+        """Sin efecto: no hay agregados que recalcular. Retorna los días con datos."""
+        return len(self.get_days())
+
+    def get_day(self, day):
+        """Contadores de un día: total, por hora y por app."""
+        rows = self._query(
+            "SELECT substr(timestamp, 12, 2), app, COUNT(*) FROM blocks "
+            "WHERE timestamp >= ? AND timestamp < ? GROUP BY 1, 2",
+            (day, _next_day(day)))
+        data = _empty_day()
+        for hour, app, count in rows:
+            data['total'] += count
+            data['apps'][app] = data['apps'].get(app, 0) + count
+            if hour and hour.isdigit():
+                data['hours'][int(hour) % 24] += count
+        return data
+
+    def get_days(self):
+        """Días con bloqueos, ordenados."""
+        rows = self._query("SELECT DISTINCT substr(timestamp, 1, 10) FROM blocks ORDER BY 1")
+        return [day for (day,) in rows if len(day) == 10]
+
+    def count_by_app(self, start=None, end=None):
+        """Bloqueos por app con start <= timestamp < end (ISO, opcionales)."""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(end)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return dict(self._query(f"SELECT app, COUNT(*) FROM blocks {where} GROUP BY app", params))
+
+    # --- Sesiones ---
+
+    def add_session(self, source, session):
+        """Guarda una sesión terminada de `source` ('tracker', 'manager')."""
+        self._write(
+            'INSERT INTO sessions (source, start, "end", data) VALUES (?, ?, ?, ?)',
+            [(source, session.get('start', ''), session.get('end'),
+              json.dumps(session, ensure_ascii=False))])
+
+    def import_sessions(self, source, sessions):
+        """Importa una lista de sesiones existentes."""
+        rows = [(source, s.get('start', ''), s.get('end'), json.dumps(s, ensure_ascii=False))
+                for s in sessions if isinstance(s, dict)]
+        self._write('INSERT INTO sessions (source, start, "end", data) VALUES (?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def read_sessions(self, source, since=None, field='start'):
+        """Sesiones de `source`, opcionalmente con `field` ('start'/'end') > since."""
+        column = '"end"' if field == 'end' else 'start'
+        if since is None:
+            rows = self._query("SELECT data FROM sessions WHERE source = ? ORDER BY id", (source,))
+        else:
+            rows = self._query(
+                f"SELECT data FROM sessions WHERE source = ? AND {column} > ? ORDER BY id",
+                (source, since))
+        return [json.loads(data) for (data,) in rows]
+
+    def count(self, table):
+        return self._query(f"SELECT COUNT(*) FROM {table}")[0][0]
+
+
+def sqlite_enabled(db_path=EVENTS_DB_FILE):
+    """Indica si Guardian debe usar el backend SQLite."""
+    backend = os.environ.get("GUARDIAN_STORAGE", "").lower()
+    if backend:
+        return backend == "sqlite"
+    return os.path.exists(db_path)
+
+
+event_store = SqliteEventStore(EVENTS_DB_FILE) if sqlite_enabled() else None
@@ -4,13 +4,14 @@ Motiva al usuario a mantener el foco.
 """
 
 from datetime import datetime, timedelta
-from src.settings_manager import load_settings, save_settings
+from src.settings_manager import load_settings, save_settings, read_settings
 import json
 
 def get_or_create_gamification():
     """Crea/obtiene datos de gamificaciÃ³n."""
-    settings = load_settings()
+    settings = read_settings()
     if 'gamification' not in settings:
+        settings = load_settings()
         settings['gamification'] = {
             'points': 0,
             'level': 1,
@@ -0,0 +1,46 @@
+"""
+Entrada sin interfaz: solo el monitor, sin tkinter ni los módulos de la UI.
+Uso: python main.py --monitor-only [--ticks N] [--api]
+"""
+
+import argparse
+import sys
+import time
+
+# Instante de arranque para medir el tiempo hasta el primer tick
+_STARTED = time.perf_counter()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Guardian sin interfaz (solo monitor)")
+    parser.add_argument('--ticks', type=int, default=None,
+                        help="terminar tras N ticks (mide el arranque)")
+    parser.add_argument('--api', action='store_true', help="servir también la API local")
+    parser.add_argument('--quiet', action='store_true', help="no imprimir los avisos del monitor")
+    args = parser.parse_args(argv)
+
+    from src.monitor import monitor_apps
+
+    if args.api:
+        from src.api_server import api_server
+        try:
+            api_server.start()
+        except (RuntimeError, ImportError) as e:
+            print(f"[Error] No se pudo iniciar la API local: {e}")
+
+    def on_message(message):
+        if not args.quiet:
+            print(message)
+
+    try:
+        monitor_apps(ui_callback=on_message, max_ticks=args.ticks)
+    except KeyboardInterrupt:
+        print("Monitor detenido")
+    if args.ticks is not None:
+        elapsed = (time.perf_counter() - _STARTED) * 1000
+        print(f"[Guardian] {args.ticks} tick(s) en {elapsed:.1f} ms desde el arranque")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""
+Capa de persistencia JSON compartida por todos los archivos de Guardian.
+Escribe en un temporal del mismo directorio, hace fsync y lo renombra
+sobre el destino: un corte a mitad de escritura nunca deja el archivo
+truncado. Cada ruta tiene su lock y las escrituras diferidas se agrupan:
+varias actualizaciones dentro de la ventana producen una sola escritura.
+"""
+
+import atexit
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Ventana de agrupación por defecto para las escrituras diferidas
+COALESCE_WINDOW = 0.25
+
+
+def _fsync_dir(directory):
+    """Persiste el rename en el directorio (solo POSIX)."""
+    if sys.platform == "win32":
+        return
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _replace(src, dst, retries=5):
+    # En Windows el rename falla si otro proceso tiene el destino abierto
+    for attempt in range(retries):
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if attempt == retries - 1:
+                raise
+            time.sleep(0.05)
+
+
+def atomic_write_bytes(path, data):
+    """Escribe bytes en un temporal, fsync y rename sobre `path`."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        _replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(directory)
+
+
+def dump_json(data, indent=None):
+    """Serializa como lo hace el resto de Guardian (UTF-8, sin escapar acentos)."""
+    separators = None if indent is not None else (',', ':')
+    return json.dumps(data, indent=indent, ensure_ascii=False, separators=separators).encode('utf-8')
+
+
+def atomic_write_json(path, data, indent=None):
+    """Escribe JSON de forma atómica."""
+    atomic_write_bytes(path, dump_json(data, indent))
+
+
+class JsonStore:
+    """Lock por archivo, escrituras atómicas y agrupación de escrituras diferidas."""
+
+    def __init__(self):
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+        self._pending = {}
+        self._timers = {}
+        self.requested = 0
+        self.written = 0
+
+    def _key(self, path):
+        return os.path.abspath(os.fspath(path))
+
+    def lock(self, path):
+        """Lock (reentrante) asociado a la ruta."""
+        key = self._key(path)
+        with self._locks_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.RLock()
+            return lock
+
+    def save(self, path, data, indent=None, delay=0):
+        """
+        Guarda `data` en `path`. Con delay=0 escribe ya (y lanza la
+        excepción si falla); con delay>0 la escritura se difiere y las
+        siguientes dentro de la ventana la reemplazan. El contenido se
+        serializa en el momento de la llamada.
+        """
+        path = os.fspath(path)
+        key = self._key(path)
+        payload = dump_json(data, indent)
+        with self.lock(path):
+            self.requested += 1
+            if delay <= 0:
+                self._cancel(key)
+                atomic_write_bytes(path, payload)
+                self.written += 1
+                return
+            self._pending[key] = (path, payload)
+            if key not in self._timers:
+                timer = threading.Timer(delay, self.flush, args=(path,))
+                timer.daemon = True
+                self._timers[key] = timer
+                timer.start()
+
+    def _cancel(self, key):
+        self._pending.pop(key, None)
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+    def load(self, path, default=None):
+        """
+        Lee el JSON de `path` (o `default` si no existe o está dañado).
+        Si hay una escritura diferida pendiente, retorna su contenido.
+        """
+        path = os.fspath(path)
+        with self.lock(path):
+            pending = self._pending.get(self._key(path))
+            if pending is not None:
+                return json.loads(pending[1].decode('utf-8'))
+            if not os.path.exists(path):
+                return default
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"[Error] No se pudo leer {path}: {e}")
+                return default
+
+    def flush(self, path=None):
+        """Escribe ya las escrituras diferidas (de una ruta o de todas)."""
+        keys = list(self._pending) if path is None else [self._key(path)]
+        for key in keys:
+            with self.lock(key):
+                pending = self._pending.pop(key, None)
+                timer = self._timers.pop(key, None)
+                if timer is not None:
+                    timer.cancel()
+                if pending is None:
+                    continue
+                try:
+                    atomic_write_bytes(*pending)
+                    self.written += 1
+                except Exception as e:
+                    print(f"[Error] No se pudo guardar {pending[0]}: {e}")
+
+    def get_stats(self):
+        return {
+            'requested': self.requested,
+            'written': self.written,
+            'pending': len(self._pending),
+        }
+
+
+json_store = JsonStore()
+atexit.register(json_store.flush)
+
+
+def save_json(path, data, indent=None, delay=0):
+    """Guarda JSON a través del store compartido."""
+    json_store.save(path, data, indent, delay)
+
+
+def load_json(path, default=None):
+    """Lee JSON a través del store compartido."""
+    return json_store.load(path, default)
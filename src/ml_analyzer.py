@@ -4,86 +4,162 @@ Predice cuÃ¡ndo es mÃ¡s probable distraerse.
 """
 
 from datetime import datetime, timedelta
-from src.settings_manager import load_stats
+from src.settings_manager import block_journal, get_block_journal, get_risk_model
 from collections import defaultdict
+import threading
 import statistics
+import warnings
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+_EPOCH = datetime(1970, 1, 1)
+# Tramos de hasta este tamaÃ±o que NumPy rechaza se parsean uno a uno
+_SCALAR_CHUNK = 64
+
+class DistractionAnalytics:
+    """
+    Motor de anÃ¡lisis sobre arrays int64 de segundos desde epoch (hora local
+    tal como se registrÃ³). Carga los eventos una vez y memoiza los
+    resultados por versiÃ³n de datos. Usa NumPy si estÃ¡ disponible.
+    """
+
+    def __init__(self, journal, use_numpy=True):
+        self.journal = journal
+        self.use_numpy = use_numpy and np is not None
+        self._lock = threading.Lock()
+        self._version = None
+        self._arrays = None
+        self._patterns = None
+
+    def _parse_one(self, timestamp):
+        """Un timestamp con datetime (acepta offsets: se usa la hora local registrada)."""
+        try:
+            moment = datetime.fromisoformat(timestamp).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            return None
+        return int((moment - _EPOCH).total_seconds())
+
+    def _parse_numpy(self, timestamps):
+        """
+        datetime64[s] de los timestamps, vectorizado. Si un tramo falla
+        (texto invÃ¡lido u offset, que NumPy pasarÃ­a a UTC) se parte en dos;
+        solo los tramos chicos que siguen fallando se resuelven uno a uno.
+        """
+        parsed = np.empty(len(timestamps), dtype='datetime64[s]')
+        pending = [(0, len(timestamps))]
+        while pending:
+            start, stop = pending.pop()
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('error')
+                    parsed[start:stop] = np.array(timestamps[start:stop], dtype='datetime64[us]')
+                continue
+            except (ValueError, TypeError, Warning):
+                pass
+            if stop - start > _SCALAR_CHUNK:
+                middle = (start + stop) // 2
+                pending.extend(((start, middle), (middle, stop)))
+                continue
+            for index in range(start, stop):
+                epoch = self._parse_one(timestamps[index])
+                parsed[index] = np.datetime64('NaT') if epoch is None else np.datetime64(epoch, 's')
+        return parsed
+
+    def _parse_epochs(self, timestamps):
+        """
+        Convierte timestamps ISO a segundos; retorna (epochs, Ã­ndices vÃ¡lidos).
+        Los timestamps vacÃ­os o invÃ¡lidos se descartan. Con offset ("+02:00")
+        se usa la hora local registrada, sin convertir a UTC, en ambos caminos.
+        """
+        if self.use_numpy:
+            parsed = self._parse_numpy(list(timestamps))
+            epochs = parsed.astype(np.int64)
+            missing = np.isnat(parsed)
+            if not missing.any():
+                return epochs, None
+            valid = np.flatnonzero(~missing)
+            return epochs[valid], valid.tolist()
+        epochs = []
+        valid = []
+        for index, timestamp in enumerate(timestamps):
+            epoch = self._parse_one(timestamp)
+            if epoch is not None:
+                epochs.append(epoch)
+                valid.append(index)
+        return epochs, valid
+
+    def load_arrays(self, blocks):
+        """Convierte eventos a (epochs, cÃ³digos de app, nombres de app)."""
+        app_index = {}
+        codes = [app_index.setdefault(b.get('app'), len(app_index)) for b in blocks]
+        epochs, valid = self._parse_epochs([b.get('timestamp') for b in blocks])
+        if valid is not None:
+            codes = [codes[i] for i in valid]
+        if self.use_numpy:
+            codes = np.array(codes, dtype=np.int64)
+        return epochs, codes, list(app_index)
+
+    def compute(self, epochs, codes, app_names):
+        """Histogramas por hora, dÃ­a de la semana y app."""
+        if len(epochs) == 0:
+            return None
+        if self.use_numpy:
+            hours = np.bincount((epochs // 3600) % 24, minlength=24)
+            # 1970-01-01 fue jueves (Ã­ndice 3 con lunes = 0)
+            weekdays = np.bincount((epochs // 86400 + 3) % 7, minlength=7)
+            apps = np.bincount(codes, minlength=len(app_names))
+            hours, weekdays, apps = hours.tolist(), weekdays.tolist(), apps.tolist()
+        else:
+            hours, weekdays, apps = [0] * 24, [0] * 7, [0] * len(app_names)
+            for epoch in epochs:
+                hours[(epoch // 3600) % 24] += 1
+                weekdays[(epoch // 86400 + 3) % 7] += 1
+            for code in codes:
+                apps[code] += 1
+
+        hourly = {h: c for h, c in enumerate(hours) if c}
+        daily = {DAY_NAMES[d]: c for d, c in enumerate(weekdays) if c}
+        mean_hourly = statistics.mean(hourly.values())
+        return {
+            'hourly': hourly,
+            'daily': daily,
+            'apps': {app_names[i]: c for i, c in enumerate(apps) if c},
+            'peak_hour': max(hourly, key=hourly.get),
+            'peak_day': max(daily, key=daily.get),
+            'high_risk_hours': [h for h, count in hourly.items() if count > mean_hourly],
+        }
+
+    def patterns(self):
+        """Resultado memoizado; solo se recalcula si cambiÃ³ el historial."""
+        version = self.journal.data_version()
+        with self._lock:
+            if version != self._version:
+                self._arrays = self.load_arrays(self.journal.read_blocks())
+                self._patterns = self.compute(*self._arrays)
+                self._version = version
+            return self._patterns
+
+analytics = DistractionAnalytics(block_journal)
 
 def analyze_distraction_patterns():
     """Analiza patrones de cuÃ¡ndo ocurren distracciones."""
-    stats = load_stats()
-    blocks = stats.get('blocks', [])
-    
-    if not blocks:
-        return None
-    
-    # Agrupar por hora del dÃ­a
-    hourly_blocks = defaultdict(int)
-    for block in blocks:
-        try:
-            time_str = block['timestamp'].split('T')[1]
-            hour = int(time_str.split(':')[0])
-            hourly_blocks[hour] += 1
-        except:
-            continue
-    
-    # Agrupar por dÃ­a de la semana
-    daily_blocks = defaultdict(int)
-    for block in blocks:
-        try:
-            date_str = block['timestamp'].split('T')[0]
-            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            day_name = date_obj.strftime("%A")
-            daily_blocks[day_name] += 1
-        except:
-            continue
-    
-    # Encontrar picos
-    peak_hour = max(hourly_blocks, key=hourly_blocks.get) if hourly_blocks else None
-    peak_day = max(daily_blocks, key=daily_blocks.get) if daily_blocks else None
-    
-    return {
-        'hourly': dict(hourly_blocks),
-        'daily': dict(daily_blocks),
-        'peak_hour': peak_hour,
-        'peak_day': peak_day,
-        'high_risk_hours': [h for h, count in hourly_blocks.items() if count > statistics.mean(hourly_blocks.values()) if hourly_blocks],
-    }
-
-def predict_distraction_risk():
-    """Predice el riesgo de distracciÃ³n en la hora actual."""
-    patterns = analyze_distraction_patterns()
-    if not patterns:
-        return 'bajo', 50
-    
-    current_hour = datetime.now().hour
-    current_day = datetime.now().strftime("%A")
-    
-    hour_risk = patterns['hourly'].get(current_hour, 0)
-    day_risk = patterns['daily'].get(current_day, 0)
-    
-    # Calcular score de 0-100
-    avg_hourly = sum(patterns['hourly'].values()) / len(patterns['hourly']) if patterns['hourly'] else 0
-    avg_daily = sum(patterns['daily'].values()) / len(patterns['daily']) if patterns['daily'] else 0
-    
-    hour_score = (hour_risk / avg_hourly * 50) if avg_hourly > 0 else 25
-    day_score = (day_risk / avg_daily * 50) if avg_daily > 0 else 25
-    
-    total_score = min(100, hour_score + day_score)
-    
-    if total_score >= 75:
-        risk_level = 'muy alto'
-    elif total_score >= 50:
-        risk_level = 'alto'
-    elif total_score >= 25:
-        risk_level = 'medio'
-    else:
-        risk_level = 'bajo'
-    
-    return risk_level, int(total_score)
+    get_block_journal()
+    return analytics.patterns()
 
-def get_best_focus_times():
+def predict_distraction_risk(app=None):
+    """
+    Predice el riesgo de distracciÃ³n en la hora actual con el modelo
+    incremental (tasas con decaimiento por dÃ­a, hora y app). Consulta O(1).
+    """
+    return get_risk_model().risk(app=app)
+
+def get_best_focus_times(patterns=None):
     """Retorna las mejores horas para enfocarse (menos distracciones)."""
-    patterns = analyze_distraction_patterns()
+    if patterns is None:
+        patterns = analyze_distraction_patterns()
     if not patterns or not patterns['hourly']:
         return None
     
@@ -92,9 +168,10 @@ def get_best_focus_times():
     
     return best_hours
 
-def get_worst_focus_times():
+def get_worst_focus_times(patterns=None):
     """Retorna las peores horas para enfocarse (mÃ¡s distracciones)."""
-    patterns = analyze_distraction_patterns()
+    if patterns is None:
+        patterns = analyze_distraction_patterns()
     if not patterns or not patterns['hourly']:
         return None
     
@@ -105,22 +182,20 @@ def get_worst_focus_times():
 
 def get_app_correlation(app_name):
     """Analiza quÃ© apps suelen estar abiertas cuando se abre una app bloqueada."""
-    stats = load_stats()
-    blocks = stats.get('blocks', [])
-    
-    # Encontrar bloques de esta app
-    app_blocks = [b for b in blocks if b.get('app') == app_name]
+    patterns = analyze_distraction_patterns()
+    app_blocks = patterns['apps'].get(app_name, 0) if patterns else 0
     
     if not app_blocks:
         return {}
     
     # Esto serÃ­a mÃ¡s complejo con datos reales
-    return {'total_blocks': len(app_blocks)}
+    return {'total_blocks': app_blocks}
 
 def suggest_strategy():
     """Sugiere estrategia basada en patrones."""
-    best_times = get_best_focus_times()
-    worst_times = get_worst_focus_times()
+    patterns = analyze_distraction_patterns()
+    best_times = get_best_focus_times(patterns)
+    worst_times = get_worst_focus_times(patterns)
     risk, score = predict_distraction_risk()
     
     suggestions = []
@@ -1,15 +1,222 @@
-﻿import time
+﻿import threading
+import time
 
-from src.utils import check_blocked_apps
+from src.utils import check_blocked_apps, alert_and_kill
 from src.config import CHECK_INTERVAL
+from src.settings_manager import read_settings
+from src.scheduler import is_blocking_active, seconds_until_transition
+from src.tick_scheduler import AdaptiveTickScheduler
+from src.window_watcher import WindowWatcher, create_default_backend, changed_windows
+from src.time_limits import time_limit_engine
+from src.event_hub import event_hub, data_changed
+from src.tracing import tracer
 
 ALERT_SOUND = "alerta.mp3"  # Guarda aquÃ­ el mp3 descargado desde MyInstants
+# Tope de espera fuera de horario, por si otro proceso cambia los settings
+MAX_IDLE_SLEEP = 300
 
-def monitor_apps(ui_callback=None):
+tick_scheduler = AdaptiveTickScheduler(is_active=is_blocking_active)
+
+def get_monitor_stats():
+    """Intervalo actual y costo de los ticks del monitor."""
+    stats = tick_scheduler.get_stats()
+    stats['time_limits'] = time_limit_engine.get_stats()
+    stats['tracing'] = tracer.get_stats()
+    return stats
+
+def enforce_time_limit(app_name, ui_callback=None):
+    """Cierra una app cuyo tiempo diario se agotÃ³."""
+    if ui_callback:
+        ui_callback(f"Tiempo diario agotado: {app_name}")
+    alert_and_kill(app_name, ALERT_SOUND, countdown=3, ui_callback=ui_callback)
+
+def monitor_apps(ui_callback=None, watcher=None, max_ticks=None, stop_event=None):
+    """
+    Reacciona a cambios de ventanas en lugar de revisar todo cada
+    CHECK_INTERVAL. Cada `resync_interval` se hace una revisiÃ³n completa.
+    Con el backend de polling el intervalo se adapta a la actividad.
+    Con `max_ticks` retorna tras ese nÃºmero de ticks (arranque medido).
+    Con `stop_event` retorna cuando se activa; quien lo activa debe
+    despertar al watcher (backend.wake()) y a data_changed.
+    """
     print("Monitor de apps bloqueadas iniciado...")
-    while True:
-        check_blocked_apps(ALERT_SOUND, countdown=3, ui_callback=ui_callback)
-        time.sleep(CHECK_INTERVAL)
+    tick_scheduler.configure_from_settings(read_settings())
+    time_limit_engine.on_exhausted = lambda app: enforce_time_limit(app, ui_callback)
+    if watcher is None:
+        watcher = WindowWatcher(create_default_backend(CHECK_INTERVAL, tick_scheduler),
+                                tick_scheduler=tick_scheduler)
+    settings_generation = data_changed.generation
+    resync_pending = False
+    ticks = 0
+    while max_ticks is None or ticks < max_ticks:
+        if stop_event is not None and stop_event.is_set():
+            break
+        with tracer.span("monitor.settings"):
+            settings = read_settings()
+            tick_scheduler.configure_from_settings(settings)
+            tracer.configure_from_settings(settings)
+        blocking = tick_scheduler.should_run()
+        if not blocking and not settings.get('time_limits'):
+            # Fuera del horario y sin lÃ­mites de tiempo: no enumerar ventanas
+            # y dormir hasta la prÃ³xima transiciÃ³n (o hasta que cambien los settings)
+            time_limit_engine.pause()
+            wait = seconds_until_transition()
+            wait = MAX_IDLE_SLEEP if wait is None else min(MAX_IDLE_SLEEP, wait + 0.5)
+            settings_generation = data_changed.wait(settings_generation, wait)
+            continue
+        
+        # El timeout acota cuÃ¡nto tarda en notarse un cambio de horario
+        events = watcher.wait_for_changes(timeout=tick_scheduler.max_interval, stop_event=stop_event)
+        if stop_event is not None and stop_event.is_set():
+            break
+        start = time.perf_counter()
+        # El lÃ­mite diario se vence por deadline; aquÃ­ solo se corta el tiempo
+        # en foco. Rige todo el dÃ­a, no solo en el horario de bloqueo
+        with tracer.span("monitor.time_limits"):
+            time_limit_engine.observe(watcher.active_title)
+        detected = []
+        if not blocking:
+            # Solo se sigue el foco; al volver el horario se revisa todo
+            watcher.mark_synced()
+            resync_pending = True
+        elif watcher.needs_resync() or resync_pending:
+            resync_pending = False
+            with tracer.span("monitor.resync"):
+                detected = check_blocked_apps(ALERT_SOUND, countdown=3, ui_callback=ui_callback,
+                                              open_windows=watcher.current_windows())
+            watcher.mark_synced()
+        elif events:
+            with tracer.span("monitor.changes"):
+                windows = changed_windows(events)
+                if windows:
+                    detected = check_blocked_apps(ALERT_SOUND, countdown=3, ui_callback=ui_callback,
+                                                  open_windows=windows)
+        end = time.perf_counter()
+        tick_scheduler.record_work(end - start, detected=bool(detected))
+        if tracer.enabled:
+            tracer.record("monitor.tick", start, end)
+        ticks += 1
+    # Sin monitor no se cuenta tiempo en foco
+    time_limit_engine.pause()
+
+STOPPED = "stopped"
+RUNNING = "running"
+PAUSED = "paused"
+STOPPING = "stopping"
+
+class MonitorService:
+    """
+    DueÃ±o del hilo del monitor: a lo sumo un worker a la vez.
+    stop() activa un Event y despierta las esperas del monitor, asÃ­ que
+    el hilo termina en cuanto vuelve del tick en curso. pause() detiene
+    el worker pero recuerda la pausa; resume() lo vuelve a iniciar.
+    Cada cambio de estado se publica en event_hub como 'monitor'.
+    """
+
+    def __init__(self, watcher_factory=None, hub=event_hub):
+        self.watcher_factory = watcher_factory or (
+            lambda: WindowWatcher(create_default_backend(CHECK_INTERVAL, tick_scheduler),
+                                  tick_scheduler=tick_scheduler))
+        self.hub = hub
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = None
+        self._watcher = None
+        self._paused = False
+        self._ui_callback = None
+        self.starts = 0
+        self.started_at = None
+        self.last_error = None
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._thread is not None and self._thread.is_alive():
+            return STOPPING if self._stop.is_set() else RUNNING
+        return PAUSED if self._paused else STOPPED
+
+    def is_running(self):
+        return self.state == RUNNING
+
+    def _publish(self, state=None):
+        self.hub.publish('monitor', {'state': state or self.state})
+
+    def _run(self, stop, watcher, ui_callback):
+        try:
+            monitor_apps(ui_callback=ui_callback, watcher=watcher, stop_event=stop)
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"[Error] El monitor se detuvo: {e}")
+        finally:
+            watcher.close()
+            # El hilo sigue vivo hasta retornar: se publica el estado final
+            self._publish(PAUSED if self._paused else STOPPED)
+
+    def start(self, ui_callback=None):
+        """
+        Inicia el worker. Retorna False si ya hay uno (corriendo o aÃºn
+        terminando): nunca se lanzan dos.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._paused = False
+            self._ui_callback = ui_callback
+            self._stop = threading.Event()
+            self._watcher = self.watcher_factory()
+            self._thread = threading.Thread(
+                target=self._run, args=(self._stop, self._watcher, ui_callback),
+                name="guardian-monitor", daemon=True)
+            self.starts += 1
+            self.started_at = time.time()
+            self.last_error = None
+            self._thread.start()
+        self._publish()
+        return True
+
+    def stop(self, timeout=5.0, pause=False):
+        """
+        Detiene el worker y espera hasta `timeout` a que termine.
+        Retorna True si no queda ningÃºn worker vivo.
+        """
+        with self._lock:
+            self._paused = pause
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return True
+            self._stop.set()
+            self._watcher.backend.wake()
+        # Fuera de horario el monitor espera en data_changed
+        data_changed.notify()
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def pause(self, timeout=5.0):
+        """Detiene el worker recordando que estÃ¡ en pausa."""
+        if self.state == STOPPED:
+            return False
+        return self.stop(timeout, pause=True)
+
+    def resume(self, ui_callback=None):
+        """Reanuda un monitor en pausa (con el callback del Ãºltimo start)."""
+        if self.state != PAUSED:
+            return False
+        return self.start(ui_callback or self._ui_callback)
+
+    def get_state(self):
+        with self._lock:
+            state = self._state()
+        return {
+            'state': state,
+            'starts': self.starts,
+            'uptime': round(time.time() - self.started_at, 1) if state == RUNNING else None,
+            'last_error': self.last_error,
+        }
+
+monitor_service = MonitorService()
 
 if __name__ == "__main__":
     monitor_apps()
@@ -1,11 +1,22 @@
 ﻿"""
 MÃ³dulo de notificaciones: Telegram y Discord (webhook).
 Provee configuraciones y funciones para enviar mensajes.
+Los avisos automÃ¡ticos pasan por un despachador en segundo plano: cola
+acotada, una sesiÃ³n keep-alive por destino, agrupaciÃ³n de rÃ¡fagas en un
+resumen, reintentos con backoff y respeto de los lÃ­mites de cada API.
 """
 
-import requests
-from typing import Tuple
-from src.settings_manager import load_settings, save_settings
+import heapq
+import itertools
+import queue
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from src.settings_manager import load_settings, save_settings, read_settings
+
+TELEGRAM_API_URL = "https://api.telegram.org"
 
 
 def setup_telegram(bot_token: str, chat_id: str) -> Tuple[bool, str]:
@@ -33,35 +44,330 @@ def setup_discord(webhook_url: str) -> Tuple[bool, str]:
     return True, "Discord configurado"
 
 
-def send_telegram_message(message: str, timeout: int = 5) -> Tuple[bool, str]:
-    settings = load_settings()
-    telegram = settings.get('notifications', {}).get('telegram', {})
-    if not telegram.get('enabled'):
-        return False, "Telegram no configurado"
+def _telegram_request(telegram: dict, message: str, title: str) -> Tuple[str, dict]:
+    # api_url permite apuntar a un servidor local de pruebas
+    base_url = telegram.get('api_url', TELEGRAM_API_URL)
+    url = f"{base_url}/bot{telegram['bot_token']}/sendMessage"
+    return url, {'chat_id': telegram['chat_id'], 'text': message}
+
+
+def _discord_request(discord: dict, message: str, title: str) -> Tuple[str, dict]:
+    payload = {
+        'embeds': [{
+            'title': title,
+            'description': message,
+            'color': 3498598,
+            'footer': {'text': 'Guardian Anti-Distraction'}
+        }]
+    }
+    return discord['webhook_url'], payload
+
+
+# destino -> constructor de (url, payload)
+TARGETS = {
+    'telegram': _telegram_request,
+    'discord': _discord_request,
+}
+
+# requests.Session no es segura entre hilos: cada hilo tiene las suyas
+_sessions = threading.local()
+_requests = False  # False = aÃºn sin importar
+
+
+def _get_requests():
+    """
+    Importa requests en el primer envÃ­o (cargarlo al iniciar cuesta mÃ¡s
+    que todo el resto del monitor). Retorna None si no estÃ¡ instalado.
+    """
+    global _requests
+    if _requests is False:
+        try:
+            import requests
+            _requests = requests
+        except ImportError:
+            _requests = None
+    return _requests
+
+
+def _get_session(target: str):
+    """
+    SesiÃ³n HTTP reutilizable (conexiÃ³n keep-alive) por destino y por hilo:
+    el despachador y los envÃ­os inmediatos nunca comparten una sesiÃ³n.
+    """
+    sessions = getattr(_sessions, 'by_target', None)
+    if sessions is None:
+        sessions = _sessions.by_target = {}
+    session = sessions.get(target)
+    if session is None:
+        session = sessions[target] = _get_requests().Session()
+    return session
+
+
+def get_enabled_targets(settings: Optional[dict] = None) -> Dict[str, dict]:
+    """Destinos configurados y habilitados: {nombre: config}."""
+    settings = read_settings() if settings is None else settings
+    notifications = settings.get('notifications', {})
+    return {
+        name: config for name, config in notifications.items()
+        if name in TARGETS and isinstance(config, dict) and config.get('enabled')
+    }
+
+
+def _retry_after(response) -> Optional[float]:
+    """Segundos de espera pedidos por la API (cabecera o cuerpo JSON)."""
+    header = response.headers.get('Retry-After')
+    if header:
+        try:
+            return float(header)
+        except ValueError:
+            pass
     try:
-        url = f"https://api.telegram.org/bot{telegram['bot_token']}/sendMessage"
-        payload = {'chat_id': telegram['chat_id'], 'text': message}
-        r = requests.post(url, json=payload, timeout=timeout)
-        return (r.status_code == 200, f"HTTP {r.status_code}")
-    except Exception as e:
-        return False, str(e)
+        data = response.json()
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    # Discord: {"retry_after": s}; Telegram: {"parameters": {"retry_after": s}}
+    value = data.get('retry_after', data.get('parameters', {}).get('retry_after'))
+    return float(value) if value is not None else None
 
 
-def send_discord_message(message: str, title: str = "Guardian Alert", timeout: int = 5) -> Tuple[bool, str]:
-    settings = load_settings()
-    discord = settings.get('notifications', {}).get('discord', {})
-    if not discord.get('enabled'):
-        return False, "Discord no configurado"
+def _post(target: str, config: dict, message: str, title: str, timeout: float):
+    """EnvÃ­a un mensaje. Retorna (status HTTP, retry_after)."""
+    url, payload = TARGETS[target](config, message, title)
+    response = _get_session(target).post(url, json=payload, timeout=timeout)
+    retry_after = _retry_after(response) if response.status_code == 429 else None
+    return response.status_code, retry_after
+
+
+def _send_now(target: str, message: str, title: str, timeout: float) -> Tuple[bool, str]:
+    config = get_enabled_targets().get(target)
+    if config is None:
+        return False, f"{target.capitalize()} no configurado"
+    if _get_requests() is None:
+        return False, "Para notificaciones se requiere: pip install requests"
     try:
-        payload = {
-            'embeds': [{
-                'title': title,
-                'description': message,
-                'color': 3498598
-            }]
-        }
-        r = requests.post(discord['webhook_url'], json=payload, timeout=timeout)
-        return (r.status_code in (200, 204), f"HTTP {r.status_code}")
+        status, _ = _post(target, config, message, title, timeout)
+        return (status in (200, 204), f"HTTP {status}")
     except Exception as e:
         return False, str(e)
 
+
+def send_telegram_message(message: str, timeout: int = 5) -> Tuple[bool, str]:
+    """EnvÃ­o inmediato (bloqueante). Para avisos automÃ¡ticos usar notify()."""
+    return _send_now('telegram', message, "Guardian Alert", timeout)
+
+
+def send_discord_message(message: str, title: str = "Guardian Alert", timeout: int = 5) -> Tuple[bool, str]:
+    """EnvÃ­o inmediato (bloqueante). Para avisos automÃ¡ticos usar notify()."""
+    return _send_now('discord', message, title, timeout)
+
+
+def format_digest(messages, window: float) -> str:
+    """Une una rÃ¡faga de mensajes en uno, contando los repetidos."""
+    if len(messages) == 1:
+        return messages[0]
+    counts = Counter(messages)
+    lines = [f"- {text}" + (f" (x{count})" if count > 1 else "") for text, count in counts.items()]
+    return f"{len(messages)} eventos en {int(window)}s:\n" + "\n".join(lines)
+
+
+class NotificationDispatcher:
+    """
+    Despachador en un hilo propio. notify() solo encola (nunca toca la red);
+    el hilo agrupa, programa los envÃ­os en un heap por vencimiento y
+    reintenta con backoff exponencial.
+    """
+
+    RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+    def __init__(self, max_queue: int = 1000, digest_window: float = 60.0, max_retries: int = 4,
+                 backoff: float = 1.0, min_interval: Optional[Dict[str, float]] = None, timeout: float = 5):
+        self.digest_window = digest_window
+        self.max_retries = max_retries
+        self.backoff = backoff
+        # SeparaciÃ³n mÃ­nima entre envÃ­os a un mismo destino (lÃ­mites de la API)
+        self.min_interval = {'telegram': 1.0, 'discord': 0.5}
+        self.min_interval.update(min_interval or {})
+        self.timeout = timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._heap = []
+        self._seq = itertools.count()
+        self._digests = {}
+        self._next_slot = {}
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stopped = False
+        self._worker = None
+        self._lock = threading.Lock()
+        self.stats = {'queued': 0, 'sent': 0, 'failed': 0, 'retries': 0, 'dropped': 0, 'coalesced': 0}
+
+    # ---------- API ----------
+
+    def notify(self, message: str, title: str = "Guardian Alert", digest_key: Optional[str] = None) -> bool:
+        """
+        Encola un aviso sin bloquear. Con `digest_key`, los avisos de la misma
+        clave dentro de la ventana se envÃ­an como un solo resumen.
+        Retorna False si no hay destinos habilitados o la cola estÃ¡ llena.
+        """
+        if not get_enabled_targets():
+            return False
+        try:
+            self._queue.put_nowait((time.monotonic(), message, title, digest_key))
+        except queue.Full:
+            self._count('dropped')
+            return False
+        self._idle.clear()
+        self._count('queued')
+        self._ensure_worker()
+        return True
+
+    def notify_block(self, app_name: str) -> bool:
+        """Aviso de bloqueo, agrupado con los demÃ¡s bloqueos de la ventana."""
+        return self.notify(f"App bloqueada: {app_name}", title="Guardian: bloqueos", digest_key='blocks')
+
+    def flush(self, timeout: float = 10) -> bool:
+        """EnvÃ­a ya los resÃºmenes pendientes y espera a vaciar la cola."""
+        if self._worker is None:
+            return True
+        self._idle.clear()
+        self._queue.put(None)
+        return self._idle.wait(timeout)
+
+    def stop(self, timeout: float = 10) -> bool:
+        """
+        VacÃ­a lo pendiente y detiene el hilo. Retorna False si el hilo sigue
+        vivo al vencer el timeout: sigue siendo el Ãºnico trabajador y un
+        notify() posterior no arranca otro.
+        """
+        self.flush(timeout)
+        with self._lock:
+            worker = self._worker
+            if worker is None:
+                return True
+            self._stopped = True
+        self._queue.put(None)
+        worker.join(timeout)
+        with self._lock:
+            self._stopped = False
+        return not worker.is_alive()
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        stats['pending'] = self._queue.qsize() + len(self._heap) + sum(len(d['messages']) for d in list(self._digests.values()))
+        return stats
+
+    # ---------- Hilo de envÃ­o ----------
+
+    def _ensure_worker(self):
+        with self._lock:
+            # El hilo se quita de _worker (con el lock) justo antes de terminar
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="guardian-notify", daemon=True)
+                self._worker.start()
+
+    def _schedule(self, message: str, title: str, now: float):
+        for target in get_enabled_targets():
+            due = max(now, self._next_slot.get(target, 0.0))
+            heapq.heappush(self._heap, (due, next(self._seq), target, message, title, 0))
+
+    def _accept(self, item, now: float):
+        if item is None:
+            # flush/stop: cerrar todas las ventanas de resumen ya
+            for digest in self._digests.values():
+                digest['deadline'] = now
+            return
+        _, message, title, digest_key = item
+        if digest_key is None:
+            self._schedule(message, title, now)
+            return
+        digest = self._digests.get(digest_key)
+        if digest is None:
+            self._digests[digest_key] = {'title': title, 'messages': [message], 'deadline': now + self.digest_window}
+        else:
+            digest['messages'].append(message)
+            self._count('coalesced')
+
+    def _flush_digests(self, now: float):
+        for key in [k for k, d in self._digests.items() if d['deadline'] <= now]:
+            digest = self._digests.pop(key)
+            self._schedule(format_digest(digest['messages'], self.digest_window), digest['title'], now)
+
+    def _send_due(self, now: float):
+        while self._heap and self._heap[0][0] <= now:
+            due, _, target, message, title, attempt = heapq.heappop(self._heap)
+            slot = self._next_slot.get(target, 0.0)
+            if slot > now:
+                heapq.heappush(self._heap, (slot, next(self._seq), target, message, title, attempt))
+                continue
+            config = get_enabled_targets().get(target)
+            if config is None or _get_requests() is None:
+                self._count('failed')
+                continue
+
+            retry_after = None
+            try:
+                status, retry_after = _post(target, config, message, title, self.timeout)
+                retryable = status in self.RETRYABLE_STATUS
+                ok = status in (200, 204)
+            except Exception as e:
+                print(f"[Error] No se pudo notificar por {target}: {e}")
+                ok, retryable = False, True
+            now = time.monotonic()
+            self._next_slot[target] = now + max(self.min_interval.get(target, 0.0), retry_after or 0.0)
+
+            if ok:
+                self._count('sent')
+            elif retryable and attempt < self.max_retries:
+                self._count('retries')
+                delay = max(self.backoff * 2 ** attempt, retry_after or 0.0)
+                heapq.heappush(self._heap, (now + delay, next(self._seq), target, message, title, attempt + 1))
+            else:
+                self._count('failed')
+
+    def _next_due(self) -> Optional[float]:
+        deadlines = [d['deadline'] for d in self._digests.values()]
+        if self._heap:
+            deadlines.append(self._heap[0][0])
+        return min(deadlines) if deadlines else None
+
+    def _run(self):
+        while True:
+            next_due = self._next_due()
+            timeout = None if next_due is None else max(0.0, next_due - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+                now = time.monotonic()
+                self._accept(item, now)
+                while True:
+                    self._accept(self._queue.get_nowait(), now)
+            except queue.Empty:
+                pass
+            now = time.monotonic()
+            self._flush_digests(now)
+            self._send_due(now)
+            if self._queue.empty() and not self._heap and not self._digests:
+                self._idle.set()
+                with self._lock:
+                    # Con el lock: un notify() que llegue despuÃ©s arranca otro hilo
+                    if self._stopped and self._queue.empty():
+                        self._worker = None
+                        return
+
+
+dispatcher = NotificationDispatcher()
+
+
+def notify(message: str, title: str = "Guardian Alert", digest_key: Optional[str] = None) -> bool:
+    """Encola un aviso para todos los destinos habilitados (no bloquea)."""
+    return dispatcher.notify(message, title, digest_key)
+
+
+def notify_block(app_name: str) -> bool:
+    """Encola un aviso de bloqueo (se agrupa en resÃºmenes)."""
+    return dispatcher.notify_block(app_name)
@@ -0,0 +1,149 @@
+"""
+Snapshot compartido de la tabla de procesos.
+Recorre psutil.process_iter una sola vez por tick y construye un índice
+nombre (minúsculas) -> [pid] que usan todas las rutas de cierre/búsqueda.
+"""
+
+import bisect
+import re
+import threading
+import time
+
+from src.tracing import tracer
+
+
+class ProcessSnapshot:
+    """Índice inmutable de procesos tomado en un instante."""
+
+    def __init__(self, processes, taken_at=None):
+        self.taken_at = time.monotonic() if taken_at is None else taken_at
+        self.by_name = {}
+        self.size = 0
+        self._contains_cache = {}
+        self._blob = None
+        self._names = None
+        self._starts = None
+        for name, pid in processes:
+            if not name:
+                continue
+            self.by_name.setdefault(name.lower(), []).append(pid)
+            self.size += 1
+
+    def pids_for(self, name):
+        """PIDs cuyo nombre es exactamente `name` (sin distinguir mayúsculas)."""
+        return self.by_name.get(name.lower(), [])
+
+    def _name_index(self):
+        """Nombres unidos por saltos de línea y el offset de cada uno (se arma una vez)."""
+        if self._blob is None:
+            self._names = list(self.by_name)
+            self._starts = []
+            offset = 0
+            for name in self._names:
+                self._starts.append(offset)
+                offset += len(name) + 1
+            self._blob = "\n".join(self._names)
+        return self._blob
+
+    def pids_containing(self, names):
+        """
+        Retorna {nombre: [pids]} para los procesos cuyo nombre contiene
+        alguno de los nombres dados. Una sola expresión regular recorre
+        todos los nombres de procesos a la vez (en C); solo las líneas con
+        alguna coincidencia se revisan nombre por nombre.
+        """
+        names = list(names)
+        key = tuple(name.lower() for name in names)
+        cached = self._contains_cache.get(key)
+        if cached is not None:
+            return dict(zip(names, cached))
+        found = {name: [] for name in names}
+        if not names:
+            return found
+        pattern = re.compile("|".join(re.escape(name) for name in key if name))
+        blob = self._name_index()
+        candidates = sorted({bisect.bisect_right(self._starts, match.start()) - 1
+                             for match in pattern.finditer(blob)})
+        for index in candidates:
+            # Un proceso puede contener varios nombres: se revisan todos
+            process_name = self._names[index]
+            for name, lowered in zip(names, key):
+                if lowered in process_name:
+                    found[name].extend(self.by_name[process_name])
+        self._contains_cache[key] = [found[name] for name in names]
+        return found
+
+
+def _iter_psutil():
+    # psutil se importa en el primer recorrido: ni el arranque ni los ticks
+    # sin detecciones lo necesitan
+    import psutil
+    for proc in psutil.process_iter(['name', 'pid']):
+        try:
+            yield proc.info['name'], proc.info['pid']
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+
+
+class ProcessTable:
+    """Servicio que entrega snapshots con una edad máxima configurable."""
+
+    def __init__(self, source=_iter_psutil, max_age=1.0):
+        self.source = source
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self.refreshes = 0
+
+    def refresh(self):
+        """Toma un snapshot nuevo (una sola pasada por process_iter)."""
+        with tracer.span("process_table.refresh"):
+            snapshot = ProcessSnapshot(self.source())
+        with self._lock:
+            self._snapshot = snapshot
+            self.refreshes += 1
+        return snapshot
+
+    def snapshot(self, max_age=None):
+        """Retorna el snapshot vigente, o uno nuevo si es más viejo que max_age."""
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            current = self._snapshot
+        if current is None or time.monotonic() - current.taken_at > max_age:
+            current = self.refresh()
+        return current
+
+    def invalidate(self):
+        """Descarta el snapshot actual."""
+        with self._lock:
+            self._snapshot = None
+
+
+def terminate_pids(pids, force=False, name=None, exact=False):
+    """
+    Cierra los procesos indicados. Retorna cuántos se cerraron.
+    Los PIDs vienen de un snapshot que puede tener hasta max_age segundos:
+    con `name` se vuelve a leer el nombre de cada proceso y se omite el
+    que ya no coincide (el PID pudo reutilizarse para otro programa).
+    """
+    import psutil
+    expected = name.lower() if name else None
+    closed = 0
+    for pid in pids:
+        try:
+            proc = psutil.Process(pid)
+            if expected is not None:
+                current = proc.name().lower()
+                if (current != expected) if exact else (expected not in current):
+                    continue
+            if force:
+                proc.kill()
+            else:
+                proc.terminate()
+            closed += 1
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return closed
+
+
+process_table = ProcessTable()
@@ -4,30 +4,27 @@ Genera reportes PDF, grÃ¡ficos, comparativas.
 """
 
 from datetime import datetime, timedelta
-from src.settings_manager import load_stats
+from src.settings_manager import get_block_aggregates, block_journal
 import json
 
+def _normalize_timestamp(timestamp):
+    """Timestamp ISO con 'T' como separador (el historial puede traer un espacio)."""
+    return str(timestamp).replace(' ', 'T', 1)
+
 def get_daily_stats(date=None):
     """Obtiene estadÃ­sticas de un dÃ­a especÃ­fico."""
     if date is None:
         date = datetime.now().strftime("%Y-%m-%d")
     
-    stats = load_stats()
-    blocks = stats.get('blocks', [])
-    
-    day_blocks = [b for b in blocks if b['timestamp'].startswith(date)]
-    
-    app_counts = {}
-    for block in day_blocks:
-        app = block['app']
-        app_counts[app] = app_counts.get(app, 0) + 1
+    day = get_block_aggregates().get_day(date)
+    app_counts = dict(day['apps'])
     
     return {
         'date': date,
-        'total_blocks': len(day_blocks),
+        'total_blocks': day['total'],
         'apps_blocked': app_counts,
         'most_blocked': max(app_counts, key=app_counts.get) if app_counts else None,
-        'hours_active': len(set([b['timestamp'].split('T')[1].split(':')[0] for b in day_blocks]))
+        'hours_active': sum(1 for count in day['hours'] if count)
     }
 
 def get_weekly_stats():
@@ -49,16 +46,23 @@ def get_monthly_stats():
 
 def get_top_blocked_apps(days=7):
     """Obtiene las apps mÃ¡s bloqueadas en los Ãºltimos N dÃ­as."""
-    stats = load_stats()
-    blocks = stats.get('blocks', [])
-    
-    cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-    recent_blocks = [b for b in blocks if b['timestamp'] > cutoff_date]
-    
+    aggregates = get_block_aggregates()
+    now = datetime.now()
+    cutoff = now - timedelta(days=days)
+    cutoff_date = cutoff.isoformat()
+    cutoff_day = cutoff.strftime("%Y-%m-%d")
+    
+    # El dÃ­a del corte se cuenta desde el historial crudo (solo ese dÃ­a);
+    # los dÃ­as completos siguientes salen de los agregados
     app_counts = {}
-    for block in recent_blocks:
-        app = block['app']
-        app_counts[app] = app_counts.get(app, 0) + 1
+    for block in block_journal.read_blocks(cutoff_day, cutoff_day):
+        if _normalize_timestamp(block['timestamp']) > cutoff_date:
+            app = block['app']
+            app_counts[app] = app_counts.get(app, 0) + 1
+    for i in range(days - 1, -1, -1):
+        day = aggregates.get_day((now - timedelta(days=i)).strftime("%Y-%m-%d"))
+        for app, count in day['apps'].items():
+            app_counts[app] = app_counts.get(app, 0) + count
     
     return sorted(app_counts.items(), key=lambda x: x[1], reverse=True)
 
@@ -87,11 +91,10 @@ def generate_csv_report(filename, days=7):
     """Genera reporte en formato CSV."""
     import csv
     
-    stats_data = load_stats()
-    blocks = stats_data.get('blocks', [])
-    
-    cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-    recent_blocks = [b for b in blocks if b['timestamp'] > cutoff_date]
+    cutoff = datetime.now() - timedelta(days=days)
+    cutoff_date = cutoff.isoformat()
+    blocks = block_journal.read_blocks(cutoff.strftime("%Y-%m-%d"))
+    recent_blocks = [b for b in blocks if _normalize_timestamp(b['timestamp']) > cutoff_date]
     
     try:
         with open(filename, 'w', newline='', encoding='utf-8') as f:
@@ -100,7 +103,7 @@ def generate_csv_report(filename, days=7):
             
             for block in recent_blocks:
                 ts = block['timestamp']
-                date, time = ts.split('T')
+                date, time = _normalize_timestamp(ts).split('T')
                 writer.writerow([ts, block['app'], date, time])
         
         return True
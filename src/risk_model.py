@@ -0,0 +1,259 @@
+"""
+Modelo incremental de riesgo de distracción.
+Mantiene tasas con decaimiento exponencial por hora del día, día de la
+semana y (día, hora, app). Cada bloqueo se incorpora en O(1) y la
+consulta de riesgo es de tiempo constante, dando más peso a lo reciente.
+Los contadores viven en memoria y se guardan en diferido: una ráfaga de
+bloqueos produce una sola escritura.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+from src.json_store import save_json
+
+_EPOCH = datetime(1970, 1, 1)
+DEFAULT_HALF_LIFE_DAYS = 14
+# Reescalar cuando los valores almacenados crecen demasiado
+_MAX_EXPONENT = 60
+# Segundos entre el primer bloqueo sin guardar y la escritura del modelo
+SAVE_DELAY = 5.0
+
+
+def _to_epoch(moment):
+    if isinstance(moment, str):
+        moment = datetime.fromisoformat(moment)
+    # Igual que ml_analyzer: se usa la hora local escrita, sin el offset
+    moment = moment.replace(tzinfo=None)
+    return (moment - _EPOCH).total_seconds()
+
+
+class DecayedRiskModel:
+    """
+    Conteos con decaimiento hacia adelante: cada evento suma
+    2^((t - t0) / vida_media), así todos los valores comparten el mismo
+    factor de escala y las razones entre ellos no requieren recalcular nada.
+    """
+
+    def __init__(self, model_file, half_life_days=DEFAULT_HALF_LIFE_DAYS):
+        self.model_file = model_file
+        self.half_life = half_life_days * 86400
+        self._lock = threading.RLock()
+        self._signature = None
+        self._dirty = False
+        self._timer = None
+        # Ruta absoluta fijada al primer cambio pendiente (el cwd puede cambiar)
+        self._save_path = None
+        self._reset()
+
+    def _reset(self):
+        self.t0 = None
+        # El archivo se guardó con otra vida media: hay que reconstruirlo
+        self._stale = False
+        self.hours = [0.0] * 24
+        self.weekdays = [0.0] * 7
+        self.slots = {}
+        self.apps = {}
+        self.total = 0.0
+        self.events = 0
+
+    def _weight(self, epoch):
+        if self.t0 is None:
+            self.t0 = epoch
+        exponent = (epoch - self.t0) / self.half_life
+        if exponent > _MAX_EXPONENT:
+            self._rescale(epoch)
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def _rescale(self, epoch):
+        factor = 2.0 ** (-(epoch - self.t0) / self.half_life)
+        self.hours = [v * factor for v in self.hours]
+        self.weekdays = [v * factor for v in self.weekdays]
+        self.slots = {k: v * factor for k, v in self.slots.items()}
+        for app_data in self.apps.values():
+            app_data['hours'] = [v * factor for v in app_data['hours']]
+            app_data['weekdays'] = [v * factor for v in app_data['weekdays']]
+            app_data['total'] *= factor
+        self.total *= factor
+        self.t0 = epoch
+
+    def _add(self, app, timestamp):
+        try:
+            epoch = _to_epoch(timestamp)
+        except (TypeError, ValueError):
+            return False
+        weight = self._weight(epoch)
+        hour = int(epoch // 3600) % 24
+        # 1970-01-01 fue jueves (índice 3 con lunes = 0)
+        weekday = (int(epoch // 86400) + 3) % 7
+        key = f"{weekday}:{hour}:{app}"
+        self.hours[hour] += weight
+        self.weekdays[weekday] += weight
+        self.slots[key] = self.slots.get(key, 0.0) + weight
+        app_data = self.apps.setdefault(app, {'hours': [0.0] * 24, 'weekdays': [0.0] * 7, 'total': 0.0})
+        app_data['hours'][hour] += weight
+        app_data['weekdays'][weekday] += weight
+        app_data['total'] += weight
+        self.total += weight
+        self.events += 1
+        return True
+
+    # ---------- Persistencia ----------
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.model_file)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def exists(self):
+        """True si hay un modelo utilizable (guardado con la vida media actual)."""
+        with self._lock:
+            if self._dirty:
+                return True
+            self._refresh()
+            return self._signature is not None and not self._stale
+
+    def _refresh(self):
+        """Recarga el modelo si otro proceso lo modificó."""
+        if self._dirty:
+            # Hay cambios en memoria sin guardar: son la versión vigente
+            return
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+        self._reset()
+        if signature is not None:
+            try:
+                with open(self.model_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                stored = data.get('half_life_days', self.half_life / 86400) * 86400
+                if abs(stored - self.half_life) > 1e-6:
+                    # Los pesos no son comparables con la vida media configurada
+                    self._stale = True
+                else:
+                    self._load_slots(data['t0'], data['slots'], data['events'])
+            except Exception as e:
+                print(f"[Error] No se pudo cargar el modelo de riesgo: {e}")
+                self._reset()
+        self._signature = signature
+
+    def _load_slots(self, t0, slots, events):
+        """Los totales por hora, día y app se derivan de los slots (día, hora, app)."""
+        self.t0 = t0
+        self.events = events
+        for key, weight in slots.items():
+            weekday, hour, app = key.split(':', 2)
+            weekday, hour = int(weekday), int(hour)
+            self.slots[key] = weight
+            self.hours[hour] += weight
+            self.weekdays[weekday] += weight
+            app_data = self.apps.setdefault(app, {'hours': [0.0] * 24, 'weekdays': [0.0] * 7, 'total': 0.0})
+            app_data['hours'][hour] += weight
+            app_data['weekdays'][weekday] += weight
+            app_data['total'] += weight
+            self.total += weight
+
+    def _save(self):
+        # Solo el estado mínimo: lo demás se reconstruye al cargar
+        data = {
+            'half_life_days': self.half_life / 86400,
+            't0': self.t0,
+            'slots': self.slots,
+            'events': self.events,
+        }
+        try:
+            save_json(self._save_path or self.model_file, data)
+            self._signature = self._file_signature()
+            self._dirty = False
+            self._save_path = None
+        except Exception as e:
+            print(f"[Error] No se pudo guardar el modelo de riesgo: {e}")
+
+    def _schedule_save(self):
+        if not self._dirty:
+            self._save_path = os.path.abspath(self.model_file)
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(SAVE_DELAY, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Guarda ya los cambios pendientes (también al salir del proceso)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._dirty:
+                self._save()
+
+    # ---------- API ----------
+
+    def record(self, app, timestamp):
+        """Incorpora un bloqueo al modelo (O(1)); se guarda en diferido."""
+        with self._lock:
+            self._refresh()
+            if self._add(app, timestamp):
+                self._schedule_save()
+
+    def slot_rate(self, weekday, hour, app):
+        """Tasa relativa (0-1) de una app en un (día, hora) respecto al total."""
+        with self._lock:
+            self._refresh()
+            if self.total <= 0:
+                return 0.0
+            return self.slots.get(f"{weekday}:{hour}:{app}", 0.0) / self.total
+
+    def rebuild(self, blocks):
+        """Reconstruye el modelo desde el historial crudo."""
+        with self._lock:
+            self._reset()
+            for block in blocks:
+                self._add(block.get('app'), block.get('timestamp'))
+            self._dirty = True
+            self.flush()
+            return self.events
+
+    def risk(self, moment=None, app=None):
+        """
+        Retorna (nivel, score 0-100) para el momento dado (ahora por
+        defecto). Con `app`, el score se limita a esa app.
+        """
+        moment = datetime.now() if moment is None else moment
+        with self._lock:
+            self._refresh()
+            if self.events == 0 or self.total <= 0:
+                return 'bajo', 50
+
+            epoch = _to_epoch(moment)
+            hour = int(epoch // 3600) % 24
+            weekday = (int(epoch // 86400) + 3) % 7
+            if app is None:
+                hours, weekdays, total = self.hours, self.weekdays, self.total
+            else:
+                app_data = self.apps.get(app)
+                if not app_data or app_data['total'] <= 0:
+                    return 'bajo', 0
+                hours, weekdays, total = app_data['hours'], app_data['weekdays'], app_data['total']
+            hour_rate = hours[hour]
+            day_rate = weekdays[weekday]
+
+        # Mismo criterio que el análisis histórico: 50 = promedio
+        hour_score = hour_rate / (total / 24) * 50
+        day_score = day_rate / (total / 7) * 50
+        score = min(100, hour_score / 2 + day_score / 2)
+
+        if score >= 75:
+            level = 'muy alto'
+        elif score >= 50:
+            level = 'alto'
+        elif score >= 25:
+            level = 'medio'
+        else:
+            level = 'bajo'
+        return level, int(score)
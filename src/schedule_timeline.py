@@ -0,0 +1,129 @@
+"""
+Línea de tiempo semanal precompilada para los horarios de bloqueo.
+Los intervalos activos se guardan como una lista ordenada de fronteras en
+minutos desde el lunes 00:00; "¿activo ahora?" y "¿próxima transición?"
+se responden con una búsqueda binaria.
+"""
+
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+DAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+
+def parse_minutes(value):
+    """Hora del día en minutos: 9, 9.5 o "09:30". None si no es válida."""
+    try:
+        if isinstance(value, str) and ':' in value:
+            hours, minutes = value.split(':', 1)
+            return int(hours) * 60 + int(minutes)
+        return int(round(float(value) * 60))
+    except (TypeError, ValueError):
+        return None
+
+
+def week_minute(moment):
+    """Minuto de la semana (0 = lunes 00:00) de un datetime."""
+    return moment.weekday() * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+
+class WeeklyTimeline:
+    """
+    Conjunto de intervalos [inicio, fin) en minutos de la semana.
+    Los intervalos que cruzan la medianoche del domingo se parten en dos.
+    """
+
+    def __init__(self, intervals=()):
+        pieces = []
+        for start, end in intervals:
+            if end <= start:
+                continue
+            if end - start >= MINUTES_PER_WEEK:
+                pieces.append((0, MINUTES_PER_WEEK))
+                continue
+            length = end - start
+            start %= MINUTES_PER_WEEK
+            end = start + length
+            if end > MINUTES_PER_WEEK:
+                pieces.append((start, MINUTES_PER_WEEK))
+                pieces.append((0, end - MINUTES_PER_WEEK))
+            else:
+                pieces.append((start, end))
+
+        # Unir solapados/contiguos y aplanar en fronteras [s0, e0, s1, e1, ...]
+        merged = []
+        for start, end in sorted(pieces):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.boundaries = [minute for interval in merged for minute in interval]
+
+    @property
+    def always_active(self):
+        return self.boundaries == [0, MINUTES_PER_WEEK]
+
+    def is_active_at(self, minute):
+        """True si el minuto de la semana cae dentro de un intervalo."""
+        return bisect_right(self.boundaries, minute % MINUTES_PER_WEEK) % 2 == 1
+
+    def next_transition_minute(self, minute):
+        """
+        Minutos hasta el próximo cambio activo/inactivo desde `minute`, o
+        None si el estado nunca cambia.
+        """
+        boundaries = self.boundaries
+        if not boundaries or self.always_active:
+            return None
+        minute %= MINUTES_PER_WEEK
+        index = bisect_right(boundaries, minute)
+        if index < len(boundaries):
+            target = boundaries[index]
+            # Un intervalo hasta el fin de la semana sigue en el que empieza
+            # el lunes 00:00: la transición real es el fin de este último
+            if target == MINUTES_PER_WEEK and boundaries[0] == 0:
+                return boundaries[1] + MINUTES_PER_WEEK - minute
+            return target - minute
+        return boundaries[0] + MINUTES_PER_WEEK - minute
+
+    def is_active(self, moment=None):
+        moment = datetime.now() if moment is None else moment
+        return self.is_active_at(week_minute(moment))
+
+    def next_transition(self, moment=None):
+        """datetime del próximo cambio de estado, o None."""
+        moment = datetime.now() if moment is None else moment
+        delta = self.next_transition_minute(week_minute(moment))
+        if delta is None:
+            return None
+        return moment.replace(second=0, microsecond=0) + timedelta(minutes=delta)
+
+
+def compile_timeline(settings):
+    """
+    Compila el horario del perfil actual: cada día usa su horario de
+    settings['schedules'][perfil][día] si existe (o ninguno si está
+    deshabilitado) y si no, el rango enabled_hours del perfil.
+    """
+    profile = settings.get('current_profile')
+    profile_config = settings.get('profiles', {}).get(profile, {})
+    default_hours = profile_config.get('enabled_hours', {})
+    day_schedules = settings.get('schedules', {}).get(profile, {})
+
+    intervals = []
+    for index, day in enumerate(DAY_NAMES):
+        config = day_schedules.get(day, default_hours)
+        if config.get('enabled', True) is False:
+            continue
+        start = parse_minutes(config.get('start', 0))
+        end = parse_minutes(config.get('end', 24))
+        if start is None or end is None:
+            continue
+        if end < start:
+            # Horario nocturno: termina al día siguiente
+            end += MINUTES_PER_DAY
+        day_offset = index * MINUTES_PER_DAY
+        intervals.append((day_offset + start, day_offset + end))
+    return WeeklyTimeline(intervals)
@@ -4,20 +4,39 @@ Permite horarios especÃ­ficos para cada dÃ­a y perfil.
 """
 
 from datetime import datetime, time
-from src.settings_manager import load_settings, save_settings
+from src.settings_manager import load_settings, save_settings, read_settings, get_settings_version
+from src.usage_ledger import usage_ledger
+from src.schedule_timeline import compile_timeline
 
-def is_blocking_active():
-    """Verifica si el bloqueo debe estar activo segÃºn el horario."""
-    settings = load_settings()
-    profile = settings['current_profile']
-    
-    hours_config = settings['profiles'][profile].get('enabled_hours', {})
-    start_hour = hours_config.get('start', 0)
-    end_hour = hours_config.get('end', 24)
-    
-    current_hour = datetime.now().hour
-    
-    return start_hour <= current_hour < end_hour
+_timeline_cache = {'version': None, 'timeline': None}
+
+def get_schedule_timeline():
+    """
+    LÃ­nea de tiempo semanal del perfil actual. Se recompila solo cuando
+    cambia la versiÃ³n de los settings.
+    """
+    # La versiÃ³n antes que los datos: un cambio en medio fuerza otra compilaciÃ³n
+    version = get_settings_version()
+    if _timeline_cache['timeline'] is None or _timeline_cache['version'] != version:
+        _timeline_cache['timeline'] = compile_timeline(read_settings())
+        _timeline_cache['version'] = version
+    return _timeline_cache['timeline']
+
+def is_blocking_active(now=None):
+    """Verifica si el bloqueo debe estar activo segÃºn el horario (O(log n))."""
+    return get_schedule_timeline().is_active(now)
+
+def next_schedule_transition(now=None):
+    """Momento del prÃ³ximo cambio activo/inactivo, o None si no cambia nunca."""
+    return get_schedule_timeline().next_transition(now)
+
+def seconds_until_transition(now=None):
+    """Segundos hasta el prÃ³ximo cambio de horario, o None."""
+    now = datetime.now() if now is None else now
+    transition = next_schedule_transition(now)
+    if transition is None:
+        return None
+    return max(0.0, (transition - now).total_seconds())
 
 def set_schedule(profile, day, start_hour, end_hour):
     """
@@ -43,7 +62,7 @@ def set_schedule(profile, day, start_hour, end_hour):
 
 def get_todays_schedule(profile):
     """Obtiene el horario de hoy para un perfil."""
-    settings = load_settings()
+    settings = read_settings()
     
     if 'schedules' not in settings or profile not in settings['schedules']:
         return None
@@ -53,7 +72,7 @@ def get_todays_schedule(profile):
 
 def get_all_schedules(profile):
     """Obtiene todos los horarios de un perfil."""
-    settings = load_settings()
+    settings = read_settings()
     
     if 'schedules' not in settings or profile not in settings['schedules']:
         return {}
@@ -70,39 +89,45 @@ def set_time_limit(app_name, minutes_per_day):
     if 'time_limits' not in settings:
         settings['time_limits'] = {}
     
+    # El uso se lleva en el registro diario, no en settings
     settings['time_limits'][app_name] = {
         'minutes': minutes_per_day,
-        'used': 0,
-        'last_reset': datetime.now().isoformat()
     }
     
     save_settings(settings)
+    usage_ledger.reset(app_name)
 
 def get_time_limit(app_name):
-    """Obtiene el lÃ­mite de tiempo de una app."""
-    settings = load_settings()
-    return settings.get('time_limits', {}).get(app_name, None)
+    """Obtiene el lÃ­mite de tiempo de una app, con el uso de hoy."""
+    settings = read_settings()
+    limit = settings.get('time_limits', {}).get(app_name, None)
+    if limit is None:
+        return None
+    
+    return {
+        'minutes': limit['minutes'],
+        'used': usage_ledger.get(app_name),
+        'last_reset': usage_ledger.day,
+    }
 
 def update_app_usage(app_name, seconds=1):
-    """Actualiza el tiempo de uso de una app."""
-    settings = load_settings()
-    
-    if 'time_limits' not in settings or app_name not in settings['time_limits']:
-        return
+    """
+    Suma tiempo de uso a una app con lÃ­mite. Solo toca memoria; el
+    registro se guarda cada pocos segundos o al cruzar el lÃ­mite.
+    Retorna los segundos que le quedan hoy (None si no tiene lÃ­mite).
+    """
+    limit = read_settings().get('time_limits', {}).get(app_name)
+    if limit is None:
+        return None
     
-    settings['time_limits'][app_name]['used'] += seconds
-    save_settings(settings)
+    limit_seconds = limit['minutes'] * 60
+    used = usage_ledger.add(app_name, seconds, limit_seconds)
+    return max(0, limit_seconds - used)
 
 def reset_daily_usage():
-    """Reinicia el contador diario de uso."""
-    settings = load_settings()
-    
-    if 'time_limits' not in settings:
-        return
-    
-    for app in settings['time_limits']:
-        settings['time_limits'][app]['used'] = 0
-        settings['time_limits'][app]['last_reset'] = datetime.now().isoformat()
-    
-    save_settings(settings)
+    """
+    Reinicia el contador diario de uso. El cambio de dÃ­a ya se detecta
+    solo en el primer acceso; esto fuerza el reinicio.
+    """
+    usage_ledger.reset()
 
@@ -3,12 +3,13 @@ Sistema de bloqueo y detección de evasión.
 Bloquea Task Manager, CMD, PowerShell, detecta VPN, etc.
 """
 
-import psutil
 import subprocess
 import os
 import ctypes
 import threading
 
+from src.process_table import process_table, terminate_pids
+
 BLOCKED_SYSTEM_TOOLS = [
     "taskmgr.exe",      # Task Manager
     "cmd.exe",          # Command Prompt
@@ -21,21 +22,20 @@ BLOCKED_SYSTEM_TOOLS = [
     "compmgmt.msc",     # Computer Management
 ]
 
-def kill_process(process_name):
+def kill_process(process_name, snapshot=None):
     """Cierra un proceso por nombre."""
-    for proc in psutil.process_iter(['name', 'pid']):
-        try:
-            if proc.info['name'].lower() == process_name.lower():
-                proc.kill()
-                return True
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
+    if snapshot is None:
+        snapshot = process_table.snapshot()
+    for pid in snapshot.pids_for(process_name):
+        if terminate_pids([pid], force=True, name=process_name, exact=True):
+            return True
     return False
 
 def block_system_tools():
     """Bloquea herramientas de sistema que podrían desactivar Guardian."""
+    snapshot = process_table.snapshot()
     for tool in BLOCKED_SYSTEM_TOOLS:
-        kill_process(tool)
+        kill_process(tool, snapshot)
 
 def is_vpn_active():
     """Detecta si hay una VPN activa."""
@@ -120,13 +120,12 @@ def monitor_system_tools(on_detected=None):
     """Monitorea constantemente herramientas de sistema bloqueadas."""
     def check():
         while True:
+            snapshot = process_table.refresh()
             for tool in BLOCKED_SYSTEM_TOOLS:
-                if psutil.pid_exists(psutil.pids()):
-                    for proc in psutil.process_iter(['name']):
-                        if proc.info['name'].lower() == tool.lower():
-                            if on_detected:
-                                on_detected(tool)
-                            kill_process(tool)
+                if snapshot.pids_for(tool):
+                    if on_detected:
+                        on_detected(tool)
+                    kill_process(tool, snapshot)
             threading.Event().wait(1)
     
     thread = threading.Thread(target=check, daemon=True)
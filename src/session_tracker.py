@@ -1,34 +1,37 @@
 """
 Sistema de sesiones - Tracking de histórico de trabajo
 """
-import json
-import os
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from src.json_store import save_json, load_json, COALESCE_WINDOW
+from src.event_store import event_store
 
 
 class SessionTracker:
     """Rastrea y almacena sesiones de trabajo."""
     
-    def __init__(self, sessions_file="data/sessions_history.json"):
+    def __init__(self, sessions_file="data/sessions_history.json", store=event_store):
         self.sessions_file = sessions_file
-        self.sessions = self.load_sessions()
+        self.store = store
+        self._sessions = None
         self.current_session = None
     
+    @property
+    def sessions(self):
+        """Histórico completo; se carga en el primer acceso."""
+        if self._sessions is None:
+            self._sessions = self.load_sessions()
+        return self._sessions
+    
     def load_sessions(self):
         """Carga histórico de sesiones."""
-        if os.path.exists(self.sessions_file):
-            try:
-                with open(self.sessions_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return []
-        return []
+        if self.store is not None:
+            return self.store.read_sessions('tracker')
+        return load_json(self.sessions_file, [])
     
     def save_sessions(self):
         """Guarda sesiones."""
-        os.makedirs(os.path.dirname(self.sessions_file), exist_ok=True)
-        with open(self.sessions_file, 'w', encoding='utf-8') as f:
-            json.dump(self.sessions, f, indent=2, ensure_ascii=False)
+        save_json(self.sessions_file, self.sessions, indent=2, delay=COALESCE_WINDOW)
     
     def start_session(self, session_type="work"):
         """Inicia una sesión."""
@@ -45,8 +48,13 @@ class SessionTracker:
         """Finaliza sesión actual."""
         if self.current_session:
             self.current_session["end"] = datetime.now().isoformat()
-            self.sessions.append(self.current_session)
-            self.save_sessions()
+            if self.store is not None:
+                self.store.add_session('tracker', self.current_session)
+                if self._sessions is not None:
+                    self._sessions.append(self.current_session)
+            else:
+                self.sessions.append(self.current_session)
+                self.save_sessions()
             
             result = self.current_session.copy()
             self.current_session = None
@@ -77,6 +85,10 @@ class SessionTracker:
     
     def _get_recent_sessions(self, days=7):
         """Filtra sesiones recientes."""
+        if self.store is not None:
+            # Consulta por rango sobre el índice (source, start)
+            cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+            return self.store.read_sessions('tracker', since=cutoff)
         cutoff = datetime.now().timestamp() - (days * 24 * 3600)
         return [s for s in self.sessions if datetime.fromisoformat(s.get("start", "")).timestamp() > cutoff]
     
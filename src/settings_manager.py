@@ -3,13 +3,28 @@ Gestor de configuraciÃ³n y persistencia de datos.
 Guarda/carga settings, listas de apps, estadÃ­sticas, etc.
 """
 
+import atexit
+import copy
+import hashlib
 import json
 import os
+import threading
 from datetime import datetime
 from src.config import BLOCKED_APPS
+from src.block_journal import BlockJournal
+from src.block_aggregates import BlockAggregates
+from src.risk_model import DecayedRiskModel
+from src.event_hub import notify_data_changed
+from src.json_store import save_json, dump_json
+from src.event_store import event_store
+from src.tracing import tracer
 
 SETTINGS_FILE = "guardian_settings.json"
 STATS_FILE = "guardian_stats.json"
+BLOCKS_JOURNAL_FILE = "guardian_blocks.jsonl"
+BLOCKS_SEGMENTS_DIR = "guardian_blocks"
+AGGREGATES_DIR = "guardian_aggregates"
+RISK_MODEL_FILE = "guardian_risk_model.json"
 
 DEFAULT_SETTINGS = {
     "blocked_apps": BLOCKED_APPS,
@@ -19,6 +34,7 @@ DEFAULT_SETTINGS = {
     "alert_volume": 100,
     "countdown_seconds": 3,
     "check_interval": 5,
+    "polling": {"min_interval": 1, "max_interval": 10, "backoff": 2},
     "enabled": True,
     "current_profile": "default",
     "profiles": {
@@ -40,34 +56,126 @@ DEFAULT_SETTINGS = {
     }
 }
 
+class SettingsStore:
+    """
+    Cache en memoria de guardian_settings.json para todo el proceso.
+    Parsea el archivo una sola vez y solo lo recarga cuando cambian su
+    mtime/tamaÃ±o o cuando se escribe a travÃ©s del propio store.
+    """
+
+    def __init__(self, path, defaults):
+        self.path = path
+        self.defaults = defaults
+        self._lock = threading.RLock()
+        self._data = None
+        self._signature = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def read(self):
+        """
+        Retorna los settings cacheados (compartidos: no mutar).
+        Usa load_settings() si se necesita una copia modificable.
+        """
+        signature = self._stat_signature()
+        with self._lock:
+            if self._data is not None and signature == self._signature:
+                self.hits += 1
+                return self._data
+
+            self.misses += 1
+            if signature is None:
+                if not self.write(self.defaults):
+                    self._data = self.defaults
+                return self._data
+            try:
+                with tracer.span("settings.load"), open(self.path, 'r', encoding='utf-8') as f:
+                    self._data = json.load(f)
+                self._signature = signature
+            except Exception as e:
+                print(f"[Error] No se pudo cargar settings: {e}")
+                self._data = self.defaults
+                self._signature = signature
+            return self._data
+
+    def write(self, settings):
+        """Guarda los settings en archivo y actualiza el cache."""
+        with self._lock:
+            try:
+                save_json(self.path, settings, indent=4)
+            except Exception as e:
+                print(f"[Error] No se pudo guardar settings: {e}")
+                self.invalidate()
+                return False
+            self.writes += 1
+            self._data = copy.deepcopy(settings)
+            self._signature = self._stat_signature()
+            return True
+
+    def invalidate(self):
+        """Fuerza la recarga desde disco en la prÃ³xima lectura."""
+        with self._lock:
+            self._data = None
+            self._signature = None
+
+    def data_version(self):
+        """Identificador que cambia con cada escritura propia o ajena."""
+        return (self.writes, self._stat_signature())
+
+    def get_stats(self):
+        """Retorna contadores de aciertos/fallos del cache."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+            }
+
+    def reset_stats(self):
+        """Reinicia los contadores."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.writes = 0
+
+settings_store = SettingsStore(SETTINGS_FILE, DEFAULT_SETTINGS)
+
+def read_settings():
+    """Retorna los settings cacheados en memoria (solo lectura)."""
+    return settings_store.read()
+
 def load_settings():
     """Carga los settings del archivo. Si no existe, crea uno nuevo."""
-    if os.path.exists(SETTINGS_FILE):
-        try:
-            with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"[Error] No se pudo cargar settings: {e}")
-            return DEFAULT_SETTINGS
-    else:
-        save_settings(DEFAULT_SETTINGS)
-        return DEFAULT_SETTINGS
+    return copy.deepcopy(settings_store.read())
 
 def save_settings(settings):
     """Guarda los settings en archivo."""
-    try:
-        with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(settings, f, indent=4, ensure_ascii=False)
-        return True
-    except Exception as e:
-        print(f"[Error] No se pudo guardar settings: {e}")
-        return False
+    saved = settings_store.write(settings)
+    if saved:
+        notify_data_changed()
+    return saved
+
+def get_settings_version():
+    """VersiÃ³n actual de los settings (para caches derivados)."""
+    return settings_store.data_version()
+
+def get_settings_cache_stats():
+    """Retorna los contadores hit/miss del cache de settings."""
+    return settings_store.get_stats()
 
 def get_blocked_apps():
-    """Obtiene lista de apps bloqueadas actual."""
-    settings = load_settings()
+    """Obtiene lista de apps bloqueadas actual (copia: se puede modificar)."""
+    settings = read_settings()
     profile = settings['current_profile']
-    return settings['profiles'][profile]['blocked_apps']
+    return list(settings['profiles'][profile]['blocked_apps'])
 
 def add_blocked_app(app_name):
     """Agrega una app a la lista de bloqueadas."""
@@ -108,9 +216,9 @@ def remove_from_whitelist(app_name):
     return False
 
 def get_whitelist():
-    """Obtiene la whitelist."""
-    settings = load_settings()
-    return settings['whitelist_apps']
+    """Obtiene la whitelist (copia: se puede modificar)."""
+    settings = read_settings()
+    return list(settings['whitelist_apps'])
 
 def set_password(password):
     """Guarda una contraseÃ±a para proteger Guardian."""
@@ -120,41 +228,138 @@ def set_password(password):
 
 def verify_password(password):
     """Verifica si la contraseÃ±a es correcta."""
-    settings = load_settings()
+    settings = read_settings()
     return settings['password'] == password
 
+if event_store is not None:
+    # Backend SQLite: la misma base sirve de journal y de agregados
+    block_journal = event_store
+    block_aggregates = event_store
+else:
+    block_journal = BlockJournal(BLOCKS_JOURNAL_FILE, BLOCKS_SEGMENTS_DIR)
+    block_aggregates = BlockAggregates(AGGREGATES_DIR)
+risk_model = DecayedRiskModel(RISK_MODEL_FILE)
+atexit.register(risk_model.flush)
+_legacy_stats_checked = False
+
 def log_block_event(app_name, timestamp=None):
     """Registra un evento de bloqueo en las estadÃ­sticas."""
     if timestamp is None:
         timestamp = datetime.now().isoformat()
     
-    stats = load_stats()
-    if 'blocks' not in stats:
-        stats['blocks'] = []
-    
-    stats['blocks'].append({
-        'app': app_name,
-        'timestamp': timestamp
-    })
+    get_block_aggregates()
+    get_risk_model()
+    event = block_journal.append(app_name, timestamp)
+    block_aggregates.record(app_name, timestamp)
+    risk_model.record(app_name, timestamp)
+    notify_data_changed()
+    return event
+
+def rebuild_block_aggregates():
+    """Recalcula los agregados diarios y el modelo de riesgo desde el historial crudo."""
+    import_legacy_stats()
+    blocks = block_journal.read_blocks()
+    risk_model.rebuild(blocks)
+    return block_aggregates.rebuild(blocks)
+
+def get_block_journal():
+    """Retorna el journal de bloqueos, importando antes el formato antiguo."""
+    if not _legacy_stats_checked:
+        import_legacy_stats()
+    return block_journal
+
+def get_block_aggregates():
+    """Retorna los agregados diarios, construyÃ©ndolos si aÃºn no existen."""
+    get_block_journal()
+    if not block_aggregates.exists():
+        block_aggregates.rebuild(block_journal.read_blocks())
+    return block_aggregates
+
+def get_risk_model():
+    """Retorna el modelo de riesgo, construyÃ©ndolo desde el historial si no existe."""
+    get_block_journal()
+    if not risk_model.exists():
+        risk_model.rebuild(block_journal.read_blocks())
+    return risk_model
+
+_stats_lock = threading.Lock()
+_stats_cache = {'signature': None, 'data': None}
+
+def _stats_signature():
+    try:
+        st = os.stat(STATS_FILE)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _read_stats_file():
+    """Copia del stats; el archivo solo se vuelve a parsear si cambiÃ³ su mtime/tamaÃ±o."""
+    signature = _stats_signature()
+    with _stats_lock:
+        if signature is None:
+            return {}
+        if signature != _stats_cache['signature']:
+            try:
+                with open(STATS_FILE, 'r', encoding='utf-8') as f:
+                    _stats_cache['data'] = json.load(f)
+            except Exception as e:
+                print(f"[Error] No se pudo cargar stats: {e}")
+                _stats_cache['data'] = {}
+            _stats_cache['signature'] = signature
+        return copy.deepcopy(_stats_cache['data'])
+
+def _write_stats_file(stats):
+    with _stats_lock:
+        save_json(STATS_FILE, stats, indent=4)
+        _stats_cache['data'] = copy.deepcopy(stats)
+        _stats_cache['signature'] = _stats_signature()
+
+def legacy_stats_batch_id(blocks):
+    """Id del lote de bloqueos del stats antiguo, derivado de su contenido."""
+    return "legacy-stats:" + hashlib.sha1(dump_json(blocks)).hexdigest()
+
+def import_legacy_stats():
+    """
+    Importa los bloqueos del antiguo guardian_stats.json ({"blocks": [...]})
+    al journal y los quita del archivo. Retorna cuÃ¡ntos se importaron.
+    El lote se identifica por su contenido: si el proceso muere antes de
+    reescribir el archivo, el reintento no duplica los eventos.
+    """
+    global _legacy_stats_checked
+    _legacy_stats_checked = True
+    stats = _read_stats_file()
+    blocks = stats.get('blocks')
+    if not blocks:
+        return 0
     
-    save_stats(stats)
+    count = block_journal.import_blocks(blocks, batch_id=legacy_stats_batch_id(blocks))
+    all_blocks = block_journal.read_blocks()
+    block_aggregates.rebuild(all_blocks)
+    risk_model.rebuild(all_blocks)
+    stats.pop('blocks')
+    try:
+        _write_stats_file(stats)
+    except Exception as e:
+        print(f"[Error] No se pudo actualizar stats: {e}")
+    return count
 
 def load_stats():
     """Carga las estadÃ­sticas."""
-    if os.path.exists(STATS_FILE):
-        try:
-            with open(STATS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"[Error] No se pudo cargar stats: {e}")
-            return {"blocks": []}
-    return {"blocks": []}
+    import_legacy_stats()
+    stats = _read_stats_file()
+    stats['blocks'] = block_journal.read_blocks()
+    return stats
 
 def save_stats(stats):
     """Guarda las estadÃ­sticas."""
     try:
-        with open(STATS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, indent=4, ensure_ascii=False)
+        stats = dict(stats)
+        blocks = stats.pop('blocks', None)
+        if blocks is not None:
+            block_journal.replace_all(blocks)
+            block_aggregates.rebuild(blocks)
+            risk_model.rebuild(blocks)
+        _write_stats_file(stats)
         return True
     except Exception as e:
         print(f"[Error] No se pudo guardar stats: {e}")
@@ -192,11 +397,11 @@ def switch_profile(profile_name):
 
 def get_current_profile():
     """Obtiene el perfil actual."""
-    settings = load_settings()
+    settings = read_settings()
     return settings['current_profile']
 
 def get_profiles():
-    """Obtiene todos los perfiles."""
-    settings = load_settings()
-    return settings['profiles']
+    """Obtiene todos los perfiles (copia: se puede modificar)."""
+    settings = read_settings()
+    return copy.deepcopy(settings['profiles'])
 
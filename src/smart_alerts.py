@@ -74,6 +74,21 @@ class SmartAlerts:
         
         return None
     
+    def get_risk_alert(self, app=None):
+        """Alerta si el modelo de riesgo predice una hora crítica (consulta O(1))."""
+        from src.ml_analyzer import predict_distraction_risk
+        
+        level, score = predict_distraction_risk(app)
+        if score >= 75:
+            return {
+                "type": "high_risk",
+                "message": "🔥 Riesgo de distracción {0} ({1}/100). ¡Mantén el foco!".format(level, score),
+                "severity": "high",
+                "action": "start_zen_mode"
+            }
+        
+        return None
+    
     def get_daily_summary_alert(self, stats):
         """Resumen diario con alertas."""
         return {
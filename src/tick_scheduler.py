@@ -0,0 +1,118 @@
+"""
+Planificador adaptativo de ticks para el monitor.
+Sondea rápido justo después de un cambio de foco o una detección y se
+aleja exponencialmente mientras no pasa nada, dentro de límites
+configurables por perfil.
+"""
+
+import threading
+
+DEFAULT_MIN_INTERVAL = 1
+DEFAULT_MAX_INTERVAL = 10
+DEFAULT_BACKOFF = 2
+
+
+class AdaptiveTickScheduler:
+    """Intervalo de sondeo con backoff exponencial y métricas de costo."""
+
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL, max_interval=DEFAULT_MAX_INTERVAL,
+                 backoff=DEFAULT_BACKOFF, is_active=None):
+        self._lock = threading.Lock()
+        self.is_active = is_active
+        # Última configuración leída de settings, sin normalizar
+        self._settings_config = None
+        self.configure(min_interval, max_interval, backoff)
+        self.ticks = 0
+        self.skipped = 0
+        self.last_cost = 0.0
+        self.avg_cost = 0.0
+        self.max_cost = 0.0
+
+    def configure(self, min_interval, max_interval, backoff=DEFAULT_BACKOFF):
+        """Fija los límites. Reinicia el intervalo al mínimo."""
+        min_interval = max(0.05, float(min_interval))
+        max_interval = max(min_interval, float(max_interval))
+        with self._lock:
+            self.min_interval = min_interval
+            self.max_interval = max_interval
+            self.backoff = max(1.0, float(backoff))
+            self.interval = min_interval
+
+    def configure_from_settings(self, settings):
+        """
+        Lee los límites de settings['profiles'][perfil]['polling'] o, si el
+        perfil no los define, de settings['polling']. Solo reconfigura (y
+        reinicia el intervalo) si los valores de settings cambiaron.
+        """
+        profile = settings.get('profiles', {}).get(settings.get('current_profile'), {})
+        polling = profile.get('polling') or settings.get('polling') or {}
+        config = (
+            polling.get('min_interval', DEFAULT_MIN_INTERVAL),
+            polling.get('max_interval', settings.get('check_interval', DEFAULT_MAX_INTERVAL)),
+            polling.get('backoff', DEFAULT_BACKOFF),
+        )
+        if config != self._settings_config:
+            self._settings_config = config
+            self.configure(*config)
+
+    def on_activity(self):
+        """Cambio de foco o detección: volver al intervalo mínimo."""
+        with self._lock:
+            self.interval = self.min_interval
+
+    def on_idle(self):
+        """Tick sin novedades: alejar el próximo sondeo."""
+        with self._lock:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+
+    def record_tick(self, cost, active):
+        """Registra el costo (segundos) de un tick y ajusta el intervalo."""
+        with self._lock:
+            self.ticks += 1
+            self.last_cost = cost
+            self.max_cost = max(self.max_cost, cost)
+            # Media móvil exponencial del costo
+            self.avg_cost = cost if self.ticks == 1 else self.avg_cost * 0.9 + cost * 0.1
+        if active:
+            self.on_activity()
+        else:
+            self.on_idle()
+
+    def record_work(self, cost, detected):
+        """Suma al último tick el costo del trabajo posterior (detección)."""
+        with self._lock:
+            self.last_cost += cost
+            self.max_cost = max(self.max_cost, self.last_cost)
+            self.avg_cost += cost * 0.1
+        if detected:
+            self.on_activity()
+
+    def should_run(self):
+        """False fuera del horario activo: el tick se salta."""
+        if self.is_active is None:
+            return True
+        try:
+            active = self.is_active()
+        except Exception as e:
+            print(f"[Error] No se pudo consultar el horario: {e}")
+            return True
+        if not active:
+            with self._lock:
+                self.skipped += 1
+                self.interval = self.max_interval
+        return active
+
+    def get_stats(self):
+        """Intervalo actual y costo de los ticks."""
+        with self._lock:
+            return {
+                'interval': round(self.interval, 3),
+                'min_interval': self.min_interval,
+                'max_interval': self.max_interval,
+                'backoff': self.backoff,
+                'ticks': self.ticks,
+                'skipped': self.skipped,
+                'last_cost_ms': round(self.last_cost * 1000, 3),
+                'avg_cost_ms': round(self.avg_cost * 1000, 3),
+                'max_cost_ms': round(self.max_cost * 1000, 3),
+            }
@@ -0,0 +1,168 @@
+"""
+Motor de límites de tiempo diario por app.
+Atribuye el tiempo en primer plano a la app con límite que tiene el foco
+y programa un único deadline para el instante en que se agota su
+presupuesto, en lugar de revisar cada segundo. El costo por tick no
+depende de cuántos límites haya configurados.
+"""
+
+import threading
+import time
+
+from src.app_matcher import get_matcher
+from src.settings_manager import read_settings, get_settings_version
+from src.usage_ledger import usage_ledger
+
+# Margen para no reprogramar por diferencias de redondeo del timer
+_TOLERANCE = 0.05
+
+
+class TimeLimitEngine:
+    """Contabiliza el foco y dispara `on_exhausted(app)` al agotarse el límite."""
+
+    def __init__(self, on_exhausted=None, ledger=usage_ledger, clock=time.monotonic):
+        self.on_exhausted = on_exhausted
+        self.ledger = ledger
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._cond = threading.Condition(self._lock)
+        self._app = None
+        self._limit = None
+        self._since = None
+        self._deadline = None
+        self._worker = None
+        self._limits_version = None
+        self._matcher = None
+        self.ticks = 0
+        self.enforced = 0
+
+    def _limits(self):
+        return read_settings().get('time_limits', {})
+
+    def _match(self, title, limits, version):
+        if not title or not limits:
+            return None
+        # El matcher solo se busca de nuevo cuando cambian los settings
+        if version != self._limits_version:
+            self._matcher = get_matcher(list(limits))
+            self._limits_version = version
+        return self._matcher.match(title.lower())
+
+    def _settle(self, now):
+        """Suma al registro el tiempo desde el último corte."""
+        if self._app is None:
+            return
+        elapsed = now - self._since
+        if elapsed > 0:
+            self.ledger.add(self._app, elapsed, self._limit)
+        self._since = now
+
+    def _cancel_timer(self):
+        self._deadline = None
+
+    def _arm(self, delay):
+        """Fija el deadline; un único hilo espera al más próximo."""
+        self._deadline = self.clock() + delay
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="guardian-time-limits", daemon=True)
+            self._worker.start()
+        self._cond.notify()
+
+    def _run(self):
+        with self._cond:
+            while True:
+                if self._deadline is None:
+                    self._cond.wait()
+                    continue
+                delay = self._deadline - self.clock()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                self._deadline = None
+                exhausted = self._expire()
+                if exhausted:
+                    # Avisar sin el lock: el cierre puede tardar
+                    self._cond.release()
+                    try:
+                        self._notify(exhausted)
+                    finally:
+                        self._cond.acquire()
+
+    def remaining(self, app_name, limit_seconds):
+        """Segundos que le quedan hoy a la app."""
+        return limit_seconds - self.ledger.get(app_name)
+
+    def observe(self, active_title):
+        """
+        Registra el título de la ventana activa (llamar en cada tick o
+        cambio de foco). Retorna la app con límite en foco, o None.
+        """
+        # La versión antes que los datos: un cambio en medio no deja el matcher viejo
+        version = get_settings_version()
+        limits = self._limits()
+        app = self._match(active_title, limits, version)
+        limit = limits[app]['minutes'] * 60 if app is not None else None
+        exhausted = None
+        with self._lock:
+            self.ticks += 1
+            now = self.clock()
+            self._settle(now)
+            if app == self._app and limit == self._limit:
+                return app
+
+            self._cancel_timer()
+            self._app, self._limit, self._since = app, limit, now
+            if app is None:
+                return None
+            remaining = self.remaining(app, limit)
+            if remaining <= _TOLERANCE:
+                exhausted = self._exhaust()
+            else:
+                self._arm(remaining)
+        if exhausted:
+            self._notify(exhausted)
+        return app
+
+    def _expire(self):
+        """Vence el deadline (con el lock tomado). Retorna la app agotada o None."""
+        if self._app is None:
+            return None
+        self._settle(self.clock())
+        remaining = self.remaining(self._app, self._limit)
+        if remaining > _TOLERANCE:
+            self._arm(remaining)
+            return None
+        return self._exhaust()
+
+    def _exhaust(self):
+        # Se olvida la app en foco: si sigue abierta, el próximo tick la
+        # vuelve a detectar y reintenta el cierre
+        app = self._app
+        self._deadline = None
+        self._app, self._limit, self._since = None, None, None
+        self.enforced += 1
+        return app
+
+    def _notify(self, app_name):
+        if self.on_exhausted is None:
+            return
+        try:
+            self.on_exhausted(app_name)
+        except Exception as e:
+            print(f"[Error] No se pudo aplicar el límite de {app_name}: {e}")
+
+    def pause(self):
+        """Deja de contar (p. ej. al detener el monitor o sin límites configurados)."""
+        self.observe(None)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'focused_app': self._app,
+                'remaining': round(self.remaining(self._app, self._limit), 1) if self._app else None,
+                'ticks': self.ticks,
+                'enforced': self.enforced,
+            }
+
+
+time_limit_engine = TimeLimitEngine()
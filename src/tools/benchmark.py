@@ -0,0 +1,980 @@
+#!/usr/bin/env python3
+"""
+Benchmarks de rendimiento de Guardian.
+Uso: python src/tools/benchmark.py matcher --windows 10000 --patterns 2000
+     python src/tools/benchmark.py --json hot-path > baseline.json
+     python src/tools/benchmark.py --baseline baseline.json hot-path
+"""
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import time
+import random
+import string
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.app_matcher import AppMatcher
+
+
+def _random_word(rng, min_len=4, max_len=12):
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(min_len, max_len)))
+
+
+def _scratch_dir(func):
+    """Corre el benchmark sobre datos temporales y luego vuelve al directorio actual."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        cwd = os.getcwd()
+        os.chdir(tempfile.mkdtemp(prefix="guardian-bench-"))
+        try:
+            return func(*args, **kwargs)
+        finally:
+            os.chdir(cwd)
+    return wrapper
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _naive_scan(titles, apps):
+    """Algoritmo original de find_blocked_apps (referencia)."""
+    found = []
+    for title in titles:
+        window_title = title.lower()
+        for app in apps:
+            app_name = app.lower().replace('.exe', '')
+            if app_name in window_title or app.lower() in window_title:
+                if window_title not in [b.lower() for b, _ in found]:
+                    found.append((title, app))
+    return found
+
+
+def _matcher_scan(matcher, titles):
+    found = []
+    seen = set()
+    for title in titles:
+        window_title = title.lower()
+        if window_title in seen:
+            continue
+        app = matcher.match(window_title)
+        if app is not None:
+            seen.add(window_title)
+            found.append((title, app))
+    return found
+
+
+def bench_matcher(windows=10000, patterns=2000, seed=42, naive_limit=500):
+    """Compara el matcher compilado contra el escaneo lineal original."""
+    rng = random.Random(seed)
+    apps = [f"{_random_word(rng)}.exe" for _ in range(patterns)]
+    titles = []
+    for _ in range(windows):
+        words = [_random_word(rng) for _ in range(rng.randint(2, 6))]
+        if rng.random() < 0.2:
+            words.insert(rng.randrange(len(words) + 1), apps[rng.randrange(patterns)][:-4])
+        titles.append(' '.join(words).title())
+
+    matcher, build_time = _timed(AppMatcher, apps)
+    found, match_time = _timed(_matcher_scan, matcher, titles)
+
+    # El escaneo original es O(ventanas x apps): se mide sobre una muestra
+    sample = titles[:naive_limit]
+    naive_found, naive_time = _timed(_naive_scan, sample, apps)
+    if naive_found != _matcher_scan(matcher, sample):
+        raise AssertionError("El matcher no coincide con el escaneo original")
+
+    naive_projected = naive_time * windows / max(len(sample), 1)
+    return {
+        'windows': windows,
+        'patterns': patterns,
+        'matches': len(found),
+        'build_ms': round(build_time * 1000, 2),
+        'match_ms': round(match_time * 1000, 2),
+        'naive_ms_projected': round(naive_projected * 1000, 2),
+        'speedup': round(naive_projected / match_time, 1) if match_time else None,
+    }
+
+
+def bench_process_table(processes=5000, names=9, rounds=100, seed=42):
+    """
+    Compara búsquedas sobre un snapshot indexado contra recorrer la tabla
+    de procesos completa por cada nombre (algoritmo original).
+    """
+    from src.process_table import ProcessTable
+
+    rng = random.Random(seed)
+    table = [(f"{_random_word(rng)}.exe", pid) for pid in range(1, processes + 1)]
+    targets = [name for name, _ in rng.sample(table, names)]
+
+    def naive_lookup():
+        matches = 0
+        for target in targets:
+            for name, _ in table:
+                if name and name.lower() == target.lower():
+                    matches += 1
+        return matches
+
+    def indexed_lookup():
+        snapshot = service.refresh()
+        return sum(len(snapshot.pids_for(target)) for target in targets)
+
+    service = ProcessTable(source=lambda: iter(table))
+    naive_matches, naive_time = _timed(lambda: [naive_lookup() for _ in range(rounds)])
+    indexed_matches, indexed_time = _timed(lambda: [indexed_lookup() for _ in range(rounds)])
+    if naive_matches != indexed_matches:
+        raise AssertionError("El índice no coincide con el recorrido completo")
+
+    snapshot = service.refresh()
+    _, lookup_time = _timed(lambda: [snapshot.pids_for(t) for t in targets for _ in range(rounds)])
+
+    # Ruta de cierre (kill_process_by_name): nombres contenidos en el del proceso
+    stems = [target[:-len(".exe")] for target in targets]
+
+    def naive_containing():
+        return {stem: [pid for name, pid in table if stem.lower() in name.lower()] for stem in stems}
+
+    def snapshot_containing():
+        # Sin el cache de pids_containing: se mide la búsqueda, no el cache
+        snapshot._contains_cache.clear()
+        return snapshot.pids_containing(stems)
+
+    naive_found, naive_contains_time = _timed(lambda: [naive_containing() for _ in range(rounds)])
+    found, contains_time = _timed(lambda: [snapshot_containing() for _ in range(rounds)])
+    if naive_found[-1] != found[-1]:
+        raise AssertionError("pids_containing no coincide con el recorrido completo")
+    return {
+        'processes': processes,
+        'names': names,
+        'naive_ms_per_round': round(naive_time * 1000 / rounds, 3),
+        'snapshot_ms_per_round': round(indexed_time * 1000 / rounds, 3),
+        'lookup_us': round(lookup_time * 1e6 / (rounds * names), 3),
+        'speedup': round(naive_time / indexed_time, 1) if indexed_time else None,
+        'naive_contains_ms_per_round': round(naive_contains_time * 1000 / rounds, 3),
+        'snapshot_contains_ms_per_round': round(contains_time * 1000 / rounds, 3),
+    }
+
+
+def bench_analytics(events=1000000, apps=200, parse=100000, seed=42):
+    """
+    Histogramas de ml_analyzer sobre arrays int64 ya cargados, más el
+    costo de convertir `parse` timestamps ISO a arrays (limpios y con un 1%
+    de entradas inválidas u offsets). `under_50ms` mide solo el cálculo de
+    los histogramas; la conversión se reporta aparte en parse_*_ms.
+    """
+    import numpy as np
+    from src.ml_analyzer import DistractionAnalytics
+
+    rng = np.random.default_rng(seed)
+    now = int(time.time())
+    epochs = rng.integers(now - 365 * 86400, now, size=events, dtype=np.int64)
+    codes = rng.integers(0, apps, size=events, dtype=np.int64)
+    app_names = [f"app{i}.exe" for i in range(apps)]
+
+    engine = DistractionAnalytics(journal=None)
+    _, compute_time = _timed(engine.compute, epochs, codes, app_names)
+
+    sample = [
+        {'app': app_names[c], 'timestamp': str(np.datetime64(int(e), 's'))}
+        for e, c in zip(epochs[:parse].tolist(), codes[:parse].tolist())
+    ]
+    _, load_time = _timed(engine.load_arrays, sample)
+    dirty = [dict(block) for block in sample]
+    for index in range(0, parse, 100):
+        dirty[index]['timestamp'] = "" if index % 200 else dirty[index]['timestamp'] + "+02:00"
+    _, dirty_time = _timed(engine.load_arrays, dirty)
+    return {
+        'events': events,
+        'compute_ms': round(compute_time * 1000, 2),
+        'parse_events': parse,
+        'parse_ms': round(load_time * 1000, 2),
+        'parse_dirty_ms': round(dirty_time * 1000, 2),
+        'under_50ms': compute_time < 0.05,
+    }
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+@_scratch_dir
+def bench_api(dashboards=20, duration=5.0, poll_interval=0.05, writes_per_sec=5, seed=42):
+    """
+    Prueba de carga de la API local: `dashboards` clientes sondean las tres
+    rutas con If-None-Match mientras se registran bloqueos de fondo.
+    Corre sobre datos temporales en un directorio aparte.
+    """
+    import http.client
+    import threading
+
+    from src.api_server import ApiServer
+    from src.settings_manager import log_block_event
+
+    rng = random.Random(seed)
+    apps = [f"{_random_word(rng)}.exe" for _ in range(20)]
+    for _ in range(500):
+        log_block_event(rng.choice(apps))
+
+    server = ApiServer(port=0)
+    server.start()
+    stop = threading.Event()
+    lock = threading.Lock()
+    latencies = []
+    statuses = {}
+
+    def dashboard():
+        conn = http.client.HTTPConnection(server.host, server.port, timeout=10)
+        etags = {}
+        while not stop.is_set():
+            for path in ('/api/status', '/api/stats', '/api/stats/daily'):
+                headers = {'If-None-Match': etags[path]} if path in etags else {}
+                start = time.perf_counter()
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                elapsed = time.perf_counter() - start
+                etags[path] = response.getheader('ETag', etags.get(path))
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[response.status] = statuses.get(response.status, 0) + 1
+            stop.wait(poll_interval)
+        conn.close()
+
+    def writer():
+        while not stop.wait(1.0 / writes_per_sec):
+            log_block_event(rng.choice(apps))
+
+    threads = [threading.Thread(target=dashboard) for _ in range(dashboards)]
+    if writes_per_sec:
+        threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    server.stop()
+
+    return {
+        'dashboards': dashboards,
+        'requests': len(latencies),
+        'rps': round(len(latencies) / duration, 1),
+        'status_200': statuses.get(200, 0),
+        'status_304': statuses.get(304, 0),
+        'p50_ms': round(_percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(_percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(_percentile(latencies, 99) * 1000, 3),
+    }
+
+
+@_scratch_dir
+def bench_stream(subscribers=50, events=50, gap=0.05, seed=42):
+    """
+    Latencia de entrega del stream SSE: se registran `events` bloqueos y
+    se mide cuánto tarda cada suscriptor en recibir el delta correspondiente.
+    """
+    import http.client
+    import json
+    import threading
+
+    from src.api_server import ApiServer
+    from src.settings_manager import log_block_event
+
+    rng = random.Random(seed)
+    server = ApiServer(port=0)
+    server.start()
+    sent = {}
+    latencies = []
+    lock = threading.Lock()
+    ready = threading.Barrier(subscribers + 1)
+
+    def subscriber():
+        conn = http.client.HTTPConnection(server.host, server.port, timeout=30)
+        conn.request('GET', '/api/stream')
+        response = conn.getresponse()
+        kind = None
+        while True:
+            line = response.fp.readline().decode('utf-8').rstrip('\n')
+            if line.startswith('event: '):
+                kind = line[len('event: '):]
+            elif line.startswith('data: '):
+                data = json.loads(line[len('data: '):])
+                if kind == 'snapshot':
+                    ready.wait()
+                elif kind == 'blocks' and 'total_blocks' in data:
+                    received = time.perf_counter()
+                    with lock:
+                        latencies.append(received - sent[data['total_blocks']])
+                    if data['total_blocks'] >= events:
+                        break
+        conn.close()
+
+    threads = [threading.Thread(target=subscriber) for _ in range(subscribers)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    for i in range(1, events + 1):
+        sent[i] = time.perf_counter()
+        log_block_event(f"app{rng.randrange(10)}.exe")
+        time.sleep(gap)
+    for thread in threads:
+        thread.join()
+    checks = server.publisher.checks
+    server.stop()
+
+    return {
+        'subscribers': subscribers,
+        'events': events,
+        'deliveries': len(latencies),
+        'publisher_checks': checks,
+        'p50_ms': round(_percentile(latencies, 50) * 1000, 3),
+        'p99_ms': round(_percentile(latencies, 99) * 1000, 3),
+        'max_ms': round(max(latencies) * 1000, 3),
+    }
+
+
+@_scratch_dir
+def bench_notifications(blocks=20, fail_first=2, rate_limit_every=5, delay=0.05, digest_window=1.0):
+    """
+    Despachador de notificaciones contra el stub local: una ráfaga de
+    bloqueos debe salir como un resumen por destino, sin que encolar espere
+    a la red, y sobrevivir fallas 500 y respuestas 429.
+    """
+    from src.tools.notification_stub import NotificationStub
+    from src.notifications import NotificationDispatcher
+    from src.settings_manager import load_settings, save_settings
+
+    stub = NotificationStub(fail_first=fail_first, rate_limit_every=rate_limit_every, delay=delay).start()
+    settings = load_settings()
+    settings['notifications'] = {'telegram': stub.telegram_config(), 'discord': stub.discord_config()}
+    save_settings(settings)
+
+    dispatcher = NotificationDispatcher(digest_window=digest_window, backoff=0.1,
+                                        min_interval={'telegram': 0.1, 'discord': 0.1})
+    enqueue_times = []
+    for i in range(blocks):
+        _, elapsed = _timed(dispatcher.notify_block, f"app{i % 3}.exe")
+        enqueue_times.append(elapsed)
+    dispatcher.notify("Alerta inmediata")
+    start = time.perf_counter()
+    dispatcher.stop(timeout=30)
+    drain_time = time.perf_counter() - start
+    stub.stop()
+
+    stats = dispatcher.get_stats()
+    return {
+        'blocks': blocks,
+        'http_attempts': stub.attempts,
+        'messages_delivered': len(stub.received),
+        'sent': stats['sent'],
+        'retries': stats['retries'],
+        'failed': stats['failed'],
+        'coalesced': stats['coalesced'],
+        'enqueue_us_max': round(max(enqueue_times) * 1e6, 1),
+        'enqueue_us_avg': round(sum(enqueue_times) / len(enqueue_times) * 1e6, 1),
+        'drain_s': round(drain_time, 3),
+    }
+
+
+@_scratch_dir
+def bench_time_limits(limits=(10, 100, 1000), ticks=20000, seed=42):
+    """
+    Costo por tick del motor de límites de tiempo según cuántos límites
+    haya configurados: debe mantenerse constante.
+    """
+    from src.settings_manager import load_settings, save_settings
+    from src.time_limits import TimeLimitEngine
+    from src.usage_ledger import UsageLedger
+
+    rng = random.Random(seed)
+    result = {'ticks': ticks}
+    for count in limits:
+        apps = [f"{_random_word(rng)}.exe" for _ in range(count)]
+        settings = load_settings()
+        settings['time_limits'] = {app: {'minutes': 600} for app in apps}
+        save_settings(settings)
+        titles = [f"{apps[rng.randrange(count)][:-4]} - Ventana" if rng.random() < 0.5 else "Editor"
+                  for _ in range(64)]
+
+        engine = TimeLimitEngine(ledger=UsageLedger(f"usage_{count}.json", flush_interval=3600))
+        engine.observe(titles[0])
+        _, elapsed = _timed(lambda: [engine.observe(titles[i % 64]) for i in range(ticks)])
+        engine.pause()
+        result[f'us_per_tick_{count}'] = round(elapsed * 1e6 / ticks, 2)
+    return result
+
+
+@_scratch_dir
+def bench_event_store(years=3, per_day=200, sessions_per_day=4, apps=50, seed=42):
+    """
+    Consultas por rango sobre años de historial: journal JSON contra la
+    base SQLite indexada (un día, un mes y las sesiones de una semana).
+    """
+    from datetime import datetime, timedelta
+    from src.block_journal import BlockJournal
+    from src.event_store import SqliteEventStore
+    from src.session_tracker import SessionTracker
+
+    rng = random.Random(seed)
+    app_names = [f"app{i}.exe" for i in range(apps)]
+    today = datetime.now().replace(microsecond=0)
+    blocks, sessions = [], []
+    for d in range(years * 365, -1, -1):
+        day = today - timedelta(days=d)
+        for _ in range(per_day):
+            moment = day.replace(hour=rng.randrange(24), minute=rng.randrange(60))
+            blocks.append({'app': rng.choice(app_names), 'timestamp': moment.isoformat()})
+        for _ in range(sessions_per_day):
+            start = day.replace(hour=rng.randrange(8, 20))
+            sessions.append({'type': 'work', 'start': start.isoformat(),
+                             'end': (start + timedelta(minutes=50)).isoformat(), 'blocks': 0})
+    blocks.sort(key=lambda b: b['timestamp'])
+
+    journal = BlockJournal("blocks.jsonl", "blocks")
+    journal.import_blocks(blocks)
+    store = SqliteEventStore("events.db")
+    _, import_time = _timed(store.import_blocks, blocks)
+    store.import_sessions('tracker', sessions)
+
+    day = today.strftime("%Y-%m-%d")
+    month_start = (today - timedelta(days=30)).strftime("%Y-%m-%d")
+    json_tracker = SessionTracker("sessions.json", store=None)
+    json_tracker.sessions.extend(sessions)
+    sqlite_tracker = SessionTracker("unused.json", store=store)
+
+    def scan_day():
+        return [b for b in journal.read_blocks() if b['timestamp'].startswith(day)]
+
+    _, json_day = _timed(scan_day)
+    _, json_month = _timed(journal.read_blocks, month_start)
+    _, json_sessions = _timed(json_tracker.get_session_stats, 7)
+    _, sqlite_day = _timed(store.get_day, day)
+    _, sqlite_month = _timed(store.read_blocks, month_start)
+    _, sqlite_sessions = _timed(sqlite_tracker.get_session_stats, 7)
+    store.close()
+    return {
+        'events': len(blocks),
+        'sessions': len(sessions),
+        'sqlite_import_s': round(import_time, 2),
+        'json_full_scan_day_ms': round(json_day * 1000, 2),
+        'json_segments_month_ms': round(json_month * 1000, 2),
+        'json_sessions_7d_ms': round(json_sessions * 1000, 2),
+        'sqlite_day_ms': round(sqlite_day * 1000, 2),
+        'sqlite_month_ms': round(sqlite_month * 1000, 2),
+        'sqlite_sessions_7d_ms': round(sqlite_sessions * 1000, 2),
+    }
+
+
+class FakeWindow:
+    """Ventana con los atributos que lee window_detector de pygetwindow."""
+
+    def __init__(self, title, is_active=False, is_minimized=False):
+        self.title = title
+        self.isActive = is_active
+        self.isMinimized = is_minimized
+
+
+class FakeWindowBackend:
+    """Reemplazo de pygetwindow con una lista fija de ventanas."""
+
+    def __init__(self, windows):
+        self.windows = windows
+
+    def getAllWindows(self):
+        return self.windows
+
+    def getActiveWindow(self):
+        return next((w for w in self.windows if w.isActive), None)
+
+
+def _profile(func, repeat):
+    """
+    Tiempos por llamada (µs: media, p50, p99) y asignaciones de una
+    llamada más con tracemalloc (pico en KiB y bloques que quedan vivos).
+    """
+    import tracemalloc
+
+    func()  # calentar caches
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1e6)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(max(0, stat.count_diff) for stat in after.compare_to(before, 'lineno'))
+    return {
+        'us': round(sum(times) / len(times), 2),
+        'p50_us': round(_percentile(times, 50), 2),
+        'p99_us': round(_percentile(times, 99), 2),
+        'peak_kib': round(peak / 1024, 1),
+        'retained_blocks': retained,
+    }
+
+
+@contextlib.contextmanager
+def _storage_backend(backend):
+    """
+    Crea el journal y los agregados del backend pedido en el directorio
+    actual y los pone en lugar de los de settings_manager (y de los módulos
+    que los importaron por nombre). GUARDIAN_STORAGE solo se lee al importar
+    event_store, así que cambiarlo aquí no tendría efecto.
+    """
+    from src import ml_analyzer, reports, settings_manager
+    from src.block_aggregates import BlockAggregates
+    from src.block_journal import BlockJournal
+    from src.event_store import EVENTS_DB_FILE, SqliteEventStore
+
+    if backend == 'sqlite':
+        journal = aggregates = SqliteEventStore(EVENTS_DB_FILE)
+    else:
+        journal = BlockJournal(settings_manager.BLOCKS_JOURNAL_FILE, settings_manager.BLOCKS_SEGMENTS_DIR)
+        aggregates = BlockAggregates(settings_manager.AGGREGATES_DIR)
+    targets = [
+        (settings_manager, 'block_journal', journal),
+        (settings_manager, 'block_aggregates', aggregates),
+        (settings_manager, '_legacy_stats_checked', False),
+        (reports, 'block_journal', journal),
+        (ml_analyzer, 'block_journal', journal),
+        (ml_analyzer.analytics, 'journal', journal),
+    ]
+    saved = [(owner, name, getattr(owner, name)) for owner, name, _ in targets]
+    for owner, name, value in targets:
+        setattr(owner, name, value)
+    try:
+        yield journal
+    finally:
+        for owner, name, value in saved:
+            setattr(owner, name, value)
+        if backend == 'sqlite':
+            journal.close()
+
+
+@_scratch_dir
+def bench_hot_path(windows=200, patterns=120, history=100000, repeat=200, backend='json', seed=42):
+    """
+    Camino detección -> cierre del tick del monitor con ventanas y procesos
+    falsos: find_blocked_apps, check_blocked_apps, la búsqueda de PIDs del
+    cierre, log_block_event y get_monthly_stats con `history` bloqueos.
+    """
+    rng = random.Random(seed)
+    apps = [f"{_random_word(rng)}.exe" for _ in range(patterns)]
+    fake_windows = []
+    for i in range(windows):
+        if rng.random() < 0.05:
+            title = f"{rng.choice(apps)[:-4]} - {_random_word(rng)}"
+        else:
+            title = f"{_random_word(rng)} {_random_word(rng)} - Editor"
+        fake_windows.append(FakeWindow(title, is_active=(i == 0)))
+    fake_processes = [(rng.choice(apps) if rng.random() < 0.05 else f"{_random_word(rng)}.exe", 10**7 + i)
+                      for i in range(windows * 2)]
+
+    with _storage_backend(backend) as block_journal:
+        return _run_hot_path(block_journal, apps, fake_windows, fake_processes, history, repeat, rng,
+                             {'windows': windows, 'patterns': patterns, 'history': history,
+                              'backend': backend, 'store': type(block_journal).__name__})
+
+
+def _run_hot_path(block_journal, apps, fake_windows, fake_processes, history, repeat, rng, result):
+    """Carga el historial en `block_journal` y mide cada etapa (agrega a `result`)."""
+    from datetime import datetime, timedelta
+
+    from src import window_detector
+    from src.process_table import process_table
+    from src.settings_manager import load_settings, log_block_event, rebuild_block_aggregates, save_settings
+    from src.enforcement import enforcer
+    from src.reports import get_monthly_stats
+    from src.utils import check_blocked_apps
+
+    now = datetime.now()
+    block_journal.import_blocks([
+        {'app': rng.choice(apps),
+         'timestamp': (now - timedelta(seconds=rng.randrange(365 * 86400))).isoformat()}
+        for _ in range(history)])
+    rebuild_block_aggregates()
+    # El detector usa las apps bloqueadas del perfil actual
+    settings = load_settings()
+    settings['profiles'][settings['current_profile']]['blocked_apps'] = apps
+    save_settings(settings)
+
+    saved = (window_detector.gw, process_table.source, process_table.max_age)
+    window_detector.gw = FakeWindowBackend(fake_windows)
+    process_table.source = lambda: iter(fake_processes)
+    process_table.max_age = 0
+    stages = {
+        'find_blocked_apps': lambda: window_detector.find_blocked_apps(),
+        # cuenta regresiva larga: se programa el cierre pero no se ejecuta
+        'check_blocked_apps': lambda: check_blocked_apps(None, countdown=3600),
+        'enforcement_lookup': lambda: process_table.snapshot().pids_containing(apps[:5]),
+        'log_block_event': lambda: log_block_event(rng.choice(apps)),
+        'get_monthly_stats': get_monthly_stats,
+    }
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for name, func in stages.items():
+                for key, value in _profile(func, repeat).items():
+                    result[f"{name}_{key}"] = value
+    finally:
+        window_detector.gw, process_table.source, process_table.max_age = saved
+        for app in list(enforcer.pending_apps()):
+            enforcer.cancel(app)
+    return result
+
+
+def bench_tracing(spans=1000000):
+    """Costo por span del tracer apagado, encendido y con archivo de traza."""
+    from src.tracing import Tracer
+
+    def run(tracer):
+        start = time.perf_counter()
+        for _ in range(spans):
+            with tracer.span("bench"):
+                pass
+        return (time.perf_counter() - start) * 1e9 / spans
+
+    def baseline():
+        start = time.perf_counter()
+        for _ in range(spans):
+            pass
+        return (time.perf_counter() - start) * 1e9 / spans
+
+    loop_ns = baseline()
+    tracer = Tracer()
+    disabled_ns = run(tracer)
+    tracer.configure(True)
+    enabled_ns = run(tracer)
+    trace_path = os.path.join(tempfile.mkdtemp(prefix="guardian-bench-"), "trace.json")
+    tracer.configure(True, trace_path)
+    file_ns = run(tracer)
+    tracer.configure(False)
+    trace_kib = os.path.getsize(trace_path) / 1024
+    os.remove(trace_path)
+    return {
+        'spans': spans,
+        'disabled_ns': round(disabled_ns - loop_ns, 1),
+        'enabled_ns': round(enabled_ns - loop_ns, 1),
+        'trace_file_ns': round(file_ns - loop_ns, 1),
+        'trace_file_kib': round(trace_kib, 1),
+    }
+
+
+def bench_ui_bus(threads=4, messages=50000, interval_ms=16):
+    """
+    Ráfaga de avisos desde varios hilos mientras el "loop de Tk" (este
+    hilo) vacía la cola cada `interval_ms`: costo de post() y de cada frame.
+    """
+    import threading
+    from src.ui_bus import UIMessageBus
+
+    bus = UIMessageBus(interval_ms=interval_ms)
+    lines = []
+
+    def render(items):
+        # Igual que main._render_status: un solo insert por lote y recorte
+        lines.extend(f"[{timestamp}] {message}\n" for timestamp, message in items)
+        del lines[:-500]
+
+    bus.on('status', render)
+
+    def flood(writer):
+        for i in range(messages):
+            bus.post('status', ("12:00:00", f"Aplicación bloqueada detectada: app{writer}-{i}"))
+
+    writers = [threading.Thread(target=flood, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for writer in writers:
+        writer.start()
+    frames, max_pending = [], 0
+    while any(writer.is_alive() for writer in writers) or bus.pending:
+        max_pending = max(max_pending, bus.pending)
+        frame_start = time.perf_counter()
+        bus.drain()
+        frames.append((time.perf_counter() - frame_start) * 1000)
+        time.sleep(interval_ms / 1000)
+    elapsed = time.perf_counter() - start
+    stats = bus.get_stats()
+    return {
+        'messages': threads * messages,
+        'post_us': round(elapsed * 1e6 / (threads * messages), 2),
+        'frames': len(frames),
+        'frame_p50_ms': round(_percentile(frames, 50), 3),
+        'frame_max_ms': round(max(frames), 3),
+        'max_pending': max_pending,
+        'dropped': stats['dropped'],
+        'log_lines': len(lines),
+    }
+
+
+def bench_activity_log(messages=1000000, distinct=2000, rows=20, seed=42):
+    """
+    Registro de actividad con mensajes muy repetidos: costo de add(), de
+    obtener las filas visibles y memoria retenida (el buffer está acotado).
+    """
+    import itertools
+    import tracemalloc
+    from src.activity_log import ActivityLog
+
+    rng = random.Random(seed)
+    # Como el aviso de background: pocos mensajes distintos, muchas repeticiones
+    texts = [f"Aplicación bloqueada detectada (background): ventana {i}" for i in range(distinct)]
+    stream = [texts[min(int(rng.expovariate(0.01)), distinct - 1)] for _ in range(messages)]
+    log = ActivityLog()
+    start = time.perf_counter()
+    for text in stream:
+        log.add(text, "12:00:00")
+    add_ns = (time.perf_counter() - start) * 1e9 / messages
+    tracemalloc.start()
+    for text in itertools.islice(stream, messages // 10):
+        log.add(text, "12:00:00")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(1000):
+        log.lines(len(log) - rows, len(log))
+    render_us = (time.perf_counter() - start) * 1e6 / 1000
+    stats = log.get_stats()
+    return {
+        'messages': messages,
+        'lines': stats['lines'],
+        'evicted': stats['evicted'],
+        'add_ns': round(add_ns, 1),
+        'visible_rows_us': round(render_us, 1),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+# Dependencias que el arranque sin interfaz no debería cargar
+HEAVY_MODULES = ('tkinter', 'psutil', 'requests', 'numpy', 'flask', 'reportlab', 'playsound')
+
+
+def _parse_importtime(stderr):
+    """Módulos de primer nivel de -X importtime: [(acumulado_us, nombre)] y todos los nombres."""
+    top_level, names = [], set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line.split("|")
+        if len(parts) != 3:
+            continue
+        name = parts[2][1:]
+        names.add(name.strip())
+        if not name.startswith(" "):
+            top_level.append((int(parts[1]), name))
+    return top_level, names
+
+
+def bench_startup(runs=5, target_ms=300, gui=True):
+    """
+    Tiempo hasta el primer tick de `main.py --monitor-only` (proceso
+    completo, con el arranque del intérprete) y desglose de -X importtime.
+    Con `gui`, también el costo de importar main.py con la interfaz.
+    """
+    import subprocess
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    main_py = os.path.join(root, "main.py")
+    workdir = tempfile.mkdtemp(prefix="guardian-bench-")
+    command = [sys.executable, main_py, "--monitor-only", "--ticks", "1", "--quiet"]
+
+    subprocess.run(command, cwd=workdir, capture_output=True)  # calentar caches de disco y .pyc
+    wall = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=workdir, capture_output=True, check=True)
+        wall.append((time.perf_counter() - start) * 1000)
+    traced = subprocess.run([sys.executable, "-X", "importtime"] + command[1:],
+                            cwd=workdir, capture_output=True, text=True, check=True)
+    top_level, names = _parse_importtime(traced.stderr)
+    start = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run([sys.executable, "-c", "pass"], cwd=workdir, capture_output=True)
+    interpreter_ms = (time.perf_counter() - start) * 1000 / runs
+
+    first_tick_ms = _percentile(wall, 50)
+    result = {
+        'runs': runs,
+        'interpreter_ms': round(interpreter_ms, 1),
+        'first_tick_ms': round(first_tick_ms, 1),
+        'first_tick_max_ms': round(max(wall), 1),
+        'target_ms': target_ms,
+        'within_target': first_tick_ms <= target_ms,
+        'import_ms': round(sum(us for us, _ in top_level) / 1000, 1),
+        'heaviest_imports': ", ".join(f"{name} {us / 1000:.1f}ms"
+                                      for us, name in sorted(top_level, reverse=True)[:5]),
+        'heavy_loaded': ", ".join(m for m in HEAVY_MODULES if m in names) or "ninguno",
+    }
+    if gui:
+        code = f"import sys; sys.argv = ['main.py']; sys.path.insert(0, {root!r}); import main"
+        gui_run = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                                 cwd=workdir, capture_output=True, text=True)
+        if gui_run.returncode == 0:
+            gui_top, gui_names = _parse_importtime(gui_run.stderr)
+            result['gui_import_ms'] = round(sum(us for us, _ in gui_top) / 1000, 1)
+            result['gui_heavy_loaded'] = ", ".join(m for m in HEAVY_MODULES if m in gui_names) or "ninguno"
+    return result
+
+
+def _add_matcher_args(parser):
+    parser.add_argument('--windows', type=int, default=10000)
+    parser.add_argument('--patterns', type=int, default=2000)
+
+
+def _add_process_table_args(parser):
+    parser.add_argument('--processes', type=int, default=5000)
+    parser.add_argument('--names', type=int, default=9)
+    parser.add_argument('--rounds', type=int, default=100)
+
+
+def _add_analytics_args(parser):
+    parser.add_argument('--events', type=int, default=1000000)
+    parser.add_argument('--apps', type=int, default=200)
+    parser.add_argument('--parse', type=int, default=100000)
+
+
+def _add_api_args(parser):
+    parser.add_argument('--dashboards', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--poll-interval', type=float, default=0.05)
+    parser.add_argument('--writes-per-sec', type=float, default=5)
+
+
+def _add_stream_args(parser):
+    parser.add_argument('--subscribers', type=int, default=50)
+    parser.add_argument('--events', type=int, default=50)
+    parser.add_argument('--gap', type=float, default=0.05)
+
+
+def _add_notifications_args(parser):
+    parser.add_argument('--blocks', type=int, default=20)
+    parser.add_argument('--fail-first', type=int, default=2)
+    parser.add_argument('--rate-limit-every', type=int, default=5)
+    parser.add_argument('--delay', type=float, default=0.05)
+    parser.add_argument('--digest-window', type=float, default=1.0)
+
+
+def _add_time_limits_args(parser):
+    parser.add_argument('--limits', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--ticks', type=int, default=20000)
+
+
+def _add_event_store_args(parser):
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--per-day', type=int, default=200)
+    parser.add_argument('--sessions-per-day', type=int, default=4)
+    parser.add_argument('--apps', type=int, default=50)
+
+
+def _add_hot_path_args(parser):
+    parser.add_argument('--windows', type=int, default=200)
+    parser.add_argument('--patterns', type=int, default=120)
+    parser.add_argument('--history', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--backend', choices=['json', 'sqlite'], default='json')
+
+
+def _add_tracing_args(parser):
+    parser.add_argument('--spans', type=int, default=1000000)
+
+
+def _add_ui_bus_args(parser):
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--messages', type=int, default=50000)
+    parser.add_argument('--interval-ms', type=float, default=16)
+
+
+def _add_activity_log_args(parser):
+    parser.add_argument('--messages', type=int, default=1000000)
+    parser.add_argument('--distinct', type=int, default=2000)
+    parser.add_argument('--rows', type=int, default=20)
+
+
+def _add_startup_args(parser):
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--target-ms', type=float, default=300)
+    parser.add_argument('--no-gui', dest='gui', action='store_false')
+
+
+# nombre -> (función, configurador de argumentos)
+BENCHMARKS = {
+    'matcher': (bench_matcher, _add_matcher_args),
+    'process-table': (bench_process_table, _add_process_table_args),
+    'analytics': (bench_analytics, _add_analytics_args),
+    'api': (bench_api, _add_api_args),
+    'stream': (bench_stream, _add_stream_args),
+    'notifications': (bench_notifications, _add_notifications_args),
+    'time-limits': (bench_time_limits, _add_time_limits_args),
+    'event-store': (bench_event_store, _add_event_store_args),
+    'hot-path': (bench_hot_path, _add_hot_path_args),
+    'tracing': (bench_tracing, _add_tracing_args),
+    'startup': (bench_startup, _add_startup_args),
+    'ui-bus': (bench_ui_bus, _add_ui_bus_args),
+    'activity-log': (bench_activity_log, _add_activity_log_args),
+}
+
+
+def compare_to_baseline(result, baseline, tolerance=0.25):
+    """
+    Compara las métricas de tiempo (*_us, *_ms) con una corrida anterior.
+    Retorna [(clave, antes, ahora)] de las que empeoraron más que `tolerance`.
+    """
+    regressions = []
+    for key, value in result.items():
+        before = baseline.get(key)
+        if not key.endswith(('_us', '_ms')) or not isinstance(before, (int, float)):
+            continue
+        if isinstance(value, (int, float)) and before > 0 and value > before * (1 + tolerance):
+            regressions.append((key, before, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de Guardian")
+    parser.add_argument('--json', action='store_true', help="salida en JSON")
+    parser.add_argument('--baseline', help="JSON de una corrida anterior (--json) para comparar")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="empeoramiento admitido respecto al baseline (0.25 = 25%%)")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    for name, (_, add_args) in BENCHMARKS.items():
+        add_args(subparsers.add_parser(name))
+    args = vars(parser.parse_args(argv))
+    as_json = args.pop('json')
+    baseline_path = args.pop('baseline')
+    tolerance = args.pop('tolerance')
+
+    func = BENCHMARKS[args.pop('benchmark')][0]
+    result = func(**args)
+    if as_json:
+        print(json.dumps(result, indent=2))
+    else:
+        for key, value in result.items():
+            print(f"{key}: {value}")
+
+    if baseline_path:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            regressions = compare_to_baseline(result, json.load(f), tolerance)
+        for key, before, after in regressions:
+            print(f"[Regresión] {key}: {before} -> {after}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Migra el historial JSON (journal de bloqueos, guardian_stats.json antiguo
+y archivos de sesiones) a guardian_events.db. Una vez creada la base,
+Guardian pasa a usar el backend SQLite al iniciar.
+Uso: python src/tools/migrate_to_sqlite.py [--force]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.block_journal import BlockJournal
+from src.event_store import EVENTS_DB_FILE, SqliteEventStore
+from src.json_store import load_json
+from src.settings_manager import legacy_stats_batch_id
+
+# Los mismos archivos que usan settings_manager, SessionTracker y SessionManager
+STATS_FILE = "guardian_stats.json"
+BLOCKS_JOURNAL_FILE = "guardian_blocks.jsonl"
+BLOCKS_SEGMENTS_DIR = "guardian_blocks"
+SESSION_SOURCES = {
+    'tracker': "data/sessions_history.json",
+    'manager': "sessions.json",
+}
+
+
+def _json_blocks():
+    """Retorna (bloqueos del journal, bloqueos que aún estén en el stats antiguo)."""
+    blocks = BlockJournal(BLOCKS_JOURNAL_FILE, BLOCKS_SEGMENTS_DIR).read_blocks()
+    legacy = (load_json(STATS_FILE, {}) or {}).get('blocks') or []
+    return blocks, legacy
+
+
+def _time_queries(store):
+    """Tiempo (ms) de las consultas típicas de reportes sobre la base migrada."""
+    today = datetime.now()
+    month_start = (today - timedelta(days=30)).strftime("%Y-%m-%d")
+    timings = {}
+    for name, func in (
+        ('get_day', lambda: store.get_day(today.strftime("%Y-%m-%d"))),
+        ('read_blocks_30d', lambda: store.read_blocks(month_start)),
+        ('count_by_app_30d', lambda: store.count_by_app(month_start)),
+        ('sessions_7d', lambda: store.read_sessions(
+            'tracker', since=(today - timedelta(days=7)).isoformat())),
+    ):
+        start = time.perf_counter()
+        func()
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
+    return timings
+
+
+def migrate(db_path=EVENTS_DB_FILE, force=False):
+    """Crea la base con todo el historial JSON. Retorna los conteos migrados."""
+    if os.path.exists(db_path):
+        if not force:
+            raise FileExistsError(f"{db_path} ya existe (use --force para recrearla)")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+    store = SqliteEventStore(db_path)
+    blocks, legacy = _json_blocks()
+    # El stats antiguo se conserva: su lote queda registrado con el mismo id
+    # que usa import_legacy_stats() para que al iniciar no se importe de nuevo
+    counts = {'blocks': store.import_blocks(legacy, batch_id=legacy_stats_batch_id(legacy)) if legacy else 0}
+    counts['blocks'] += store.import_blocks(blocks)
+    for source, path in SESSION_SOURCES.items():
+        counts[f"sessions_{source}"] = store.import_sessions(source, load_json(path, []) or [])
+
+    # Verificación: lo leído de la base debe coincidir con el origen
+    if store.count('blocks') != counts['blocks']:
+        raise RuntimeError("La cantidad de bloqueos migrados no coincide")
+    counts['queries_ms'] = _time_queries(store)
+    store.close()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migra el historial JSON a SQLite")
+    parser.add_argument('--db', default=EVENTS_DB_FILE)
+    parser.add_argument('--force', action='store_true', help="recrear la base si ya existe")
+    args = parser.parse_args(argv)
+
+    try:
+        counts = migrate(args.db, args.force)
+    except (FileExistsError, RuntimeError) as e:
+        print(f"[Error] {e}")
+        return 1
+    print(f"Base creada: {args.db}")
+    print(f"  Bloqueos: {counts['blocks']}")
+    for source in SESSION_SOURCES:
+        print(f"  Sesiones ({source}): {counts[f'sessions_{source}']}")
+    print("  Consultas (ms): " + ", ".join(f"{k}={v}" for k, v in counts['queries_ms'].items()))
+    print("Los archivos JSON se conservan; GUARDIAN_STORAGE=json vuelve a usarlos.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP local que imita las APIs de Telegram y Discord.
+Registra cada POST y puede simular fallas, límites de tasa y latencia,
+para probar el despachador de notificaciones sin tocar la red.
+Uso: python src/tools/notification_stub.py --port 8099 --fail-first 2
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class NotificationStub:
+    """
+    Stub configurable:
+    - fail_first: las primeras N peticiones responden 500
+    - rate_limit_every: cada N-ésima petición responde 429 con retry_after
+    - delay: segundos de latencia por petición
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, fail_first=0, rate_limit_every=0,
+                 retry_after=0.2, delay=0.0):
+        self.fail_first = fail_first
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.delay = delay
+        self.received = []
+        self.attempts = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.host, self.port = self._server.server_address
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def _respond(self, path, payload):
+        """Decide la respuesta (status, cuerpo) y registra los envíos aceptados."""
+        with self._lock:
+            self.attempts += 1
+            attempt = self.attempts
+            if attempt <= self.fail_first:
+                return 500, {'ok': False}
+            if self.rate_limit_every and attempt % self.rate_limit_every == 0:
+                return 429, {'retry_after': self.retry_after,
+                             'parameters': {'retry_after': self.retry_after}}
+            self.received.append({'path': path, 'payload': payload, 'at': time.monotonic()})
+        if '/webhooks/' in path:
+            return 204, None
+        return 200, {'ok': True}
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b'null')
+                except ValueError:
+                    payload = None
+                if stub.delay:
+                    time.sleep(stub.delay)
+                status, body = stub._respond(self.path, payload)
+                data = b'' if body is None else json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def telegram_config(self):
+        """Config de Telegram que apunta a este stub."""
+        return {'enabled': True, 'bot_token': 'TEST', 'chat_id': '1', 'api_url': self.base_url}
+
+    def discord_config(self):
+        """Config de Discord que apunta a este stub."""
+        return {'enabled': True, 'webhook_url': f"{self.base_url}/api/webhooks/1/test"}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stub local de Telegram/Discord")
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--fail-first', type=int, default=0)
+    parser.add_argument('--rate-limit-every', type=int, default=0)
+    parser.add_argument('--delay', type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    stub = NotificationStub(port=args.port, fail_first=args.fail_first,
+                            rate_limit_every=args.rate_limit_every, delay=args.delay)
+    print(f"Stub escuchando en {stub.base_url}")
+    print(f"  Telegram api_url: {stub.base_url}")
+    print(f"  Discord webhook_url: {stub.discord_config()['webhook_url']}")
+    stub.start()
+    seen = 0
+    try:
+        while True:
+            time.sleep(0.5)
+            for request in stub.received[seen:]:
+                print(f"{request['path']}: {json.dumps(request['payload'], ensure_ascii=False)}")
+            seen = len(stub.received)
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
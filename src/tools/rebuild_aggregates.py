@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Reconstruye los agregados diarios y el modelo de riesgo desde el historial crudo.
+Uso: python src/tools/rebuild_aggregates.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.settings_manager import rebuild_block_aggregates
+
+
+def main():
+    days = rebuild_block_aggregates()
+    print(f"Agregados reconstruidos: {days} días")
+    return days
+
+
+if __name__ == "__main__":
+    main()
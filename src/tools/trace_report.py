@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tiempos por etapa del monitor (p50/p95/p99).
+Lee las métricas en vivo de la API local o un archivo de traza, y
+activa/desactiva la medición a través de los settings (el monitor la
+toma en el siguiente tick).
+Uso: python src/tools/trace_report.py --enable --trace-file guardian_trace.json
+     python src/tools/trace_report.py                  # desde http://127.0.0.1:5000
+     python src/tools/trace_report.py --file guardian_trace.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from urllib.request import urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.tracing import Tracer
+
+DEFAULT_URL = "http://127.0.0.1:5000/api/trace"
+
+
+def load_trace_file(path, window=None):
+    """Reconstruye las estadísticas desde un archivo Chrome Trace."""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read().strip().rstrip(',').rstrip(']').rstrip().rstrip(',')
+    events = json.loads(text + "]") if text.startswith('[') else []
+    tracer = Tracer(window=window or max(1, len(events)))
+    for event in events:
+        start = event['ts'] / 1e6
+        tracer.record(event['name'], start, start + event['dur'] / 1e6)
+    return tracer.get_stats()
+
+
+def fetch_stats(url=DEFAULT_URL, timeout=5):
+    with urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+def set_tracing(enabled, trace_file=None):
+    """Guarda settings['tracing']; el monitor lo aplica en su siguiente tick."""
+    from src.settings_manager import load_settings, save_settings
+
+    settings = load_settings()
+    settings['tracing'] = {'enabled': enabled, 'trace_file': trace_file}
+    return save_settings(settings)
+
+
+def format_stats(stats):
+    lines = [f"{'etapa':<28}{'n':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+    for name, stage in stats.get('stages', {}).items():
+        lines.append(f"{name:<28}{stage['count']:>8}{stage['p50_ms']:>10}{stage['p95_ms']:>10}"
+                     f"{stage['p99_ms']:>10}{stage['max_ms']:>10}")
+    if len(lines) == 1:
+        lines.append("(sin muestras: ¿está activada la medición?)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempos por etapa del monitor")
+    parser.add_argument('--url', default=DEFAULT_URL)
+    parser.add_argument('--file', help="leer un archivo de traza en lugar de la API")
+    parser.add_argument('--enable', action='store_true', help="activar la medición")
+    parser.add_argument('--disable', action='store_true', help="desactivar la medición")
+    parser.add_argument('--trace-file', help="con --enable: escribir cada span a este archivo")
+    parser.add_argument('--json', action='store_true', help="salida en JSON")
+    args = parser.parse_args(argv)
+
+    if args.enable or args.disable:
+        if not set_tracing(args.enable, args.trace_file if args.enable else None):
+            return 1
+        print("Medición " + ("activada" if args.enable else "desactivada"))
+        return 0
+
+    try:
+        stats = load_trace_file(args.file) if args.file else fetch_stats(args.url)
+    except Exception as e:
+        print(f"[Error] No se pudieron leer las métricas: {e}")
+        return 1
+    print(json.dumps(stats, indent=2) if args.json else format_stats(stats))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
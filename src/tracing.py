@@ -0,0 +1,174 @@
+"""
+Spans de medición para el camino caliente del monitor.
+Cada etapa (enumerar ventanas, leer settings, matching, recorrer procesos,
+cerrar apps) se mide con `tracer.span(nombre)` y alimenta una ventana
+móvil de duraciones de la que salen p50/p95/p99. Opcionalmente cada span
+se escribe a un archivo en formato Chrome Trace (chrome://tracing,
+Perfetto). Desactivado, `span()` retorna un contexto vacío compartido.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+
+DEFAULT_WINDOW = 1000
+
+
+class _NoopSpan:
+    """Contexto vacío: lo que cuesta un span con el tracer apagado."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'start')
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+def _percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Tracer:
+    """Ventanas móviles de duración por etapa y archivo de traza opcional."""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.enabled = False
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._counts = {}
+        self._trace_path = None
+        self._trace_file = None
+        self._origin = time.perf_counter()
+
+    def span(self, name):
+        """Contexto que mide la etapa `name` (no hace nada si está apagado)."""
+        if not self.enabled:
+            return _NOOP
+        return _Span(self, name)
+
+    def record(self, name, start, end):
+        """Registra una duración medida con time.perf_counter()."""
+        duration = end - start
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(duration)
+            self._counts[name] = self._counts.get(name, 0) + 1
+            if self._trace_file is not None:
+                self._write_event(name, start, duration)
+
+    def _write_event(self, name, start, duration):
+        event = {
+            'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+            'ts': round((start - self._origin) * 1e6, 1), 'dur': round(duration * 1e6, 1),
+        }
+        try:
+            self._trace_file.write(json.dumps(event, separators=(',', ':')) + ",\n")
+        except Exception as e:
+            print(f"[Error] No se pudo escribir la traza: {e}")
+            self._close_trace()
+
+    def _close_trace(self):
+        if self._trace_file is not None:
+            try:
+                self._trace_file.close()
+            except Exception:
+                pass
+        self._trace_file = None
+        self._trace_path = None
+
+    def configure(self, enabled, trace_file=None):
+        """Activa/desactiva la medición y el archivo de traza."""
+        with self._lock:
+            if trace_file != self._trace_path:
+                self._close_trace()
+                if enabled and trace_file:
+                    try:
+                        new_file = not os.path.exists(trace_file) or os.path.getsize(trace_file) == 0
+                        self._trace_file = open(trace_file, 'a', encoding='utf-8', buffering=64 * 1024)
+                        if new_file:
+                            # Formato de arreglo JSON; el "]" final es opcional
+                            self._trace_file.write("[\n")
+                        self._trace_path = trace_file
+                    except OSError as e:
+                        print(f"[Error] No se pudo abrir el archivo de traza: {e}")
+            if not enabled:
+                self._close_trace()
+            self.enabled = bool(enabled)
+
+    def configure_from_settings(self, settings):
+        """Lee settings['tracing'] = {'enabled': bool, 'trace_file': ruta}."""
+        tracing = settings.get('tracing')
+        if tracing is None:
+            # Sin la clave se respeta lo configurado (p. ej. GUARDIAN_TRACE)
+            return
+        enabled = bool(tracing.get('enabled', False))
+        trace_file = tracing.get('trace_file') or None
+        if enabled != self.enabled or (enabled and trace_file != self._trace_path):
+            self.configure(enabled, trace_file)
+
+    def flush(self):
+        with self._lock:
+            if self._trace_file is not None:
+                self._trace_file.flush()
+
+    def reset(self):
+        """Descarta las muestras acumuladas."""
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+    def get_stats(self):
+        """Por etapa: cantidad total, p50/p95/p99 y máximo (ms) de la ventana."""
+        with self._lock:
+            snapshot = {name: sorted(samples) for name, samples in self._samples.items()}
+            counts = dict(self._counts)
+            trace_path = self._trace_path
+        stages = {}
+        for name, ordered in sorted(snapshot.items()):
+            if not ordered:
+                continue
+            stages[name] = {
+                'count': counts.get(name, 0),
+                'p50_ms': round(_percentile(ordered, 50) * 1000, 3),
+                'p95_ms': round(_percentile(ordered, 95) * 1000, 3),
+                'p99_ms': round(_percentile(ordered, 99) * 1000, 3),
+                'max_ms': round(ordered[-1] * 1000, 3),
+            }
+        return {'enabled': self.enabled, 'window': self.window,
+                'trace_file': trace_path, 'stages': stages}
+
+
+tracer = Tracer()
+atexit.register(tracer.flush)
+
+if os.environ.get("GUARDIAN_TRACE"):
+    # GUARDIAN_TRACE=1 activa la medición; cualquier otro valor es la ruta de la traza
+    _value = os.environ["GUARDIAN_TRACE"]
+    tracer.configure(True, None if _value == "1" else _value)
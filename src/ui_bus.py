@@ -0,0 +1,118 @@
+"""
+Cola de mensajes hacia la interfaz.
+tkinter no es seguro entre hilos: el monitor, los cierres programados y
+las notificaciones solo encolan con post(), y el loop de Tk vacía la
+cola por lotes con after(). Cada lote agrupa los mensajes por tipo, así
+una ráfaga de avisos se dibuja en una sola actualización del widget.
+"""
+
+import threading
+from collections import deque
+
+DRAIN_INTERVAL_MS = 50
+MAX_BATCH = 500
+# Tope de mensajes sin dibujar: ante una ráfaga se descartan los más viejos
+MAX_PENDING = 5000
+
+
+class UIMessageBus:
+    """Cola acotada de (tipo, datos) que drena el hilo de Tk."""
+
+    def __init__(self, interval_ms=DRAIN_INTERVAL_MS, max_batch=MAX_BATCH, max_pending=MAX_PENDING):
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._queue = deque(maxlen=max_pending)
+        self._handlers = {}
+        self._widget = None
+        self._closed = False
+        self.posted = 0
+        self.dropped = 0
+        self.drained = 0
+        self.batches = 0
+        self.largest_batch = 0
+
+    def on(self, kind, handler):
+        """Registra handler(lista_de_datos) para los mensajes de `kind`."""
+        self._handlers[kind] = handler
+
+    def post(self, kind, data):
+        """Encola un mensaje. Seguro desde cualquier hilo; nunca bloquea a Tk."""
+        with self._lock:
+            if self._closed:
+                # La interfaz ya cerró: nadie va a dibujarlo
+                self.dropped += 1
+                return
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append((kind, data))
+            self.posted += 1
+
+    def drain(self):
+        """Entrega hasta max_batch mensajes, uno o más por tipo. Solo desde el hilo de Tk."""
+        with self._lock:
+            count = min(len(self._queue), self.max_batch)
+            batch = [self._queue.popleft() for _ in range(count)]
+        if not batch:
+            return 0
+        grouped = {}
+        for kind, data in batch:
+            grouped.setdefault(kind, []).append(data)
+        for kind, items in grouped.items():
+            handler = self._handlers.get(kind)
+            if handler is None:
+                continue
+            try:
+                handler(items)
+            except Exception as e:
+                print(f"[Error] UI: {e}")
+        self.drained += count
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, count)
+        return count
+
+    def attach(self, widget):
+        """Empieza a vaciar la cola desde el loop de `widget` (p. ej. root)."""
+        self._widget = widget
+        widget.after(self.interval_ms, self._pump)
+
+    def _pump(self):
+        widget = self._widget
+        if widget is None:
+            return
+        self.drain()
+        try:
+            widget.after(self.interval_ms, self._pump)
+        except Exception:
+            # La ventana se cerró
+            self._widget = None
+
+    def detach(self):
+        """Deja de vaciar la cola; lo encolado espera a otro attach()."""
+        self._widget = None
+
+    def shutdown(self):
+        """Cierra la cola al terminar la interfaz: descarta lo pendiente y lo que llegue después."""
+        with self._lock:
+            self._closed = True
+            self.dropped += len(self._queue)
+            self._queue.clear()
+        self._widget = None
+
+    @property
+    def pending(self):
+        with self._lock:
+            return len(self._queue)
+
+    def get_stats(self):
+        return {
+            'posted': self.posted,
+            'drained': self.drained,
+            'dropped': self.dropped,
+            'pending': self.pending,
+            'batches': self.batches,
+            'largest_batch': self.largest_batch,
+        }
+
+
+ui_bus = UIMessageBus()
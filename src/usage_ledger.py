@@ -0,0 +1,159 @@
+"""
+Registro en memoria del tiempo de uso diario por app.
+Las sumas se hacen en memoria y se escriben a disco de forma diferida
+(cada `flush_interval` segundos, al cruzar un límite y al salir), con
+escritura atómica. El cambio de día se detecta en el primer acceso.
+La primera vez, sin archivo propio, se importa el uso de hoy que las
+versiones anteriores guardaban en settings['time_limits'].
+"""
+
+import atexit
+import json
+import os
+import threading
+from datetime import datetime
+
+from src.json_store import save_json
+
+
+def _today():
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+class UsageLedger:
+    """Segundos de uso de hoy por app, con persistencia write-behind."""
+
+    def __init__(self, path, flush_interval=30, legacy_limits=None):
+        """`legacy_limits`: límites con el formato antiguo (por defecto, los de settings)."""
+        self.path = path
+        self.flush_interval = flush_interval
+        self.legacy_limits = legacy_limits
+        # Ruta absoluta fijada al cargar: la escritura al salir no depende del cwd
+        self._file = None
+        self._lock = threading.RLock()
+        self._day = None
+        self._apps = None
+        self._dirty = False
+        self._timer = None
+        self.flushes = 0
+
+    def _load(self):
+        if self._apps is not None:
+            return
+        self._day, self._apps = _today(), {}
+        self._file = os.path.abspath(self.path)
+        if not os.path.exists(self._file):
+            self._import_legacy()
+            return
+        try:
+            with open(self._file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._day = data.get('day', self._day)
+            self._apps = data.get('apps', {})
+        except Exception as e:
+            print(f"[Error] No se pudo cargar el uso diario: {e}")
+
+    def _import_legacy(self):
+        """Trae 'used' de settings['time_limits'] si su 'last_reset' es de hoy."""
+        try:
+            if self.legacy_limits is not None:
+                limits = self.legacy_limits()
+            else:
+                from src.settings_manager import read_settings
+                limits = read_settings().get('time_limits', {})
+        except Exception as e:
+            print(f"[Error] No se pudo importar el uso guardado en settings: {e}")
+            return
+        for app_name, limit in limits.items():
+            if not isinstance(limit, dict) or not limit.get('used'):
+                continue
+            # Un 'last_reset' de otro día es uso de ese día: hoy arranca en cero
+            if str(limit.get('last_reset') or self._day)[:10] != self._day:
+                continue
+            self._apps[app_name] = limit['used']
+        if self._apps:
+            self._dirty = True
+            self._schedule_flush()
+
+    def _current(self):
+        """Contadores del día actual; reinicia en el primer acceso de un día nuevo."""
+        self._load()
+        today = _today()
+        if self._day != today:
+            self._day = today
+            self._apps = {}
+            self._dirty = True
+        return self._apps
+
+    def _schedule_flush(self):
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def add(self, app_name, seconds, limit_seconds=None):
+        """
+        Suma segundos de uso. Retorna el total de hoy. Si se indica el
+        límite y esta suma lo cruza, escribe a disco de inmediato.
+        """
+        with self._lock:
+            apps = self._current()
+            before = apps.get(app_name, 0)
+            used = before + seconds
+            apps[app_name] = used
+            self._dirty = True
+            crossed = limit_seconds is not None and before < limit_seconds <= used
+        if crossed:
+            self.flush()
+        else:
+            self._schedule_flush()
+        return used
+
+    def get(self, app_name):
+        """Segundos usados hoy."""
+        with self._lock:
+            return self._current().get(app_name, 0)
+
+    def get_all(self):
+        """Copia de los contadores de hoy."""
+        with self._lock:
+            return dict(self._current())
+
+    @property
+    def day(self):
+        with self._lock:
+            self._current()
+            return self._day
+
+    def reset(self, app_name=None):
+        """Reinicia el contador de una app o de todas."""
+        with self._lock:
+            apps = self._current()
+            if app_name is None:
+                apps.clear()
+            else:
+                apps.pop(app_name, None)
+            self._dirty = True
+        self.flush()
+
+    def flush(self):
+        """Escribe los contadores si hubo cambios. Retorna True si escribió."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return False
+            data = {'day': self._day, 'apps': dict(self._apps)}
+            try:
+                save_json(self._file or self.path, data)
+            except Exception as e:
+                print(f"[Error] No se pudo guardar el uso diario: {e}")
+                return False
+            self._dirty = False
+            self.flushes += 1
+            return True
+
+
+usage_ledger = UsageLedger("guardian_usage.json")
+atexit.register(usage_ledger.flush)
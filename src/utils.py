@@ -1,45 +1,53 @@
-﻿import psutil
-import time
+﻿import time
 import threading
 from src.config import BLOCKED_APPS, WARNING_TIME
 from src.window_detector import find_blocked_apps, is_blocked_app_active
+from src.app_matcher import get_matcher
+from src.enforcement import enforcer
+from src.process_table import process_table, terminate_pids
 from src.settings_manager import get_whitelist, log_block_event
 from src.logger import log_block, log_close, log_info
-try:
-    from playsound import playsound
-except Exception:
-    playsound = None
+from src.notifications import notify_block
+from src.tracing import tracer
+_playsound = False  # False = aÃºn sin importar
+
+
+def _get_playsound():
+    """playsound se importa en la primera alerta, no al iniciar."""
+    global _playsound
+    if _playsound is False:
+        try:
+            from playsound import playsound
+            _playsound = playsound
+        except Exception:
+            _playsound = None
+    return _playsound
 
 def kill_process_by_name(name):
     """Cierra procesos por nombre"""
-    for p in psutil.process_iter(['name', 'pid']):
-        try:
-            if p.info['name'] and name.lower() in p.info['name'].lower():
-                p.terminate()
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
+    with tracer.span("enforce.kill"):
+        pids = process_table.snapshot().pids_containing([name])[name]
+        return terminate_pids(pids, name=name)
 
 def alert_and_kill(app_name, alert_sound_path, countdown=10, ui_callback=None):
     """
     Muestra alerta sonora y temporal antes de cerrar la app.
+    La cuenta regresiva corre en el programador de cierres, no en el
+    hilo que llama. Retorna False si la app ya tenÃ­a un cierre pendiente.
     """
-    def countdown_thread():
-        for i in range(countdown, 0, -1):
-            message = f"[Guardian] '{app_name}' se cerrarÃ¡ en {i} segundos..."
-            print(message)
-            if ui_callback:
-                ui_callback(message)
-            time.sleep(1)
+    def close_app():
         kill_process_by_name(app_name)
-        final_message = f"[Guardian] '{app_name}' ha sido cerrada."
-        print(final_message)
-        if ui_callback:
-            ui_callback(final_message)
         log_close(app_name)
         log_block_event(app_name)
+        # Solo encola: el envÃ­o ocurre en el hilo de notificaciones
+        notify_block(app_name)
+
+    if not enforcer.schedule(app_name, countdown, close_app, ui_callback):
+        return False
 
     # Reproducir sonido en otro hilo para no bloquear
     log_block(app_name)
+    playsound = _get_playsound()
     if playsound:
         threading.Thread(target=playsound, args=(alert_sound_path,), daemon=True).start()
     else:
@@ -48,29 +56,36 @@ def alert_and_kill(app_name, alert_sound_path, countdown=10, ui_callback=None):
             threading.Thread(target=winsound.MessageBeep, args=(winsound.MB_ICONEXCLAMATION,), daemon=True).start()
         except Exception:
             pass
-    countdown_thread()
+    return True
 
-def check_blocked_apps(alert_sound_path, countdown=3, ui_callback=None):
+def check_blocked_apps(alert_sound_path, countdown=3, ui_callback=None, open_windows=None):
     """
     Revisa las apps bloqueadas ABIERTAS (ventanas visibles).
     Solo detecta apps que realmente estÃ¡n abiertas, no procesos en background.
     Respeta la whitelist de excepciones.
+    open_windows: revisar solo estas ventanas (p. ej. las que cambiaron).
+    Retorna las apps bloqueadas detectadas (sin las de la whitelist).
     """
-    blocked_apps_open = find_blocked_apps()
-    whitelist = get_whitelist()
+    blocked_apps_open = find_blocked_apps(open_windows=open_windows)
+    with tracer.span("check.whitelist"):
+        whitelist = get_matcher(get_whitelist(), strip_exe=False)
+    detected = []
     
     for app_info in blocked_apps_open:
         # Verificar si estÃ¡ en whitelist
-        if any(w.lower() in app_info['title'].lower() for w in whitelist):
+        if whitelist.match_index(app_info['title']) is not None:
             continue
+        detected.append(app_info)
         
         # Verificar si la app estÃ¡ en foco (activa)
         if app_info['isActive']:
-            alert_and_kill(app_info['app'], alert_sound_path, countdown, ui_callback)
+            with tracer.span("check.alert"):
+                alert_and_kill(app_info['app'], alert_sound_path, countdown, ui_callback)
         else:
             # Si no estÃ¡ en foco, mostrar advertencia
             message = f"âš ï¸ AplicaciÃ³n bloqueada detectada (background): {app_info['title']}"
             if ui_callback:
                 ui_callback(message)
             print(message)
-
+    
+    return detected
@@ -46,76 +46,7 @@ ALLOWED_DOMAINS = [
 ]
 
 # ===== NOTIFICACIONES AVANZADAS =====
-import requests
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from src.settings_manager import load_settings, save_settings
-from datetime import datetime
-
-def setup_telegram(bot_token, chat_id):
-    """Configura integraciÃ³n con Telegram."""
-    settings = load_settings()
-    if 'notifications' not in settings:
-        settings['notifications'] = {}
-    
-    settings['notifications']['telegram'] = {
-        'enabled': True,
-        'bot_token': bot_token,
-        'chat_id': chat_id
-    }
-    save_settings(settings)
-
-def send_telegram_message(message):
-    """EnvÃ­a mensaje por Telegram."""
-    settings = load_settings()
-    telegram = settings.get('notifications', {}).get('telegram', {})
-    
-    if not telegram.get('enabled'):
-        return False, "Telegram no configurado"
-    
-    try:
-        url = f"https://api.telegram.org/bot{telegram['bot_token']}/sendMessage"
-        payload = {
-            'chat_id': telegram['chat_id'],
-            'text': message
-        }
-        response = requests.post(url, json=payload, timeout=5)
-        return response.status_code == 200, "Mensaje enviado"
-    except Exception as e:
-        return False, str(e)
-
-def setup_discord(webhook_url):
-    """Configura integraciÃ³n con Discord."""
-    settings = load_settings()
-    if 'notifications' not in settings:
-        settings['notifications'] = {}
-    
-    settings['notifications']['discord'] = {
-        'enabled': True,
-        'webhook_url': webhook_url
-    }
-    save_settings(settings)
-
-def send_discord_message(message, title="Guardian Alert"):
-    """EnvÃ­a mensaje por Discord."""
-    settings = load_settings()
-    discord = settings.get('notifications', {}).get('discord', {})
-    
-    if not discord.get('enabled'):
-        return False, "Discord no configurado"
-    
-    try:
-        payload = {
-            'embeds': [{
-                'title': title,
-                'description': message,
-                'color': 3498598,
-                'footer': {'text': 'Guardian Anti-Distraction'}
-            }]
-        }
-        response = requests.post(discord['webhook_url'], json=payload, timeout=5)
-        return response.status_code in [200, 204], "Enviado a Discord"
-    except Exception as e:
-        return False, str(e)
-
+# Implementadas en src/notifications.py; se reexportan por compatibilidad
+from src.notifications import (
+    setup_telegram, send_telegram_message, setup_discord, send_discord_message,
+)
@@ -3,8 +3,15 @@ MÃ³dulo para detectar ventanas abiertas actualmente en Windows.
 Detecta apps realmente visibles/activas, no solo procesos en background.
 """
 
-import pygetwindow as gw
-from src.config import BLOCKED_APPS
+try:
+    import pygetwindow as gw
+except Exception:
+    gw = None
+from src.app_matcher import get_matcher
+from src.tracing import tracer
+
+# Matcher de las apps bloqueadas del perfil actual, por versiÃ³n de settings
+_profile_matcher = {'version': None, 'matcher': None}
 
 def get_open_windows():
     """
@@ -12,8 +19,11 @@ def get_open_windows():
     Retorna una lista de tuplas (tÃ­tulo, nombre_proceso)
     """
     windows = []
+    if gw is None:
+        return windows
     try:
-        all_windows = gw.getAllWindows()
+        with tracer.span("detector.get_all_windows"):
+            all_windows = gw.getAllWindows()
         for window in all_windows:
             # Filtrar ventanas sin tÃ­tulo o minimizadas
             if window.title and not window.isMinimized:
@@ -26,28 +36,48 @@ def get_open_windows():
     
     return windows
 
-def find_blocked_apps():
+def get_blocked_apps_matcher(blocked_apps=None):
+    """
+    Matcher de `blocked_apps` o, por defecto, de las apps bloqueadas del
+    perfil actual. Este Ãºltimo se reconstruye solo cuando cambian los settings.
     """
-    Busca apps bloqueadas entre las ventanas abiertas.
-    Retorna lista de apps bloqueadas que estÃ¡n abiertas.
+    if blocked_apps is not None:
+        return get_matcher(blocked_apps)
+    from src.settings_manager import get_blocked_apps, get_settings_version
+    version = get_settings_version()
+    if _profile_matcher['version'] != version:
+        _profile_matcher['matcher'] = get_matcher(get_blocked_apps())
+        _profile_matcher['version'] = version
+    return _profile_matcher['matcher']
+
+def find_blocked_apps(blocked_apps=None, open_windows=None):
     """
-    open_windows = get_open_windows()
+    Busca apps bloqueadas entre las ventanas abiertas (por defecto, las
+    del perfil actual). Retorna lista de apps bloqueadas que estÃ¡n abiertas.
+    """
+    if open_windows is None:
+        open_windows = get_open_windows()
+    with tracer.span("detector.match"):
+        return _match_windows(open_windows, get_blocked_apps_matcher(blocked_apps))
+
+def _match_windows(open_windows, matcher):
     blocked_found = []
+    seen_titles = set()
     
     for window in open_windows:
         window_title = window['title'].lower()
+        if window_title in seen_titles:
+            continue
         
-        for app in BLOCKED_APPS:
-            app_name = app.lower().replace('.exe', '')
-            
-            # Buscar coincidencia en el tÃ­tulo de la ventana
-            if app_name in window_title or app.lower() in window_title:
-                if window_title not in [b['title'].lower() for b in blocked_found]:
-                    blocked_found.append({
-                        'title': window['title'],
-                        'app': app,
-                        'isActive': window['isActive']
-                    })
+        # Buscar coincidencia en el tÃ­tulo de la ventana
+        app = matcher.match(window_title)
+        if app is not None:
+            seen_titles.add(window_title)
+            blocked_found.append({
+                'title': window['title'],
+                'app': app,
+                'isActive': window['isActive']
+            })
     
     return blocked_found
 
@@ -56,6 +86,8 @@ def get_active_window():
     Obtiene la ventana actualmente activa/en foco.
     Retorna el tÃ­tulo de la ventana o None.
     """
+    if gw is None:
+        return None
     try:
         active = gw.getActiveWindow()
         if active:
@@ -65,7 +97,7 @@ def get_active_window():
     
     return None
 
-def is_blocked_app_active():
+def is_blocked_app_active(blocked_apps=None):
     """
     Verifica si una app bloqueada estÃ¡ actualmente activa (en foco).
     Retorna el nombre de la app bloqueada o None.
@@ -74,12 +106,5 @@ def is_blocked_app_active():
     if not active_window:
         return None
     
-    active_lower = active_window.lower()
-    
-    for app in BLOCKED_APPS:
-        app_name = app.lower().replace('.exe', '')
-        if app_name in active_lower or app.lower() in active_lower:
-            return app
-    
-    return None
+    return get_blocked_apps_matcher(blocked_apps).match(active_window)
 
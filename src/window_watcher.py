@@ -0,0 +1,264 @@
+"""
+Capa de observación de ventanas basada en eventos.
+Un backend avisa cuándo pudo cambiar algo (hook de Windows, polling o una
+fuente falsa en pruebas) y el watcher compara snapshots consecutivos para
+emitir solo los cambios: ventanas creadas, cerradas y cambios de foco.
+"""
+
+import sys
+import threading
+import time
+
+WINDOW_CREATED = "created"
+WINDOW_CLOSED = "closed"
+WINDOW_FOCUS = "focus"
+
+
+class PollingBackend:
+    """
+    Fallback sin eventos nativos: despierta cada `interval` segundos, o
+    según el intervalo adaptativo de `tick_scheduler` si se indica.
+    """
+
+    def __init__(self, get_windows=None, interval=5, tick_scheduler=None):
+        if get_windows is None:
+            from src.window_detector import get_open_windows
+            get_windows = get_open_windows
+        self.get_windows = get_windows
+        self.interval = interval
+        self.tick_scheduler = tick_scheduler
+        self._wake = threading.Event()
+
+    def wait(self, timeout=None):
+        """Espera hasta el próximo sondeo. Siempre hay que revisar."""
+        interval = self.tick_scheduler.interval if self.tick_scheduler else self.interval
+        if timeout is None or timeout > interval:
+            timeout = interval
+        self._wake.wait(timeout)
+        self._wake.clear()
+        return True
+
+    def wake(self):
+        """Interrumpe la espera actual."""
+        self._wake.set()
+
+    def close(self):
+        self.wake()
+
+
+class ManualBackend:
+    """
+    Fuente de eventos inyectable: el llamador fija las ventanas con
+    set_windows() y el watcher despierta al instante. Útil en pruebas y
+    para integrar otras fuentes de eventos.
+    """
+
+    def __init__(self, windows=None):
+        self._windows = list(windows or [])
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+
+    def get_windows(self):
+        with self._lock:
+            return list(self._windows)
+
+    def set_windows(self, windows):
+        with self._lock:
+            self._windows = list(windows)
+        self._changed.set()
+
+    def wait(self, timeout=None):
+        changed = self._changed.wait(timeout)
+        self._changed.clear()
+        return changed
+
+    def wake(self):
+        self._changed.set()
+
+    def close(self):
+        self.wake()
+
+
+class WinEventHookBackend:
+    """
+    Backend nativo de Windows: SetWinEventHook sobre foreground, show,
+    destroy y cambio de título. Despierta al watcher en milisegundos.
+    """
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    EVENT_OBJECT_DESTROY = 0x8001
+    EVENT_OBJECT_SHOW = 0x8002
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WM_QUIT = 0x0012
+    OBJID_WINDOW = 0
+
+    def __init__(self, get_windows=None, debounce=0.05):
+        import ctypes
+        from ctypes import wintypes
+
+        if get_windows is None:
+            from src.window_detector import get_open_windows
+            get_windows = get_open_windows
+        self.get_windows = get_windows
+        self.debounce = debounce
+        self._ctypes = ctypes
+        self._wintypes = wintypes
+        self._user32 = ctypes.windll.user32
+        self._changed = threading.Event()
+        self._thread_id = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="guardian-winevent", daemon=True)
+        self._thread.start()
+        self._ready.wait(2)
+
+    def _run(self):
+        ctypes = self._ctypes
+        wintypes = self._wintypes
+        user32 = self._user32
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+
+        def callback(hook, event, hwnd, id_object, id_child, thread, timestamp):
+            if id_object == self.OBJID_WINDOW:
+                self._changed.set()
+
+        # Mantener referencia al callback mientras viva el hook
+        self._callback = WinEventProc(callback)
+        hooks = [
+            user32.SetWinEventHook(event, event, 0, self._callback, 0, 0, self.WINEVENT_OUTOFCONTEXT)
+            for event in (self.EVENT_SYSTEM_FOREGROUND, self.EVENT_OBJECT_SHOW,
+                          self.EVENT_OBJECT_DESTROY, self.EVENT_OBJECT_NAMECHANGE)
+        ]
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        self._ready.set()
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+        for hook in hooks:
+            if hook:
+                user32.UnhookWinEvent(hook)
+
+    def wait(self, timeout=None):
+        changed = self._changed.wait(timeout)
+        if changed and self.debounce:
+            # Agrupar ráfagas de eventos en una sola revisión
+            time.sleep(self.debounce)
+        self._changed.clear()
+        return changed
+
+    def wake(self):
+        self._changed.set()
+
+    def close(self):
+        if self._thread_id is not None:
+            self._user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+        self.wake()
+
+
+def create_default_backend(interval=5, tick_scheduler=None):
+    """Hook nativo en Windows; polling con diff en el resto."""
+    if sys.platform == "win32":
+        try:
+            return WinEventHookBackend()
+        except Exception as e:
+            print(f"[Guardian] Hook de ventanas no disponible, usando polling: {e}")
+    return PollingBackend(interval=interval, tick_scheduler=tick_scheduler)
+
+
+class WindowWatcher:
+    """Compara snapshots de ventanas y emite solo los cambios."""
+
+    def __init__(self, backend=None, resync_interval=30, tick_scheduler=None):
+        self.backend = backend if backend is not None else create_default_backend()
+        self.resync_interval = resync_interval
+        self.tick_scheduler = tick_scheduler
+        self.windows = {}
+        self.active_title = None
+        self.last_poll_cost = 0.0
+        self._last_sync = None
+
+    def current_windows(self):
+        """Última lista de ventanas conocida (formato de get_open_windows)."""
+        return list(self.windows.values())
+
+    def diff(self, windows):
+        """Actualiza el estado con un snapshot nuevo y retorna los eventos."""
+        current = {}
+        for window in windows:
+            current.setdefault(window['title'], window)
+        active_title = next((t for t, w in current.items() if w.get('isActive')), None)
+
+        events = []
+        for title, window in current.items():
+            if title not in self.windows:
+                events.append((WINDOW_CREATED, window))
+        for title, window in self.windows.items():
+            if title not in current:
+                events.append((WINDOW_CLOSED, window))
+        if active_title != self.active_title and active_title is not None:
+            events.append((WINDOW_FOCUS, current[active_title]))
+
+        self.windows = current
+        self.active_title = active_title
+        return events
+
+    def poll(self):
+        """Toma un snapshot del backend y retorna los cambios."""
+        start = time.perf_counter()
+        events = self.diff(self.backend.get_windows())
+        self.last_poll_cost = time.perf_counter() - start
+        if self.tick_scheduler is not None:
+            focus_changed = any(kind == WINDOW_FOCUS for kind, _ in events)
+            self.tick_scheduler.record_tick(self.last_poll_cost, active=focus_changed)
+        return events
+
+    def needs_resync(self):
+        """Indica si toca una revisión completa aunque no haya eventos."""
+        return self._last_sync is None or time.monotonic() - self._last_sync >= self.resync_interval
+
+    def mark_synced(self):
+        """Registra que se hizo una revisión completa."""
+        self._last_sync = time.monotonic()
+
+    def wait_for_changes(self, timeout=None, stop_event=None):
+        """
+        Bloquea hasta que haya cambios, venza el timeout o toque
+        resincronizar. Retorna la lista de eventos (posiblemente vacía).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while stop_event is None or not stop_event.is_set():
+            now = time.monotonic()
+            wait_time = 0
+            if self._last_sync is not None:
+                wait_time = max(0, self._last_sync + self.resync_interval - now)
+            if deadline is not None:
+                wait_time = min(wait_time, max(0, deadline - now))
+            self.backend.wait(wait_time)
+            if stop_event is not None and stop_event.is_set():
+                break
+            events = self.poll()
+            if events or self.needs_resync():
+                return events
+            if deadline is not None and time.monotonic() >= deadline:
+                return events
+        return []
+
+    def close(self):
+        self.backend.close()
+
+
+def changed_windows(events):
+    """Ventanas creadas o enfocadas en una lista de eventos."""
+    seen = set()
+    windows = []
+    for kind, window in events:
+        if kind in (WINDOW_CREATED, WINDOW_FOCUS) and window['title'] not in seen:
+            seen.add(window['title'])
+            windows.append(window)
+    return windows
@@ -41,28 +41,25 @@ class ZenMode:
         )
         info_label.pack(pady=20)
         
-        # Iniciar countdown
-        self.countdown_thread = threading.Thread(target=self.countdown, daemon=True)
-        self.countdown_thread.start()
+        # Iniciar countdown en el loop de Tk: los widgets solo se tocan desde este hilo
+        self.window.after(1000, self.countdown)
         
         self.window.mainloop()
     
     def countdown(self):
-        """Cuenta hacia atrás."""
-        while self.seconds_remaining > 0 and self.window:
-            if not self.paused:
-                self.seconds_remaining -= 1
-                try:
-                    self.timer_label.config(text=self.format_time(self.seconds_remaining))
-                except:
-                    break
-            threading.Event().wait(1)
-        
-        if self.window and self.seconds_remaining <= 0:
+        """Cuenta hacia atrás, un segundo por llamada (programada con after())."""
+        if not self.window:
+            return
+        if not self.paused:
+            self.seconds_remaining -= 1
             try:
-                self.window.destroy()
-            except:
-                pass
+                self.timer_label.config(text=self.format_time(self.seconds_remaining))
+            except tk.TclError:
+                return
+        if self.seconds_remaining <= 0:
+            self.stop()
+            return
+        self.window.after(1000, self.countdown)
     
     def format_time(self, seconds):
         """Formatea tiempo en HH:MM:SS."""
@@ -77,6 +74,7 @@ class ZenMode:
             self.window.destroy()
         except:
             pass
+        self.window = None
 
 def start_zen_mode(minutes=60):
     """Inicia modo Zen en thread separado."""
@@ -0,0 +1,106 @@
+import threading
+
+from src.activity_log import ActivityLog, ActivityLogView, older_blocks
+from src.ui_bus import UIMessageBus
+
+
+class DayJournal:
+    """read_blocks(día, día) sobre una lista en memoria."""
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+
+    def read_blocks(self, start=None, end=None):
+        self.readers = getattr(self, 'readers', set()) | {threading.current_thread().name}
+        return [b for b in self.blocks if start <= b['timestamp'][:10] <= end]
+
+
+def test_load_older_keeps_events_sharing_the_boundary_timestamp():
+    blocks = ([{'app': f"a{i}.exe", 'timestamp': "2025-01-01T09:00:00"} for i in range(30)]
+              + [{'app': f"b{i}.exe", 'timestamp': "2025-01-01T10:00:00"} for i in range(40)])
+    log = ActivityLog(capacity=500, journal=DayJournal(blocks))
+    log._older_cursor = "2025-01-02T00:00:00"
+    assert log.load_older(limit=50) == 50
+    assert log.load_older(limit=50) == 20
+    assert log.load_older(limit=50) == 0
+    lines = log.lines(0, len(log))
+    assert len(lines) == 70
+    assert sorted(line.split(": ")[1] for line in lines) == sorted(b['app'] for b in blocks)
+
+
+def test_identical_timestamps_across_several_pages():
+    blocks = [{'app': f"x{i}.exe", 'timestamp': "2025-01-01T09:00:00"} for i in range(70)]
+    log = ActivityLog(capacity=500, journal=DayJournal(blocks))
+    log._older_cursor = "2025-01-01T12:00:00"
+    assert [log.load_older(limit=30) for _ in range(4)] == [30, 30, 10, 0]
+    assert len(set(log.lines(0, len(log)))) == 70
+
+
+def test_older_blocks_spans_days():
+    blocks = [{'app': 'a.exe', 'timestamp': f"2025-01-0{day}T08:00:00"} for day in (1, 2, 3)]
+    found = older_blocks(DayJournal(blocks), "2025-01-03T08:00:00", limit=5, lookback_days=5, skip=1)
+    assert [b['timestamp'][:10] for b in found] == ["2025-01-01", "2025-01-02"]
+
+
+def test_stale_page_is_not_applied():
+    blocks = [{'app': f"a{i}.exe", 'timestamp': f"2025-01-01T09:{i:02d}:00"} for i in range(10)]
+    log = ActivityLog(capacity=500, journal=DayJournal(blocks))
+    log._older_cursor = "2025-01-02T00:00:00"
+    page = log.fetch_older(limit=4)
+    assert len(log) == 0
+    assert log.load_older(limit=4) == 4
+    # La página pedida antes ya no corresponde al cursor actual
+    assert log.apply_older(page) == 0
+    assert len(log) == 4
+
+
+class FakeButton:
+    def __init__(self):
+        self.states = []
+
+    def config(self, state):
+        self.states.append(state)
+
+
+def _view(log, bus):
+    """ActivityLogView sin widgets de Tk: solo el cargador de páginas."""
+    view = ActivityLogView.__new__(ActivityLogView)
+    view.log = log
+    view.offset, view.follow = 5, True
+    view.older_button = FakeButton()
+    view.refreshed = 0
+    view.refresh = lambda force=False: setattr(view, 'refreshed', view.refreshed + 1)
+    view._init_loader(bus)
+    return view
+
+
+def _wait_and_drain(bus):
+    for _ in range(500):
+        if bus.pending:
+            return bus.drain()
+        threading.Event().wait(0.01)
+    raise AssertionError("la página no llegó al bus")
+
+
+def test_view_reads_the_journal_off_the_ui_thread():
+    journal = DayJournal([{'app': f"a{i}.exe", 'timestamp': f"2025-01-01T09:{i:02d}:00"} for i in range(3)])
+    log = ActivityLog(capacity=500, journal=journal)
+    log._older_cursor = "2025-01-02T00:00:00"
+    bus = UIMessageBus()
+    view = _view(log, bus)
+
+    view.load_older()
+    # Mientras se lee, otro clic no lanza una segunda lectura
+    view.load_older()
+    assert len(log) == 0
+    assert _wait_and_drain(bus) == 1
+    assert journal.readers == {"guardian-activity-older"}
+    assert len(log) == 3
+    assert (view.offset, view.follow, view.refreshed) == (0, False, 1)
+    assert view.older_button.states == ['disabled', 'normal']
+
+    # Sin más historial el botón queda desactivado
+    view.load_older()
+    _wait_and_drain(bus)
+    assert len(log) == 3
+    assert view.older_button.states[-1] == 'disabled'
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from src import scheduler
+from src.api_server import (
+    RESOURCES, CachedResource, StreamPublisher, _etag_matches, create_app, stream_events,
+)
+from src.event_hub import EventHub, notify_data_changed
+
+
+def test_status_follows_schedule_transition_within_the_hour(monkeypatch):
+    state = {'active': True}
+    monkeypatch.setattr(scheduler, 'is_blocking_active', lambda now=None: state['active'])
+    status = RESOURCES['/api/status']
+    data, etag = status.get_data()
+    assert data['blocking_active'] is True
+    assert status.get_data()[1] == etag
+
+    # Transición a las 9:30: misma hora, otro estado
+    state['active'] = False
+    data, new_etag = status.get_data()
+    assert data['blocking_active'] is False
+    assert new_etag != etag
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = '"abc"'
+    assert _etag_matches('"abc"', etag)
+    assert _etag_matches('W/"abc"', etag)
+    assert _etag_matches('"x", W/"abc"', etag)
+    assert _etag_matches(' * ', etag)
+    assert not _etag_matches('"abcd", W/"x"', etag)
+    assert not _etag_matches('', etag)
+    assert not _etag_matches(None, etag)
+
+
+def test_conditional_get_over_http():
+    pytest.importorskip('flask')
+    state = {'version': 1, 'total': 3}
+    resource = CachedResource(lambda: {'total': state['total']}, lambda: state['version'])
+    client = create_app({'/api/x': resource}).test_client()
+
+    first = client.get('/api/x')
+    assert first.status_code == 200
+    assert first.get_json() == {'total': 3}
+    etag = first.headers['ETag']
+
+    assert client.get('/api/x', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/api/x', headers={'If-None-Match': 'W/' + etag}).status_code == 304
+    assert resource.builds == 1
+
+    state['version'], state['total'] = 2, 4
+    changed = client.get('/api/x', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.get_json() == {'total': 4}
+    assert changed.headers['ETag'] != etag
+
+
+def _frame(text):
+    fields = dict(line.split(': ', 1) for line in text.strip().splitlines())
+    return fields.get('event'), json.loads(fields.get('data', 'null'))
+
+
+def test_stream_sends_a_delta_after_data_changed():
+    state = {'version': 1, 'data': {'total': 1, 'apps': {'a.exe': 1}}}
+    resource = CachedResource(lambda: state['data'], lambda: state['version'])
+    publisher = StreamPublisher({'/x': resource}, {'stats': '/x'}, hub=EventHub(), interval=5.0)
+    publisher.start()
+    stream = stream_events(publisher, keepalive=5.0)
+    try:
+        assert next(stream).startswith('retry:')
+        assert _frame(next(stream)) == ('snapshot', {'stats': state['data']})
+
+        state['version'], state['data'] = 2, {'total': 2, 'apps': {'a.exe': 1, 'b.exe': 1}}
+        notify_data_changed()
+        frame = next(stream)
+        assert frame.startswith('id: ')
+        assert _frame(frame) == ('stats', {'total': 2, 'apps': {'b.exe': 1}})
+
+        # Los avisos del monitor pasan tal cual por el mismo stream
+        publisher.hub.publish('monitor', {'state': 'paused'})
+        assert _frame(next(stream)) == ('monitor', {'state': 'paused'})
+    finally:
+        stream.close()
+        publisher.stop()
+
+
+def test_dashboard_listens_to_every_stream_event():
+    from src.api_server import STREAMS
+    from src.dashboard import get_dashboard_html
+
+    html = get_dashboard_html()
+    for kind in STREAMS:
+        assert f"{kind}: render" in html
+    for kind in ('monitor', 'message', 'profile'):
+        assert f"{kind}: (data)" in html
@@ -0,0 +1,43 @@
+from src import app_matcher, window_detector
+from src.app_matcher import AppMatcher, get_matcher
+from src.settings_manager import load_settings, save_settings
+
+
+def test_match_and_non_match():
+    matcher = AppMatcher(["Steam.exe", "discord.exe", "tiktok"])
+    assert matcher.match("steam - biblioteca") == "Steam.exe"
+    assert matcher.match("#general | Discord") == "discord.exe"
+    assert matcher.match("Editor de texto") is None
+    assert matcher.match("") is None
+
+
+def test_first_app_in_list_order_wins():
+    matcher = AppMatcher(["youtube", "tube"])
+    assert matcher.match("YouTube - Mozilla Firefox") == "youtube"
+    assert AppMatcher(["tube", "youtube"]).match("youtube") == "tube"
+
+
+def test_get_matcher_rebuilds_only_when_list_changes():
+    apps = ["alpha.exe", "beta.exe"]
+    first = get_matcher(apps)
+    assert get_matcher(list(apps)) is first
+    assert get_matcher(apps + ["gamma.exe"]) is not first
+    assert len(app_matcher._cache) <= app_matcher._MAX_CACHED
+
+
+def _set_profile_apps(apps):
+    settings = load_settings()
+    settings['profiles'][settings['current_profile']]['blocked_apps'] = apps
+    save_settings(settings)
+
+
+def test_detector_follows_the_profile_list():
+    windows = [{'title': "Juego Raro - Launcher", 'isActive': True}]
+    _set_profile_apps(["juego raro.exe"])
+    matcher = window_detector.get_blocked_apps_matcher()
+    assert window_detector.get_blocked_apps_matcher() is matcher
+    assert [w['app'] for w in window_detector.find_blocked_apps(open_windows=windows)] == ["juego raro.exe"]
+
+    _set_profile_apps(["otra.exe"])
+    assert window_detector.get_blocked_apps_matcher() is not matcher
+    assert window_detector.find_blocked_apps(open_windows=windows) == []
@@ -0,0 +1,55 @@
+import json
+import os
+
+import pytest
+
+from src.tools import benchmark
+
+
+def test_compare_to_baseline_flags_only_timing_regressions():
+    baseline = {'find_us': 10.0, 'stats_ms': 2.0, 'peak_kb': 1.0, 'events': 5, 'new_us': None}
+    result = {'find_us': 12.0, 'stats_ms': 3.0, 'peak_kb': 9.0, 'events': 50, 'new_us': 1.0}
+    assert benchmark.compare_to_baseline(result, baseline, tolerance=0.25) == [('stats_ms', 2.0, 3.0)]
+    assert benchmark.compare_to_baseline(result, baseline, tolerance=0.6) == []
+
+
+def test_small_benchmarks_run_and_agree():
+    matcher = benchmark.bench_matcher(windows=200, patterns=50, naive_limit=200)
+    assert matcher['windows'] == 200
+    table = benchmark.bench_process_table(processes=300, names=5, rounds=3)
+    assert table['processes'] == 300
+
+
+HOT_PATH = ['hot-path', '--windows', '20', '--patterns', '10', '--history', '200', '--repeat', '3']
+
+
+def test_hot_path_cli_and_baseline(tmp_path, capsys):
+    cwd = os.getcwd()
+    result = benchmark.main(['--json'] + HOT_PATH)
+    assert os.getcwd() == cwd
+    assert json.loads(capsys.readouterr().out) == result
+    for stage in ('find_blocked_apps', 'check_blocked_apps', 'enforcement_lookup',
+                  'log_block_event', 'get_monthly_stats'):
+        assert result[f"{stage}_p50_us"] >= 0
+
+    # Un baseline imposible de igualar: la corrida debe fallar
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({key: 1e-9 for key in result if key.endswith('_us')}), encoding='utf-8')
+    with pytest.raises(SystemExit) as exit_info:
+        benchmark.main(['--baseline', str(baseline)] + HOT_PATH)
+    assert exit_info.value.code == 1
+    assert "[Regresión]" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('backend, store', [('json', 'BlockJournal'), ('sqlite', 'SqliteEventStore')])
+def test_hot_path_uses_the_requested_backend(monkeypatch, backend, store):
+    from src import settings_manager
+
+    monkeypatch.delenv('GUARDIAN_STORAGE', raising=False)
+    journal = settings_manager.block_journal
+    result = benchmark.main(HOT_PATH + ['--backend', backend])
+    assert result['store'] == store
+    assert result['log_block_event_p50_us'] >= 0
+    # El backend del proceso y el entorno quedan como estaban
+    assert settings_manager.block_journal is journal
+    assert 'GUARDIAN_STORAGE' not in os.environ
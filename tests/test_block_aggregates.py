@@ -0,0 +1,24 @@
+from src.block_aggregates import BlockAggregates, _parse_timestamp
+
+
+def test_parse_timestamp_accepts_space_separator():
+    assert _parse_timestamp("2025-01-01T10:00:00") == ("2025-01-01", 10)
+    assert _parse_timestamp("2025-01-01 10:00:00") == ("2025-01-01", 10)
+    assert _parse_timestamp("2025-01-01T23:30:00+02:00") == ("2025-01-01", 23)
+    assert _parse_timestamp("") == (None, None)
+    assert _parse_timestamp("ayer") == (None, None)
+
+
+def test_rebuild_counts_both_formats(tmp_path):
+    aggregates = BlockAggregates(str(tmp_path / "aggregates"))
+    aggregates.rebuild([
+        {'app': 'steam.exe', 'timestamp': "2025-01-01T10:00:00"},
+        {'app': 'steam.exe', 'timestamp': "2025-01-01 10:15:00"},
+        {'app': 'chrome.exe', 'timestamp': "2025-01-01 21:00:00.123456"},
+    ])
+    aggregates.record('steam.exe', "2025-01-02 08:00:00")
+    day = aggregates.get_day("2025-01-01")
+    assert day['total'] == 3
+    assert day['hours'][10] == 2 and day['hours'][21] == 1
+    assert day['apps'] == {'steam.exe': 2, 'chrome.exe': 1}
+    assert aggregates.get_days() == ["2025-01-01", "2025-01-02"]
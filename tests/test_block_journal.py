@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+from src import block_journal as journal_module
+from src import settings_manager
+from src.block_journal import BlockJournal
+from src.event_store import SqliteEventStore
+
+
+def _events(n, day="2025-03-01"):
+    return [(f"app{i}", f"{day}T10:00:{i:02d}") for i in range(n)]
+
+
+def _journal():
+    return BlockJournal("blocks.jsonl", "segments")
+
+
+class Crash(Exception):
+    pass
+
+
+def test_compact_moves_journal_to_segments():
+    journal = _journal()
+    for app, ts in _events(3):
+        journal.append(app, ts)
+    assert journal.compact() == 3
+    assert len(journal.read_blocks()) == 3
+    assert journal.compact() == 0
+    assert len(journal.read_blocks()) == 3
+
+
+def test_crash_before_removing_journal_does_not_replay(monkeypatch):
+    journal = _journal()
+    for app, ts in _events(5):
+        journal.append(app, ts)
+    real_remove = journal_module._remove
+
+    def crash_on_batch(path):
+        if path.endswith(".compacting"):
+            raise Crash()
+        real_remove(path)
+
+    monkeypatch.setattr(journal_module, "_remove", crash_on_batch)
+    with pytest.raises(Crash):
+        journal.compact()
+    monkeypatch.setattr(journal_module, "_remove", real_remove)
+
+    restarted = _journal()
+    assert len(restarted.read_blocks()) == 5
+    restarted.append("later", "2025-03-01T11:00:00")
+    restarted.compact()
+    assert len(restarted.read_blocks()) == 6
+
+
+def test_crash_mid_append_is_truncated_and_retried(monkeypatch):
+    journal = _journal()
+    for app, ts in _events(4):
+        journal.append(app, ts)
+    real_write = journal_module.atomic_write_json
+
+    def crash_before_done(path, data, indent=None):
+        if data.get('done'):
+            raise Crash()
+        real_write(path, data, indent)
+
+    monkeypatch.setattr(journal_module, "atomic_write_json", crash_before_done)
+    with pytest.raises(Crash):
+        journal.compact()
+    monkeypatch.setattr(journal_module, "atomic_write_json", real_write)
+
+    assert len(_journal().read_blocks()) == 4
+
+
+def test_import_with_batch_id_is_applied_once():
+    journal = _journal()
+    blocks = [{'app': app, 'timestamp': ts} for app, ts in _events(3)]
+    assert journal.import_blocks(blocks, batch_id="b1") == 3
+    assert _journal().import_blocks(blocks, batch_id="b1") == 0
+    assert len(journal.read_blocks()) == 3
+
+
+def test_sqlite_import_with_batch_id_is_applied_once():
+    store = SqliteEventStore("events.db")
+    blocks = [{'app': app, 'timestamp': ts} for app, ts in _events(3)]
+    assert store.import_blocks(blocks, batch_id="b1") == 3
+    assert store.import_blocks(blocks, batch_id="b1") == 0
+    assert store.count('blocks') == 3
+    store.close()
+
+
+def test_legacy_import_retry_after_crash_does_not_duplicate(monkeypatch):
+    monkeypatch.setattr(settings_manager, "block_journal", _journal())
+    blocks = [{'app': app, 'timestamp': ts} for app, ts in _events(6)]
+    with open(settings_manager.STATS_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'blocks': blocks, 'other': 1}, f)
+
+    def crash(stats):
+        raise Crash()
+
+    real_write = settings_manager._write_stats_file
+    monkeypatch.setattr(settings_manager, "_write_stats_file", crash)
+    assert settings_manager.import_legacy_stats() == 6
+    monkeypatch.setattr(settings_manager, "_write_stats_file", real_write)
+
+    assert settings_manager.import_legacy_stats() == 0
+    assert len(settings_manager.block_journal.read_blocks()) == 6
+    stats = settings_manager.load_stats()
+    assert 'other' in stats and len(stats['blocks']) == 6
+
+
+def test_load_stats_parses_the_file_once(monkeypatch):
+    monkeypatch.setattr(settings_manager, "block_journal", _journal())
+    with open(settings_manager.STATS_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'total': 1}, f)
+    calls = []
+    real_load = json.load
+    monkeypatch.setattr(settings_manager.json, "load", lambda f: calls.append(1) or real_load(f))
+    first = settings_manager.load_stats()
+    first['total'] = 99
+    assert settings_manager.load_stats()['total'] == 1
+    assert len(calls) == 1
@@ -0,0 +1,113 @@
+import sys
+import threading
+
+import pytest
+
+from src.daemon import DaemonClient, GuardianDaemon
+from src.event_hub import EventHub
+from src.monitor import RUNNING, STOPPED
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="socket Unix")
+
+AUTHKEY = b"clave-de-prueba"
+
+
+class FakeService:
+    """MonitorService mínimo: el monitor real no corre en estas pruebas."""
+
+    def __init__(self):
+        self.state = STOPPED
+        self.fail_start = False
+
+    def start(self, ui_callback=None):
+        if self.fail_start:
+            raise RuntimeError("sin acceso a las ventanas")
+        changed = self.state != RUNNING
+        self.state = RUNNING
+        ui_callback("Monitor iniciado")
+        return changed
+
+    def stop(self, timeout=5.0):
+        self.state = STOPPED
+        return True
+
+    def pause(self):
+        return False
+
+    def resume(self):
+        return False
+
+    def is_running(self):
+        return self.state == RUNNING
+
+    def get_state(self):
+        return {'state': self.state}
+
+
+@pytest.fixture
+def daemon():
+    daemon = GuardianDaemon("guardian-test.sock", authkey=AUTHKEY, hub=EventHub(), service=FakeService())
+    thread = threading.Thread(target=daemon.serve_forever, kwargs={'autostart': False}, daemon=True)
+    thread.start()
+    client = DaemonClient(daemon.address, AUTHKEY)
+    for _ in range(200):
+        try:
+            client.request('status')
+            break
+        except OSError:
+            threading.Event().wait(0.01)
+    yield daemon, client
+    daemon.shutdown()
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_status_start_and_stop(daemon):
+    daemon, client = daemon
+    status = client.request('status')
+    assert status['ok'] and status['running'] is False
+    assert status['state'] == {'state': STOPPED}
+
+    assert client.request('start') == {'ok': True, 'changed': True}
+    assert client.request('status')['running'] is True
+    assert client.request('start')['changed'] is False
+
+    assert client.request('stop') == {'ok': True, 'changed': True}
+    assert client.request('status')['running'] is False
+
+
+def test_bad_requests_get_an_error_reply(daemon):
+    daemon, client = daemon
+    reply = client.request('no-existe')
+    assert reply['ok'] is False and "Comando desconocido" in reply['error']
+    # Parámetros que el comando no acepta
+    assert client.request('status', extra=1)['ok'] is False
+
+    daemon.service.fail_start = True
+    reply = client.request('start')
+    assert reply == {'ok': False, 'error': "RuntimeError: sin acceso a las ventanas"}
+    # La conexión y el demonio siguen atendiendo
+    assert client.request('status')['ok'] is True
+
+
+def test_subscribe_receives_monitor_messages(daemon):
+    daemon, client = daemon
+    received = []
+    got_message = threading.Event()
+
+    def on_event(event):
+        received.append(event)
+        if event['event'] == 'message':
+            got_message.set()
+
+    stop = client.subscribe(on_event, after=0)
+    assert client.request('start')['ok']
+    assert got_message.wait(5)
+    event = received[-1]
+    assert event['data']['text'] == "Monitor iniciado"
+    assert event['seq'] == daemon.hub.last_seq
+    assert not stop.is_set()
+
+    # Al cerrar el demonio la suscripción termina sola
+    daemon.shutdown()
+    assert stop.wait(5)
@@ -0,0 +1,29 @@
+import threading
+import time
+
+from src.enforcement import EnforcementScheduler
+
+
+def test_expires_after_countdown():
+    scheduler = EnforcementScheduler()
+    done = threading.Event()
+    start = time.monotonic()
+    assert scheduler.schedule("App", 1, done.set)
+    assert not scheduler.schedule("app", 1, done.set)
+    assert done.wait(3)
+    assert time.monotonic() - start >= 1.0
+    assert scheduler.get_stats()['pending'] == 0
+
+
+def test_reschedule_after_cancel_keeps_full_countdown():
+    scheduler = EnforcementScheduler()
+    scheduler.schedule("App", 2, lambda: None)
+    time.sleep(0.1)
+    assert scheduler.cancel("App")
+    time.sleep(0.1)
+    expired = threading.Event()
+    start = time.monotonic()
+    scheduler.schedule("App", 2, expired.set)
+    assert expired.wait(4)
+    # Los items del cierre cancelado no deben descontar del nuevo
+    assert time.monotonic() - start >= 1.9
@@ -0,0 +1,103 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from src.json_store import JsonStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import sys
+from src.json_store import JsonStore
+store = JsonStore()
+seq = 0
+while True:
+    store.save(sys.argv[1], {'seq': seq, 'items': [{'i': i, 'txt': 'x' * 40} for i in range(200)]})
+    seq += 1
+"""
+
+
+def _payload(writer, seq):
+    # Relleno para que la escritura no sea atómica "por suerte"
+    return {'writer': writer, 'seq': seq, 'items': [{'i': i, 'txt': 'x' * 40} for i in range(200)]}
+
+
+@pytest.mark.parametrize('delay', [0, 0.05], ids=['immediate', 'coalesced'])
+def test_concurrent_writers_never_expose_partial_files(tmp_path, delay):
+    store = JsonStore()
+    path = str(tmp_path / "stress.json")
+    threads, writes = 8, 100
+    stop = threading.Event()
+    result = {'reads': 0, 'corrupt': 0}
+
+    def reader():
+        while not stop.is_set():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                result['reads'] += 1
+                if len(data['items']) != 200:
+                    result['corrupt'] += 1
+            except FileNotFoundError:
+                pass
+            except ValueError:
+                result['corrupt'] += 1
+
+    def writer(index):
+        for seq in range(writes):
+            store.save(path, _payload(index, seq), delay=delay)
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    workers = [threading.Thread(target=writer, args=(i,)) for i in range(threads)]
+    for thread in readers + workers:
+        thread.start()
+    for worker in workers:
+        worker.join()
+    store.flush()
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        final = json.load(f)
+    stats = store.get_stats()
+    assert result['corrupt'] == 0
+    assert final['seq'] == writes - 1
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+    assert stats['requested'] == threads * writes and stats['pending'] == 0
+    if delay:
+        assert stats['written'] < stats['requested']
+    else:
+        assert stats['written'] == stats['requested']
+
+
+def test_coalesced_saves_read_back_pending_content(tmp_path):
+    store = JsonStore()
+    path = str(tmp_path / "pending.json")
+    store.save(path, {'seq': 1}, delay=60)
+    store.save(path, {'seq': 2}, delay=60)
+    assert not os.path.exists(path)
+    assert store.load(path) == {'seq': 2}
+    store.flush(path)
+    assert store.get_stats()['written'] == 1
+    with open(path, 'r', encoding='utf-8') as f:
+        assert json.load(f) == {'seq': 2}
+
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGKILL'), reason="SIGKILL solo en POSIX")
+def test_killed_writer_leaves_a_readable_file(tmp_path):
+    path = str(tmp_path / "crash.json")
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    for round_index in range(5):
+        child = subprocess.Popen([sys.executable, "-c", CHILD, path], env=env)
+        time.sleep(0.3 + round_index * 0.03)
+        child.send_signal(signal.SIGKILL)
+        child.wait()
+        with open(path, 'r', encoding='utf-8') as f:
+            assert len(json.load(f)['items']) == 200
@@ -0,0 +1,30 @@
+import json
+
+from src import settings_manager
+from src.block_journal import BlockJournal
+from src.event_store import SqliteEventStore
+from src.tools import migrate_to_sqlite
+
+
+def test_migrated_legacy_stats_are_not_imported_again(monkeypatch):
+    journal = BlockJournal(migrate_to_sqlite.BLOCKS_JOURNAL_FILE, migrate_to_sqlite.BLOCKS_SEGMENTS_DIR)
+    for i in range(3):
+        journal.append(f"nuevo{i}.exe", f"2025-03-02T10:00:0{i}")
+    legacy = [{'app': f"viejo{i}.exe", 'timestamp': f"2025-03-01T09:00:0{i}"} for i in range(4)]
+    with open(migrate_to_sqlite.STATS_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'blocks': legacy, 'total': 4}, f)
+
+    counts = migrate_to_sqlite.migrate("events.db")
+    assert counts['blocks'] == 7
+
+    # Guardian arranca con el backend SQLite y el stats antiguo intacto
+    store = SqliteEventStore("events.db")
+    monkeypatch.setattr(settings_manager, 'block_journal', store)
+    monkeypatch.setattr(settings_manager, 'block_aggregates', store)
+    monkeypatch.setattr(settings_manager, '_legacy_stats_checked', False)
+    stats = settings_manager.load_stats()
+    assert len(stats['blocks']) == 7
+    assert sorted(b['app'] for b in stats['blocks']) == (
+        [f"nuevo{i}.exe" for i in range(3)] + [f"viejo{i}.exe" for i in range(4)])
+    assert store.count('blocks') == 7
+    store.close()
@@ -0,0 +1,54 @@
+import pytest
+
+from src import ml_analyzer
+from src.ml_analyzer import DistractionAnalytics
+
+BLOCKS = [
+    {'app': 'steam.exe', 'timestamp': "2025-01-06T10:00:00"},   # lunes
+    {'app': 'steam.exe', 'timestamp': "2025-01-06 10:30:00"},
+    {'app': 'chrome.exe', 'timestamp': "2025-01-07T21:00:00+02:00"},
+    {'app': 'chrome.exe', 'timestamp': ""},
+    {'app': 'chrome.exe', 'timestamp': None},
+    {'app': 'chrome.exe'},
+]
+
+
+@pytest.mark.parametrize('use_numpy', [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(ml_analyzer.np is None, reason="sin numpy")),
+])
+def test_missing_timestamps_and_offsets(use_numpy):
+    analytics = DistractionAnalytics(None, use_numpy=use_numpy)
+    patterns = analytics.compute(*analytics.load_arrays(BLOCKS))
+    # Los vacíos no cuentan como 08:00 ni domingo; el offset conserva la hora local
+    assert patterns['hourly'] == {10: 2, 21: 1}
+    assert patterns['daily'] == {"Monday": 2, "Tuesday": 1}
+    assert patterns['apps'] == {'steam.exe': 2, 'chrome.exe': 1}
+
+
+@pytest.mark.skipif(ml_analyzer.np is None, reason="sin numpy")
+def test_numpy_path_matches_fallback():
+    blocks = [{'app': f"app{i % 3}", 'timestamp': f"2025-01-{1 + i % 28:02d}T{i % 24:02d}:15:00"}
+              for i in range(200)]
+    blocks[17]['timestamp'] = ""
+    fast = DistractionAnalytics(None, use_numpy=True)
+    slow = DistractionAnalytics(None, use_numpy=False)
+    assert fast.compute(*fast.load_arrays(blocks)) == slow.compute(*slow.load_arrays(blocks))
+
+
+@pytest.mark.skipif(ml_analyzer.np is None, reason="sin numpy")
+def test_bad_entries_keep_the_vectorised_path(monkeypatch):
+    blocks = [{'app': "a.exe", 'timestamp': f"2025-02-{1 + i % 28:02d}T{i % 24:02d}:00:00"}
+              for i in range(10000)]
+    blocks[5000]['timestamp'] = "no es una fecha"
+    blocks[7000]['timestamp'] = "2025-02-03T23:00:00+02:00"
+    fast = DistractionAnalytics(None, use_numpy=True)
+    calls = []
+    parse_one = fast._parse_one
+    monkeypatch.setattr(fast, '_parse_one', lambda t: calls.append(t) or parse_one(t))
+    epochs, codes, _ = fast.load_arrays(blocks)
+    # Solo los tramos chicos con las entradas malas pasan por Python
+    assert len(calls) <= 2 * ml_analyzer._SCALAR_CHUNK
+    assert len(epochs) == len(codes) == 9999
+    slow = DistractionAnalytics(None, use_numpy=False)
+    assert fast.compute(epochs, codes, ["a.exe"]) == slow.compute(*slow.load_arrays(blocks))
@@ -0,0 +1,44 @@
+import threading
+import time
+
+import pytest
+
+from src import monitor
+from src.monitor import MonitorService, PAUSED, RUNNING, STOPPED
+from src.window_watcher import ManualBackend, WindowWatcher
+
+
+def _monitor_threads():
+    return [t for t in threading.enumerate() if t.name == "guardian-monitor" and t.is_alive()]
+
+
+@pytest.mark.parametrize('active', [True, False], ids=['activo', 'fuera-de-horario'])
+def test_start_stop_pause_cycles_keep_a_single_worker(monkeypatch, active):
+    monkeypatch.setattr(monitor.tick_scheduler, 'is_active', lambda: active)
+    service = MonitorService(watcher_factory=lambda: WindowWatcher(ManualBackend([])))
+    before = threading.active_count()
+    for i in range(40):
+        assert service.start()
+        # Un segundo start() con el hilo vivo no crea otro
+        assert not service.start()
+        # Dejar que el worker llegue a su espera antes de detenerlo
+        time.sleep(0.002)
+        assert len(_monitor_threads()) == 1
+        assert service.state == RUNNING
+        start = time.perf_counter()
+        if i % 4 == 3:
+            assert service.pause(timeout=2.0)
+            assert service.state == PAUSED
+            assert service.resume()
+        assert service.stop(timeout=2.0)
+        assert time.perf_counter() - start < 2.0
+        assert service.state == STOPPED
+        assert not _monitor_threads()
+    assert threading.active_count() <= before
+
+
+def test_stop_when_stopped_is_a_no_op():
+    service = MonitorService(watcher_factory=lambda: WindowWatcher(ManualBackend([])))
+    assert service.state == STOPPED
+    assert service.stop(timeout=0.5)
+    assert service.state == STOPPED
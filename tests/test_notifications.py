@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+from src import notifications
+from src.notifications import NotificationDispatcher
+from src.settings_manager import load_settings, save_settings
+from src.tools.notification_stub import NotificationStub
+
+pytest.importorskip("requests")
+
+
+@pytest.fixture
+def stub_factory():
+    stubs = []
+
+    def start(**options):
+        stub = NotificationStub(**options).start()
+        settings = load_settings()
+        settings['notifications'] = {'telegram': stub.telegram_config(), 'discord': stub.discord_config()}
+        save_settings(settings)
+        stubs.append(stub)
+        return stub
+
+    yield start
+    for stub in stubs:
+        stub.stop()
+
+
+def _dispatcher(**options):
+    return NotificationDispatcher(backoff=0.05, min_interval={'telegram': 0.01, 'discord': 0.01}, **options)
+
+
+def _workers():
+    return [t for t in threading.enumerate() if t.name == "guardian-notify"]
+
+
+def test_burst_is_coalesced_into_one_digest_per_target(stub_factory):
+    stub = stub_factory()
+    dispatcher = _dispatcher(digest_window=0.3)
+    for i in range(10):
+        assert dispatcher.notify_block(f"app{i % 2}.exe")
+    assert dispatcher.stop(timeout=10)
+    stats = dispatcher.get_stats()
+    assert stats['queued'] == 10 and stats['coalesced'] == 9
+    assert stats['sent'] == 2 and stats['pending'] == 0
+    assert len(stub.received) == 2
+    telegram = next(r for r in stub.received if '/bot' in r['path'])
+    assert telegram['payload']['text'].startswith("10 eventos")
+    assert "(x5)" in telegram['payload']['text']
+
+
+def test_failures_and_rate_limits_are_retried(stub_factory):
+    stub = stub_factory(fail_first=2, rate_limit_every=4, retry_after=0.05)
+    dispatcher = _dispatcher()
+    assert dispatcher.notify("uno")
+    assert dispatcher.notify("dos")
+    assert dispatcher.stop(timeout=10)
+    stats = dispatcher.get_stats()
+    assert stats['sent'] == 4 and stats['failed'] == 0
+    assert stats['retries'] == stub.attempts - 4 >= 3
+    assert sorted(r['payload'].get('text', '') for r in stub.received if '/bot' in r['path']) == ["dos", "uno"]
+
+
+def test_stop_timeout_never_leaves_two_workers(stub_factory):
+    stub_factory(delay=0.5)
+    dispatcher = _dispatcher()
+    dispatcher.notify("lento")
+    assert not dispatcher.stop(timeout=0.05)
+    dispatcher.notify("otro")
+    assert len(_workers()) == 1
+    assert dispatcher.stop(timeout=10)
+    assert not _workers()
+    assert dispatcher.get_stats()['sent'] == 4
+
+
+def test_sessions_are_per_thread():
+    sessions = []
+    thread = threading.Thread(target=lambda: sessions.append(notifications._get_session('telegram')))
+    thread.start()
+    thread.join()
+    own = notifications._get_session('telegram')
+    assert own is notifications._get_session('telegram')
+    assert own is not sessions[0]
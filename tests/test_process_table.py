@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+import psutil
+
+from src.process_table import ProcessSnapshot, terminate_pids
+
+
+def test_pids_containing_matches_every_name():
+    snapshot = ProcessSnapshot([("Chrome.exe", 1), ("chrome_helper", 2), ("steamwebhelper.exe", 3),
+                                ("notepad.exe", 4), ("", 5)])
+    found = snapshot.pids_containing(["chrome", "Steam", "helper", "word"])
+    assert sorted(found["chrome"]) == [1, 2]
+    assert found["Steam"] == [3]
+    assert sorted(found["helper"]) == [2, 3]
+    assert found["word"] == []
+    # Segunda consulta desde la caché
+    assert snapshot.pids_containing(["helper"]) == {"helper": found["helper"]}
+
+
+def test_terminate_pids_skips_reused_pid():
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        # El PID ya no pertenece a la app bloqueada: no se toca
+        assert terminate_pids([proc.pid], name="notepad.exe") == 0
+        assert proc.poll() is None
+        name = psutil.Process(proc.pid).name()
+        assert terminate_pids([proc.pid], name=name, exact=True) == 1
+        proc.wait(5)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
@@ -0,0 +1,23 @@
+import csv
+from datetime import datetime, timedelta
+
+from src.reports import generate_csv_report, get_top_blocked_apps
+from src.settings_manager import log_block_event
+
+
+def test_cutoff_day_counts_space_separated_timestamps(tmp_path):
+    cutoff = datetime.now() - timedelta(days=7)
+    # Mismo día del corte: uno después (cuenta) y otro antes (no cuenta)
+    log_block_event("steam.exe", (cutoff + timedelta(minutes=1)).strftime("%Y-%m-%d %H:%M:%S"))
+    log_block_event("viejo.exe", (cutoff - timedelta(minutes=1)).strftime("%Y-%m-%d %H:%M:%S"))
+    # Días completos: salen de los agregados
+    log_block_event("steam.exe", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    log_block_event("chrome.exe", datetime.now().isoformat())
+    assert dict(get_top_blocked_apps(days=7)) == {'steam.exe': 2, 'chrome.exe': 1}
+
+    path = tmp_path / "reporte.csv"
+    assert generate_csv_report(str(path), days=7)
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert sorted(row['App'] for row in rows) == ['chrome.exe', 'steam.exe', 'steam.exe']
+    assert all(len(row['Date']) == 10 for row in rows)
@@ -0,0 +1,74 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+from src.json_store import json_store
+from src.risk_model import DecayedRiskModel
+
+
+def _blocks(count):
+    start = datetime(2025, 1, 6, 8)
+    return [(f"app{i % 7}.exe", (start + timedelta(minutes=37 * i)).isoformat()) for i in range(count)]
+
+
+def test_record_defers_the_write(tmp_path):
+    path = str(tmp_path / "risk.json")
+    model = DecayedRiskModel(path)
+    written = json_store.written
+    for app, timestamp in _blocks(500):
+        model.record(app, timestamp)
+    assert not os.path.exists(path)
+    assert json_store.written == written
+    assert model.exists()
+    model.flush()
+    assert json_store.written == written + 1
+    with open(path, encoding='utf-8') as f:
+        assert set(json.load(f)) == {'half_life_days', 't0', 'slots', 'events'}
+
+
+def test_reload_matches_in_memory_model(tmp_path):
+    path = str(tmp_path / "risk.json")
+    model = DecayedRiskModel(path)
+    model.rebuild([{'app': app, 'timestamp': ts} for app, ts in _blocks(2000)])
+    reloaded = DecayedRiskModel(path)
+    moment = datetime(2025, 3, 4, 15)
+    assert reloaded.risk(moment) == model.risk(moment)
+    assert reloaded.risk(moment, app="app3.exe") == model.risk(moment, app="app3.exe")
+    assert reloaded.slot_rate(1, 15, "app3.exe") == model.slot_rate(1, 15, "app3.exe")
+    assert reloaded.events == 2000
+
+
+def test_pending_write_keeps_its_directory(tmp_path, monkeypatch):
+    model = DecayedRiskModel("risk.json")
+    model.record("app.exe", "2025-01-06T10:00:00")
+    other = tmp_path / "otro"
+    other.mkdir()
+    monkeypatch.chdir(other)
+    model.flush()
+    assert (tmp_path / "risk.json").exists()
+    assert not (other / "risk.json").exists()
+
+
+def test_offset_timestamps_use_the_local_time(tmp_path):
+    model = DecayedRiskModel(str(tmp_path / "risk.json"))
+    model.record("app.exe", "2025-01-06T10:00:00+02:00")
+    model.record("app.exe", "2025-01-06T10:00:00")
+    assert model.events == 2
+    assert model.slot_rate(0, 10, "app.exe") == 1.0
+    aware = datetime.fromisoformat("2025-01-13T10:00:00-05:00")
+    assert model.risk(aware) == model.risk(datetime(2025, 1, 13, 10))
+
+
+def test_other_half_life_needs_a_rebuild(tmp_path):
+    path = str(tmp_path / "risk.json")
+    blocks = [{'app': app, 'timestamp': ts} for app, ts in _blocks(300)]
+    DecayedRiskModel(path, half_life_days=7).rebuild(blocks)
+    assert DecayedRiskModel(path, half_life_days=7).exists()
+    model = DecayedRiskModel(path, half_life_days=30)
+    assert not model.exists()
+    model.rebuild(blocks)
+    assert model.exists()
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['half_life_days'] == 30
+    moment = datetime(2025, 1, 20, 15)
+    assert DecayedRiskModel(path, half_life_days=30).risk(moment) == model.risk(moment)
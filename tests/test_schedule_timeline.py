@@ -0,0 +1,92 @@
+import json
+import os
+from datetime import datetime
+
+from src import scheduler
+from src.schedule_timeline import MINUTES_PER_DAY, MINUTES_PER_WEEK, WeeklyTimeline, compile_timeline
+from src.settings_manager import load_settings, save_settings, SETTINGS_FILE
+
+
+def _minute(day, hour, minute=0):
+    return day * MINUTES_PER_DAY + hour * 60 + minute
+
+
+def _settings(schedules, enabled_hours=None):
+    return {
+        'current_profile': "trabajo",
+        'profiles': {"trabajo": {'enabled_hours': enabled_hours or {'enabled': False}}},
+        'schedules': {"trabajo": schedules},
+    }
+
+
+def test_empty_schedule_never_changes():
+    timeline = WeeklyTimeline()
+    assert not timeline.is_active_at(0)
+    assert not timeline.is_active_at(_minute(3, 12))
+    assert timeline.next_transition_minute(_minute(3, 12)) is None
+
+    disabled = compile_timeline(_settings({}))
+    assert disabled.boundaries == []
+    assert disabled.next_transition_minute(0) is None
+
+
+def test_always_active_has_no_transition():
+    timeline = compile_timeline(_settings({}, {'start': 0, 'end': 24}))
+    assert timeline.always_active
+    assert timeline.is_active_at(_minute(6, 23, 59))
+    assert timeline.next_transition_minute(_minute(2, 5)) is None
+
+
+def test_day_interval_bounds():
+    timeline = compile_timeline(_settings({'monday': {'start': 9, 'end': "17:30"}}))
+    assert not timeline.is_active_at(_minute(0, 8, 59))
+    assert timeline.is_active_at(_minute(0, 9))
+    assert timeline.is_active_at(_minute(0, 17, 29))
+    assert not timeline.is_active_at(_minute(0, 17, 30))
+    assert timeline.next_transition_minute(_minute(0, 8)) == 60
+    assert timeline.next_transition_minute(_minute(0, 9)) == 8 * 60 + 30
+    # Tras el cierre del lunes la próxima apertura es el lunes siguiente
+    assert timeline.next_transition_minute(_minute(0, 18)) == MINUTES_PER_WEEK - 9 * 60
+
+
+def test_overnight_schedule_wraps_past_midnight():
+    timeline = compile_timeline(_settings({'friday': {'start': 22, 'end': 2}}))
+    assert timeline.is_active_at(_minute(4, 23))
+    assert timeline.is_active_at(_minute(5, 1, 59))
+    assert not timeline.is_active_at(_minute(5, 2))
+    assert timeline.next_transition_minute(_minute(4, 23)) == 3 * 60
+
+
+def test_sunday_night_wraps_into_monday():
+    timeline = compile_timeline(_settings({'sunday': {'start': 22, 'end': 2}}))
+    assert timeline.boundaries == [0, 120, _minute(6, 22), MINUTES_PER_WEEK]
+    assert timeline.is_active_at(_minute(6, 23))
+    assert timeline.is_active_at(_minute(0, 1))
+    assert not timeline.is_active_at(_minute(0, 2))
+    # Desde el domingo el cambio real es el lunes 02:00, no la medianoche
+    assert timeline.next_transition_minute(_minute(6, 23)) == 3 * 60
+    assert timeline.next_transition_minute(_minute(0, 1)) == 60
+    assert timeline.next_transition_minute(_minute(0, 2)) == _minute(6, 22) - 120
+
+
+def test_timeline_cache_follows_the_settings_version():
+    settings = load_settings()
+    settings['schedules'] = {settings['current_profile']: {}}
+    save_settings(settings)
+    timeline = scheduler.get_schedule_timeline()
+    assert scheduler.get_schedule_timeline() is timeline
+
+    monday_noon = datetime(2025, 1, 6, 12)
+    scheduler.set_schedule(settings['current_profile'], "monday", 11, 13)
+    assert scheduler.get_schedule_timeline() is not timeline
+    assert scheduler.is_blocking_active(monday_noon)
+
+    # Escritura de otro proceso: cambia la firma del archivo
+    with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    data['schedules'][settings['current_profile']]['monday']['enabled'] = False
+    with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    stat = os.stat(SETTINGS_FILE)
+    os.utime(SETTINGS_FILE, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+    assert not scheduler.is_blocking_active(monday_noon)
@@ -0,0 +1,56 @@
+import json
+import os
+
+from src import settings_manager
+from src.event_hub import data_changed
+from src.settings_manager import (
+    SETTINGS_FILE, get_blocked_apps, get_profiles, get_whitelist, load_settings, read_settings,
+    save_settings, settings_store,
+)
+
+
+def test_missing_file_writes_defaults():
+    assert not os.path.exists(SETTINGS_FILE)
+    settings = read_settings()
+    assert os.path.exists(SETTINGS_FILE)
+    assert settings['current_profile'] in settings['profiles']
+
+
+def test_cache_hit_until_the_file_changes():
+    first = read_settings()
+    hits = settings_store.get_stats()['hits']
+    assert read_settings() is first
+    assert settings_store.get_stats()['hits'] == hits + 1
+
+    # Otro proceso reescribe el archivo: se recarga por mtime/tamaño
+    data = load_settings()
+    data['current_profile_note'] = "cambiado desde afuera"
+    with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    reloaded = read_settings()
+    assert reloaded is not first
+    assert reloaded['current_profile_note'] == "cambiado desde afuera"
+
+
+def test_getters_return_copies():
+    get_blocked_apps().append("sin-guardar.exe")
+    get_whitelist().append("sin-guardar.exe")
+    profiles = get_profiles()
+    profiles['nuevo'] = {'blocked_apps': []}
+    next(iter(profiles.values()))['blocked_apps'].append("sin-guardar.exe")
+    assert "sin-guardar.exe" not in get_blocked_apps()
+    assert "sin-guardar.exe" not in get_whitelist()
+    assert 'nuevo' not in get_profiles()
+
+
+def test_failed_save_does_not_signal_a_change(monkeypatch, capsys):
+    read_settings()
+    generation = data_changed.generation
+
+    def fail(*args, **kwargs):
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr(settings_manager, 'save_json', fail)
+    assert not save_settings(load_settings())
+    assert data_changed.generation == generation
+    assert "disco lleno" in capsys.readouterr().out
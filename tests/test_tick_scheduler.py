@@ -0,0 +1,24 @@
+from src.tick_scheduler import AdaptiveTickScheduler
+
+
+def test_configure_from_settings_keeps_backoff_with_clamped_values():
+    scheduler = AdaptiveTickScheduler()
+    # min_interval fuera de rango: configure() lo lleva a 0.05
+    settings = {'polling': {'min_interval': 0, 'max_interval': 8, 'backoff': 2}}
+    scheduler.configure_from_settings(settings)
+    assert scheduler.min_interval == 0.05
+    scheduler.on_idle()
+    scheduler.on_idle()
+    interval = scheduler.interval
+    assert interval > scheduler.min_interval
+    # Mismos settings en el próximo tick: no reinicia el intervalo
+    scheduler.configure_from_settings(settings)
+    assert scheduler.interval == interval
+
+
+def test_configure_from_settings_applies_changes():
+    scheduler = AdaptiveTickScheduler()
+    scheduler.configure_from_settings({'check_interval': 5})
+    assert scheduler.max_interval == 5
+    scheduler.configure_from_settings({'check_interval': 20})
+    assert scheduler.max_interval == 20
@@ -0,0 +1,101 @@
+import itertools
+import threading
+import time
+from datetime import datetime, timedelta
+
+from src import monitor, usage_ledger as usage_ledger_module
+from src.scheduler import set_time_limit
+from src.time_limits import TimeLimitEngine
+from src.usage_ledger import UsageLedger
+from src.window_watcher import ManualBackend, WindowWatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _engine(tmp_path, on_exhausted=None, clock=None):
+    ledger = UsageLedger(str(tmp_path / "usage.json"), legacy_limits=dict)
+    return TimeLimitEngine(on_exhausted=on_exhausted, ledger=ledger, clock=clock or FakeClock())
+
+
+def test_focus_time_accumulates_per_app(tmp_path):
+    set_time_limit("game.exe", 60)
+    set_time_limit("chat.exe", 30)
+    clock = FakeClock()
+    engine = _engine(tmp_path, clock=clock)
+
+    assert engine.observe("Game - game.exe") == "game.exe"
+    clock.now += 10
+    assert engine.observe("Game - game.exe") == "game.exe"
+    clock.now += 5
+    assert engine.observe("Editor") is None
+    clock.now += 100
+    assert engine.observe("Chat - chat.exe") == "chat.exe"
+    clock.now += 7
+    engine.pause()
+    clock.now += 50
+    engine.observe(None)
+
+    assert engine.ledger.get_all() == {'game.exe': 15, 'chat.exe': 7}
+    assert engine.remaining("game.exe", 3600) == 3585
+
+
+def test_deadline_fires_when_the_budget_runs_out(tmp_path):
+    set_time_limit("game.exe", 1)
+    fired = threading.Event()
+    exhausted = []
+    engine = _engine(tmp_path, on_exhausted=lambda app: exhausted.append(app) or fired.set(),
+                     clock=time.monotonic)
+    engine.ledger.add("game.exe", 59.8)
+
+    assert engine.observe("game.exe - partida") == "game.exe"
+    assert not exhausted
+    assert fired.wait(5)
+    assert exhausted == ["game.exe"]
+    assert engine.enforced == 1
+    assert engine.ledger.get("game.exe") >= 60 - 0.05
+
+    # Agotado: si la app sigue en foco se vuelve a cerrar al instante
+    engine.observe("game.exe - partida")
+    assert exhausted == ["game.exe", "game.exe"]
+
+
+def test_new_day_resets_the_budget(tmp_path, monkeypatch):
+    set_time_limit("game.exe", 1)
+    clock = FakeClock()
+    engine = _engine(tmp_path, on_exhausted=lambda app: None, clock=clock)
+    engine.ledger.add("game.exe", 50)
+    engine.observe("game.exe")
+    assert engine.remaining("game.exe", 60) == 10
+
+    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    monkeypatch.setattr(usage_ledger_module, '_today', lambda: tomorrow)
+    clock.now += 20
+    # El deadline de ayer vence, pero hoy solo lleva 20 s: se reprograma
+    with engine._lock:
+        assert engine._expire() is None
+    assert engine.enforced == 0
+    assert engine.ledger.get("game.exe") == 20
+    assert engine.remaining("game.exe", 60) == 40
+
+
+def test_monitor_counts_focus_outside_the_blocking_schedule(tmp_path, monkeypatch):
+    set_time_limit("game.exe", 60)
+    # Cada lectura del reloj avanza un segundo
+    engine = _engine(tmp_path, clock=itertools.count(1000).__next__)
+    checks = []
+    monkeypatch.setattr(monitor, 'time_limit_engine', engine)
+    monkeypatch.setattr(monitor, 'check_blocked_apps', lambda *a, **k: checks.append(k) or [])
+    monkeypatch.setattr(monitor.tick_scheduler, 'is_active', lambda: False)
+    watcher = WindowWatcher(ManualBackend([{'title': "Game - game.exe", 'isActive': True}]))
+
+    monitor.monitor_apps(watcher=watcher, max_ticks=1)
+
+    assert "game.exe" in engine.ledger.get_all()
+    # Fuera del horario no se cierran apps bloqueadas
+    assert checks == []
@@ -0,0 +1,89 @@
+import json
+import time
+
+from src.tools import trace_report
+from src.tracing import Tracer, _NOOP
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span("monitor.tick") as span:
+        pass
+    assert span is _NOOP
+    assert tracer.get_stats()['stages'] == {}
+
+
+def test_nested_spans_are_timed_and_written_inside_each_other(tmp_path):
+    path = tmp_path / "trace.json"
+    tracer = Tracer()
+    tracer.configure(True, str(path))
+    for _ in range(3):
+        with tracer.span("monitor.tick"):
+            time.sleep(0.002)
+            with tracer.span("monitor.resync"):
+                time.sleep(0.005)
+    tracer.configure(False)
+
+    stages = tracer.get_stats()['stages']
+    assert stages['monitor.tick']['count'] == stages['monitor.resync']['count'] == 3
+    assert stages['monitor.resync']['p50_ms'] >= 5
+    assert stages['monitor.tick']['p50_ms'] >= stages['monitor.resync']['p50_ms'] + 2
+
+    text = path.read_text(encoding='utf-8')
+    assert text.startswith("[\n") and text.endswith(",\n")
+    events = json.loads(text.rstrip().rstrip(',') + "]")
+    # El span interno cierra primero y queda contenido en el externo
+    for inner, outer in zip(events[::2], events[1::2]):
+        assert (inner['name'], outer['name']) == ("monitor.resync", "monitor.tick")
+        assert outer['ts'] <= inner['ts']
+        assert inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur'] + 0.2
+
+
+def test_percentiles_use_the_moving_window():
+    tracer = Tracer(window=4)
+    tracer.configure(True)
+    for ms in (100, 1, 2, 3, 4):
+        tracer.record("stage", 0.0, ms / 1000)
+    stage = tracer.get_stats()['stages']['stage']
+    assert stage['count'] == 5
+    assert stage['max_ms'] == 4.0
+    assert stage['p50_ms'] == 3.0
+    tracer.reset()
+    assert tracer.get_stats()['stages'] == {}
+
+
+def _fixture_trace(path):
+    events = [
+        {'name': "monitor.settings", 'ph': 'X', 'pid': 1, 'tid': 1, 'ts': 10.0 * i, 'dur': 100.0 * (i + 1)}
+        for i in range(10)
+    ] + [{'name': "monitor.tick", 'ph': 'X', 'pid': 1, 'tid': 1, 'ts': 5.0, 'dur': 2500.0}]
+    # Como lo deja el tracer: sin "]" y con coma final
+    path.write_text("[\n" + "".join(json.dumps(e) + ",\n" for e in events), encoding='utf-8')
+
+
+def test_trace_report_aggregates_a_trace_file(tmp_path, capsys):
+    path = tmp_path / "trace.json"
+    _fixture_trace(path)
+
+    stats = trace_report.load_trace_file(str(path))
+    settings = stats['stages']['monitor.settings']
+    assert settings['count'] == 10
+    assert settings['p50_ms'] == 0.6
+    assert settings['p95_ms'] == settings['p99_ms'] == settings['max_ms'] == 1.0
+    assert stats['stages']['monitor.tick'] == {
+        'count': 1, 'p50_ms': 2.5, 'p95_ms': 2.5, 'p99_ms': 2.5, 'max_ms': 2.5}
+
+    # Con el "]" de cierre el archivo se lee igual
+    path.write_text(path.read_text(encoding='utf-8').rstrip().rstrip(',') + "\n]", encoding='utf-8')
+    assert trace_report.load_trace_file(str(path)) == stats
+
+    assert trace_report.main(['--file', str(path), '--json']) == 0
+    assert json.loads(capsys.readouterr().out)['stages'] == stats['stages']
+    assert trace_report.main(['--file', str(path)]) == 0
+    table = capsys.readouterr().out.splitlines()
+    assert table[1].split() == ["monitor.settings", "10", "0.6", "1.0", "1.0", "1.0"]
+
+
+def test_trace_report_without_samples(tmp_path):
+    assert "sin muestras" in trace_report.format_stats({'stages': {}})
+    assert trace_report.main(['--file', str(tmp_path / "falta.json")]) == 1
@@ -0,0 +1,104 @@
+import threading
+
+from src.ui_bus import UIMessageBus
+
+
+class FakeWidget:
+    """Sustituto de Tk: after() guarda los callbacks y la prueba los corre."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+
+    def run_pending(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def _recorder(bus, *kinds):
+    calls = []
+    for kind in kinds:
+        bus.on(kind, lambda items, kind=kind: calls.append((kind, items)))
+    return calls
+
+
+def test_drain_keeps_order_within_each_kind():
+    bus = UIMessageBus()
+    calls = _recorder(bus, 'status', 'log')
+    for i in range(3):
+        bus.post('status', i)
+        bus.post('log', f"l{i}")
+    bus.post('sin-handler', None)
+
+    assert bus.drain() == 7
+    assert calls == [('status', [0, 1, 2]), ('log', ["l0", "l1", "l2"])]
+    assert bus.drain() == 0
+    assert bus.get_stats()['pending'] == 0
+
+
+def test_batches_are_capped_and_overflow_drops_the_oldest():
+    bus = UIMessageBus(max_batch=3, max_pending=5)
+    calls = _recorder(bus, 'status')
+    for i in range(7):
+        bus.post('status', i)
+    assert bus.dropped == 2
+    assert bus.drain() == 3
+    assert bus.drain() == 2
+    assert [items for _, items in calls] == [[2, 3, 4], [5, 6]]
+    assert bus.largest_batch == 3
+
+
+def test_a_failing_handler_does_not_block_the_others(capsys):
+    bus = UIMessageBus()
+    bus.on('roto', lambda items: 1 / 0)
+    calls = _recorder(bus, 'status')
+    bus.post('roto', 1)
+    bus.post('status', 2)
+    assert bus.drain() == 2
+    assert calls == [('status', [2])]
+    assert "[Error] UI" in capsys.readouterr().out
+
+
+def test_posts_from_threads_keep_per_thread_order():
+    bus = UIMessageBus(max_pending=10000)
+    calls = _recorder(bus, 'status')
+    threads = [threading.Thread(target=lambda n=n: [bus.post('status', (n, i)) for i in range(500)])
+               for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    while bus.drain():
+        pass
+    items = [item for _, batch in calls for item in batch]
+    assert len(items) == 2000
+    for n in range(4):
+        assert [i for t, i in items if t == n] == list(range(500))
+
+
+def test_pump_until_detach_then_drop_after_shutdown():
+    bus = UIMessageBus()
+    calls = _recorder(bus, 'status')
+    widget = FakeWidget()
+    bus.post('status', "antes de attach")
+    bus.attach(widget)
+    widget.run_pending()
+    assert calls == [('status', ["antes de attach"])]
+    assert len(widget.callbacks) == 1
+
+    # Tras detach el pump se detiene y lo nuevo espera en la cola
+    bus.detach()
+    bus.post('status', "en espera")
+    widget.run_pending()
+    assert widget.callbacks == []
+    assert bus.pending == 1
+
+    bus.shutdown()
+    bus.post('status', "tarde")
+    assert bus.pending == 0
+    assert bus.drain() == 0
+    assert bus.get_stats()['dropped'] == 2
+    assert calls == [('status', ["antes de attach"])]
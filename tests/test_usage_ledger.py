@@ -0,0 +1,35 @@
+import json
+from datetime import datetime, timedelta
+
+from src.usage_ledger import UsageLedger
+
+
+def test_first_load_imports_legacy_usage(tmp_path):
+    now = datetime.now()
+    legacy = {
+        'game.exe': {'minutes': 60, 'used': 1500, 'last_reset': now.isoformat()},
+        'chat.exe': {'minutes': 30, 'used': 900, 'last_reset': (now - timedelta(days=1)).isoformat()},
+        'video.exe': {'minutes': 45, 'used': 0, 'last_reset': now.isoformat()},
+        'new.exe': {'minutes': 10},
+    }
+    path = tmp_path / "usage.json"
+    ledger = UsageLedger(str(path), legacy_limits=lambda: legacy)
+    assert ledger.get_all() == {'game.exe': 1500}
+    assert ledger.add('game.exe', 10) == 1510
+    assert ledger.flush()
+    assert json.loads(path.read_text(encoding='utf-8'))['apps'] == {'game.exe': 1510}
+
+    # Con el archivo propio ya no se vuelve a importar
+    legacy['game.exe']['used'] = 99999
+    reloaded = UsageLedger(str(path), legacy_limits=lambda: legacy)
+    assert reloaded.get('game.exe') == 1510
+
+
+def test_legacy_import_from_settings(tmp_path):
+    from src.settings_manager import load_settings, save_settings
+
+    settings = load_settings()
+    settings['time_limits'] = {'game.exe': {'minutes': 60, 'used': 120, 'last_reset': datetime.now().isoformat()}}
+    save_settings(settings)
+    ledger = UsageLedger(str(tmp_path / "usage.json"))
+    assert ledger.get('game.exe') == 120
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from src.window_watcher import (ManualBackend, WindowWatcher, WINDOW_CLOSED, WINDOW_CREATED,
+                                WINDOW_FOCUS, changed_windows)
+
+
+def _window(title, active=False):
+    return {'title': title, 'isActive': active}
+
+
+def test_diff_emits_created_closed_and_focus():
+    backend = ManualBackend([_window("Editor", active=True), _window("Terminal")])
+    watcher = WindowWatcher(backend)
+    events = watcher.poll()
+    assert [(kind, w['title']) for kind, w in events] == [
+        (WINDOW_CREATED, "Editor"), (WINDOW_CREATED, "Terminal"), (WINDOW_FOCUS, "Editor")]
+    # Sin cambios no hay eventos
+    assert watcher.poll() == []
+
+    backend.set_windows([_window("Terminal", active=True), _window("Juego")])
+    events = watcher.poll()
+    assert sorted((kind, w['title']) for kind, w in events) == [
+        (WINDOW_CLOSED, "Editor"), (WINDOW_CREATED, "Juego"), (WINDOW_FOCUS, "Terminal")]
+    assert [w['title'] for w in changed_windows(events)] == ["Juego", "Terminal"]
+    assert watcher.active_title == "Terminal"
+
+
+def test_wait_for_changes_wakes_on_set_windows():
+    backend = ManualBackend([])
+    watcher = WindowWatcher(backend, resync_interval=60)
+    watcher.mark_synced()
+    threading.Timer(0.05, backend.set_windows, args=([_window("Juego", active=True)],)).start()
+    start = time.monotonic()
+    events = watcher.wait_for_changes(timeout=5)
+    assert time.monotonic() - start < 2
+    assert (WINDOW_CREATED, _window("Juego", active=True)) in events
+
+
+def test_wait_for_changes_times_out_without_events():
+    watcher = WindowWatcher(ManualBackend([]), resync_interval=60)
+    watcher.mark_synced()
+    start = time.monotonic()
+    assert watcher.wait_for_changes(timeout=0.1) == []
+    assert 0.05 <= time.monotonic() - start < 2
+
+
+def test_wait_for_changes_returns_on_resync():
+    watcher = WindowWatcher(ManualBackend([]), resync_interval=0.05)
+    watcher.mark_synced()
+    assert watcher.wait_for_changes(timeout=5) == []
+    assert watcher.needs_resync()
+
+
+def test_stop_event_interrupts_wait():
+    backend = ManualBackend([])
+    watcher = WindowWatcher(backend, resync_interval=60)
+    watcher.mark_synced()
+    stop = threading.Event()
+
+    def stop_soon():
+        stop.set()
+        watcher.close()
+
+    threading.Timer(0.05, stop_soon).start()
+    start = time.monotonic()
+    assert watcher.wait_for_changes(timeout=5, stop_event=stop) == []
+    assert time.monotonic() - start < 2